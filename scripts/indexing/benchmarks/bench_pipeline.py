@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Throughput benchmark for the build-output indexing pipeline.
+
+Generates synthetic corpora with the test suite's fake-repo builder and times
+three stages separately:
+
+    source     DeveloperDocsDataClient.get_source_data
+    transform  DeveloperDocsConnector.transform
+    format     _format_api_reference over the API reference pages
+
+Each stage is timed once plainly (pages/sec) and once under tracemalloc, so
+the memory instrumentation does not skew the timings. The traced run reports:
+
+    peak_bytes        peak traced memory
+    allocated_blocks  memory blocks the stage allocated and still held when it
+                      returned (its output plus anything it kept)
+    retained_blocks   retention: blocks still held once the output has been
+                      released, i.e. what the stage keeps in caches or leaks Results are written as JSON;
+pass a previous results file with --compare to print per-stage ratios.
+
+Usage:
+    uv run benchmarks/bench_pipeline.py --sizes 1000,10000 --output bench.json
+    uv run benchmarks/bench_pipeline.py --compare bench.json
+"""
+
+import argparse
+import gc
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+INDEXING_DIR = Path(__file__).parent.parent
+if str(INDEXING_DIR) not in sys.path:
+    sys.path.insert(0, str(INDEXING_DIR))
+
+from data_client import DeveloperDocsDataClient  # noqa: E402
+from developer_docs_connector import DeveloperDocsConnector, _format_api_reference  # noqa: E402
+from tests.conftest import _build_synthetic_repo  # noqa: E402
+
+# A 100k-page corpus needs about 1.5 GB of disk; ask for it with --sizes.
+DEFAULT_SIZES = "1000,10000"
+
+
+def _measure(fn: Callable[[], Any]) -> Dict[str, float]:
+    """Run fn twice: once for wall time, once under tracemalloc for memory."""
+    gc.collect()
+    start = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    blocks_before = sys.getallocatedblocks()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    allocated_blocks = sys.getallocatedblocks() - blocks_before
+    # Count retention after dropping the output, so the size of the result isn't reported as retained.
+    del result
+    gc.collect()
+    retained_blocks = sys.getallocatedblocks() - blocks_before
+    tracemalloc.stop()
+    return {
+        "seconds": seconds,
+        "peak_bytes": peak,
+        "allocated_blocks": allocated_blocks,
+        "retained_blocks": retained_blocks,
+    }
+
+
+def run_size(pages: int, api_ratio: float, workdir: Path) -> List[Dict[str, Any]]:
+    repo = _build_synthetic_repo(workdir / f"corpus-{pages}", pages, api_ratio=api_ratio)
+    client = DeveloperDocsDataClient(repo_root=str(repo))
+    connector = DeveloperDocsConnector(name="devdocs", data_client=client)
+
+    def source():
+        # A fresh client per run so the schema memo doesn't turn run 2 into a cache benchmark.
+        return DeveloperDocsDataClient(repo_root=str(repo)).get_source_data()
+
+    data = source()
+    api_pages = [p for p in data if p["page_type"] == "api_reference"]
+
+    stages = [
+        ("source", len(data), source),
+        ("transform", len(data), lambda: connector.transform(data)),
+        ("format", len(api_pages), lambda: [_format_api_reference(p) for p in api_pages]),
+    ]
+    results = []
+    for stage, count, fn in stages:
+        stats = _measure(fn)
+        stats.update(
+            stage=stage,
+            pages=count,
+            corpus_pages=pages,
+            pages_per_sec=count / stats["seconds"] if stats["seconds"] else 0.0,
+        )
+        results.append(stats)
+        print(
+            f"  {pages:>7} pages  {stage:<9} {stats['seconds']:8.3f}s  "
+            f"{stats['pages_per_sec']:>10,.0f} pages/s  "
+            f"peak {stats['peak_bytes'] / 1e6:8.1f} MB  "
+            f"allocated {stats['allocated_blocks']:>9,} blocks  "
+            f"retention {stats['retained_blocks']:>9,} blocks"
+        )
+    return results
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=INDEXING_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Print current/baseline ratios for every (corpus size, stage) in both files."""
+    base = {(r["corpus_pages"], r["stage"]): r for r in baseline["results"]}
+    print(f"\nCompared with {baseline.get('commit', 'unknown')} (ratios, <1.00 is better):")
+    for r in current["results"]:
+        b = base.get((r["corpus_pages"], r["stage"]))
+        if not b:
+            continue
+        time_ratio = r["seconds"] / b["seconds"] if b["seconds"] else float("nan")
+        peak_ratio = r["peak_bytes"] / b["peak_bytes"] if b["peak_bytes"] else float("nan")
+        print(
+            f"  {r['corpus_pages']:>7} pages  {r['stage']:<9} "
+            f"time x{time_ratio:.2f}  peak x{peak_ratio:.2f}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"comma-separated corpus sizes (default: {DEFAULT_SIZES})")
+    parser.add_argument("--api-ratio", type=float, default=0.3, help="share of API reference pages (default: 0.3)")
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--compare", type=Path, help="baseline results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    report = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.time(),
+        "api_ratio": args.api_ratio,
+        "results": [],
+    }
+    with tempfile.TemporaryDirectory(prefix="indexing-bench-") as tmp:
+        for size in (int(s) for s in args.sizes.split(",") if s):
+            report["results"].extend(run_size(size, args.api_ratio, Path(tmp)))
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"\nWrote {args.output}")
+    if args.compare:
+        compare(report, json.loads(args.compare.read_text()))
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Reusable Playwright pages for the live-site API reference scraper.
+
+Opening a browser context and a page costs more than scraping most endpoint
+pages, so BrowserPagePool keeps `size` warm context/page pairs and hands them
+out one scrape at a time. The pool size is also the scrape concurrency.
+
+A pair is thrown away and replaced on next use when:
+- it has served `max_uses` scrapes (keeps long runs from accumulating
+  renderer memory),
+- the page crashed or was closed underneath us, or
+- the scrape using it raised, since a failed navigation can leave the page
+  half-loaded.
+
+Only the Playwright objects' public async API is used, so tests can drive the
+pool with simple fakes.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Slot:
+    def __init__(self, context: Any, page: Any):
+        self.context = context
+        self.page = page
+        self.uses = 0
+        self.crashed = False
+
+
+class BrowserPagePool:
+    """Bounded pool of (context, page) pairs on one browser."""
+
+    def __init__(
+        self,
+        browser: Any,
+        size: int = 3,
+        max_uses: int = 50,
+        context_options: Optional[Dict[str, Any]] = None,
+    ):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.browser = browser
+        self.size = size
+        self.max_uses = max_uses
+        self.context_options = context_options or {}
+        self.created = 0
+        self.recycled = 0
+        # None marks a free slot whose pair hasn't been opened (or was recycled).
+        # LIFO so a warm page is reused before a new one is opened.
+        self._idle: asyncio.LifoQueue = asyncio.LifoQueue()
+        for _ in range(size):
+            self._idle.put_nowait(None)
+        self._open: List[_Slot] = []
+        self._closed = False
+
+    async def __aenter__(self) -> "BrowserPagePool":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Any]:
+        """Borrow a page for one scrape, waiting while all pages are in use."""
+        if self._closed:
+            raise RuntimeError("BrowserPagePool is closed")
+        slot: Optional[_Slot] = await self._idle.get()
+        try:
+            if slot is not None and not self._is_healthy(slot):
+                await self._discard(slot)
+                slot = None
+            if slot is None:
+                slot = await self._open_slot()
+            slot.uses += 1
+            yield slot.page
+        except BaseException:
+            if slot is not None:
+                await self._discard(slot)
+                slot = None
+            raise
+        finally:
+            if slot is not None and (slot.uses >= self.max_uses or not self._is_healthy(slot)):
+                await self._discard(slot)
+                slot = None
+            self._idle.put_nowait(slot)
+
+    async def close(self) -> None:
+        """Close every open page and context. Safe to call more than once."""
+        self._closed = True
+        slots, self._open = self._open, []
+        for slot in slots:
+            await self._close_slot(slot)
+
+    async def _open_slot(self) -> _Slot:
+        context = await self.browser.new_context(**self.context_options)
+        try:
+            page = await context.new_page()
+        except BaseException:
+            await context.close()
+            raise
+        slot = _Slot(context, page)
+        page.on("crash", lambda *_: setattr(slot, "crashed", True))
+        self._open.append(slot)
+        self.created += 1
+        return slot
+
+    @staticmethod
+    def _is_healthy(slot: _Slot) -> bool:
+        return not slot.crashed and not slot.page.is_closed()
+
+    async def _discard(self, slot: _Slot) -> None:
+        if slot in self._open:
+            self._open.remove(slot)
+        self.recycled += 1
+        await self._close_slot(slot)
+
+    @staticmethod
+    async def _close_slot(slot: _Slot) -> None:
+        # Close in order: page first, then context. Either may already be gone.
+        for closable in (slot.page, slot.context):
+            try:
+                await closable.close()
+            except Exception as e:
+                logger.debug(f"Ignoring error while closing pooled browser page: {e}")
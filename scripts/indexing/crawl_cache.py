@@ -0,0 +1,121 @@
+"""Persistent HTTP validator cache for the live-site crawler.
+
+For every crawled URL the cache keeps the response's ETag and Last-Modified
+headers, the sitemap <lastmod> it was listed with, and the page the crawler
+extracted from it (a DocumentationPage or ApiReferencePage dict). On the next
+run the crawler:
+
+- skips the URL entirely when the sitemap <lastmod> is unchanged,
+- otherwise sends If-None-Match / If-Modified-Since, and on 304 reuses the
+  cached page (for API reference pages that also skips the browser scrape).
+
+Validators are only sent for URLs that have a cached page, so a 304 always has
+something to reuse. Bump CACHE_VERSION whenever the extraction output changes
+shape; a version mismatch discards the stored cache.
+"""
+
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Mapping, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+
+
+@dataclass
+class CrawlCacheEntry:
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    sitemap_lastmod: Optional[str] = None
+    page: Optional[Dict[str, Any]] = None
+
+
+class CrawlCache:
+    """JSON file of {url: CrawlCacheEntry}, loaded once and saved at the end of a crawl."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.entries: Dict[str, CrawlCacheEntry] = {}
+        self.skipped = 0  # unchanged sitemap <lastmod>, no request sent
+        self.revalidated = 0  # 304 responses
+
+    def load(self) -> bool:
+        """Load the cache; returns False (leaving it empty) if missing, unreadable or stale."""
+        self.entries = {}
+        if not self.path.exists():
+            return False
+        try:
+            data = json.loads(self.path.read_text())
+        except (json.JSONDecodeError, UnicodeDecodeError, OSError) as e:
+            logger.warning(f"Ignoring unreadable crawl cache {self.path}: {e}")
+            return False
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            logger.warning(f"Ignoring crawl cache {self.path} with unexpected version")
+            return False
+        self.entries = {url: CrawlCacheEntry(**entry) for url, entry in data.get("urls", {}).items()}
+        return True
+
+    def save(self) -> None:
+        """Write the cache atomically. Failures only cost a full crawl next time."""
+        data = {
+            "version": CACHE_VERSION,
+            "urls": {url: asdict(entry) for url, entry in sorted(self.entries.items())},
+        }
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(data))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write crawl cache {self.path}: {e}")
+
+    def unchanged_page(self, url: str, sitemap_lastmod: Optional[str]) -> Optional[Dict[str, Any]]:
+        """The cached page if the sitemap says the URL hasn't changed since it was crawled."""
+        entry = self.entries.get(url)
+        if sitemap_lastmod and entry and entry.page is not None and entry.sitemap_lastmod == sitemap_lastmod:
+            self.skipped += 1
+            return entry.page
+        return None
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        entry = self.entries.get(url)
+        if entry is None or entry.page is None:
+            return {}
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def not_modified(self, url: str, sitemap_lastmod: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Handle a 304: refresh the entry's lastmod and return its cached page."""
+        entry = self.entries.get(url)
+        if entry is None or entry.page is None:
+            return None
+        self.revalidated += 1
+        entry.sitemap_lastmod = sitemap_lastmod
+        return entry.page
+
+    def record_response(
+        self, url: str, headers: Mapping[str, str], sitemap_lastmod: Optional[str]
+    ) -> None:
+        """Remember a 200 response's validators. The page is attached by record_page()."""
+        self.entries[url] = CrawlCacheEntry(
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+            sitemap_lastmod=sitemap_lastmod,
+        )
+
+    def record_page(self, url: str, page: Mapping[str, Any]) -> None:
+        entry = self.entries.setdefault(url, CrawlCacheEntry())
+        entry.page = dict(page)
+
+    def retain(self, urls: Iterable[str]) -> None:
+        """Drop entries for URLs no longer in the sitemap."""
+        keep = set(urls)
+        self.entries = {url: entry for url, entry in self.entries.items() if url in keep}
@@ -0,0 +1,186 @@
+"""Bounded, per-host fair scheduling for the live-site crawler.
+
+Creating one task per sitemap URL up front keeps a coroutine, a timeout and
+often a buffered response alive for every URL at once. schedule() instead runs
+a fixed number of worker tasks that pull items from a HostFairQueue, so the
+number of in-flight fetches, and the memory they hold, is bounded by `limit`
+no matter how many URLs the sitemap lists.
+
+HostFairQueue hands out items round-robin across hosts and never lets one host
+have more than `per_host_limit` items in flight, so a sitemap dominated by one
+host cannot starve the others.
+
+Items can come from a plain iterable or an async iterable (e.g. URLs streamed
+out of a sitemap as it is parsed); results are yielded as workers finish them,
+through a bounded queue so slow consumers pause the workers.
+"""
+
+import asyncio
+from collections import Counter, deque
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Generic,
+    Iterable,
+    Optional,
+    TypeVar,
+    Union,
+)
+from urllib.parse import urlparse
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_CLOSED = object()
+
+
+def url_host(item: Any) -> str:
+    """Host of a URL, or of the first element of a (url, ...) tuple."""
+    url = item[0] if isinstance(item, tuple) else item
+    return urlparse(url).netloc
+
+
+class HostFairQueue(Generic[T]):
+    """Async work queue that rotates across hosts and caps each host's in-flight items."""
+
+    def __init__(self, per_host_limit: Optional[int] = None, host_of: Callable[[T], str] = url_host):
+        self.per_host_limit = per_host_limit
+        self.host_of = host_of
+        self._pending: Dict[str, Deque[T]] = {}
+        self._rotation: Deque[str] = deque()  # hosts with pending items, next-up first
+        self._active: Counter = Counter()
+        self._size = 0
+        self._closed = False
+        self._changed = asyncio.Condition()
+
+    def __len__(self) -> int:
+        return self._size
+
+    async def put(self, item: T) -> None:
+        async with self._changed:
+            host = self.host_of(item)
+            if host not in self._pending:
+                self._pending[host] = deque()
+                self._rotation.append(host)
+            self._pending[host].append(item)
+            self._size += 1
+            self._changed.notify_all()
+
+    async def close(self) -> None:
+        """No more items will be put; get() returns _CLOSED once the queue drains."""
+        async with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+
+    async def get(self) -> Any:
+        """Next item whose host has spare capacity, or _CLOSED when closed and empty."""
+        async with self._changed:
+            while True:
+                found, item = self._take()
+                if found:
+                    return item
+                if self._closed and self._size == 0:
+                    return _CLOSED
+                await self._changed.wait()
+
+    async def done(self, item: T) -> None:
+        """Mark an item from get() finished, freeing its host's slot."""
+        async with self._changed:
+            self._active[self.host_of(item)] -= 1
+            self._changed.notify_all()
+
+    def _take(self):
+        for _ in range(len(self._rotation)):
+            host = self._rotation.popleft()
+            if self.per_host_limit is not None and self._active[host] >= self.per_host_limit:
+                self._rotation.append(host)
+                continue
+            queue = self._pending[host]
+            item = queue.popleft()
+            if queue:
+                self._rotation.append(host)
+            else:
+                del self._pending[host]
+            self._active[host] += 1
+            self._size -= 1
+            return True, item
+        return False, None
+
+
+async def schedule(
+    items: Union[Iterable[T], AsyncIterable[T]],
+    worker: Callable[[T], Awaitable[R]],
+    limit: int,
+    per_host_limit: Optional[int] = None,
+    host_of: Callable[[T], str] = url_host,
+    max_pending: Optional[int] = None,
+) -> AsyncIterator[R]:
+    """Run worker(item) for every item with at most `limit` in flight, yielding results as they finish.
+
+    `max_pending` bounds how far the feeder reads ahead of the workers (default
+    64 items per worker), which matters when items come from a stream. An
+    exception from worker() is re-raised here after the remaining workers are
+    cancelled; workers that want to report per-item failures should return them.
+    """
+    queue: HostFairQueue[T] = HostFairQueue(per_host_limit, host_of)
+    results: asyncio.Queue = asyncio.Queue(maxsize=limit)
+    max_pending = max_pending or limit * 64
+    room = asyncio.Event()
+    room.set()
+
+    async def feed() -> None:
+        try:
+            if hasattr(items, "__aiter__"):
+                async for item in items:
+                    await room.wait()
+                    await queue.put(item)
+                    if len(queue) >= max_pending:
+                        room.clear()
+            else:
+                for item in items:
+                    await room.wait()
+                    await queue.put(item)
+                    if len(queue) >= max_pending:
+                        room.clear()
+        finally:
+            await queue.close()
+
+    async def work() -> None:
+        while True:
+            item = await queue.get()
+            if item is _CLOSED:
+                return
+            if len(queue) < max_pending:
+                room.set()
+            try:
+                result = await worker(item)
+            finally:
+                await queue.done(item)
+            await results.put(result)
+
+    feeder = asyncio.create_task(feed())
+    workers = [asyncio.create_task(work()) for _ in range(max(limit, 1))]
+    all_done = asyncio.ensure_future(asyncio.gather(feeder, *workers))
+    try:
+        while True:
+            getter = asyncio.ensure_future(results.get())
+            await asyncio.wait({getter, all_done}, return_when=asyncio.FIRST_COMPLETED)
+            if getter.done():
+                yield getter.result()
+                continue
+            getter.cancel()
+            while not results.empty():
+                yield results.get_nowait()
+            all_done.result()  # Re-raise a feeder or worker failure
+            return
+    finally:
+        for task in (feeder, *workers):
+            task.cancel()
+        await asyncio.gather(feeder, *workers, return_exceptions=True)
+        if all_done.done() and not all_done.cancelled():
+            all_done.exception()  # Mark retrieved; failures were re-raised above
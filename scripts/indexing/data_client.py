@@ -7,20 +7,119 @@ Instead of scraping the live site with Playwright, this reads from:
 - docs/api/**/*.ParamsDetails.json — query/path parameters
 """
 
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Union, List, Optional, TYPE_CHECKING
+from typing import Any, Callable, Deque, Iterator, Union, List, Optional, Tuple, TypeVar, TYPE_CHECKING
 from pathlib import Path, PurePosixPath
+import hashlib
+import itertools
 import uuid
 import json
 import logging
+import multiprocessing
+import time
 
 from data_types import DocumentationPage, ApiReferencePage
+from schema_cache import SchemaCache
 
 if TYPE_CHECKING:
     from indexing_logger import IndexingLogger
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+_JSON_WHITESPACE = " \t\n\r"
+_VALUE_DELIMITERS = ",}]" + _JSON_WHITESPACE
+
+
+def iter_json_object(path: Path, chunk_size: int = 1 << 16) -> Iterator[Tuple[str, Any]]:
+    """Yield the (key, value) pairs of a top-level JSON object as they are decoded.
+
+    The file is read in chunks and each value is decoded as soon as it is
+    complete, so memory is bounded by the largest single value rather than the
+    whole file. Raises json.JSONDecodeError on malformed input.
+    """
+    decoder = json.JSONDecoder()
+    with path.open(encoding="utf-8") as f:
+        buf = ""
+        pos = 0
+        eof = False
+
+        def read_more() -> bool:
+            """Append the next chunk, dropping consumed text. False at EOF."""
+            nonlocal buf, pos, eof
+            if eof:
+                return False
+            # Grow geometrically so re-decoding a large value stays amortized linear.
+            chunk = f.read(max(chunk_size, len(buf) - pos))
+            if not chunk:
+                eof = True
+                return False
+            buf = buf[pos:] + chunk
+            pos = 0
+            return True
+
+        def skip_whitespace() -> None:
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in _JSON_WHITESPACE:
+                    pos += 1
+                if pos < len(buf) or not read_more():
+                    return
+
+        def expect(chars: str) -> str:
+            nonlocal pos
+            skip_whitespace()
+            if pos >= len(buf) or buf[pos] not in chars:
+                raise json.JSONDecodeError(f"Expecting one of {chars!r}", buf, pos)
+            pos += 1
+            return buf[pos - 1]
+
+        def decode_value() -> Any:
+            nonlocal pos
+            skip_whitespace()
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if read_more():
+                        continue
+                    raise
+                # A bare number or literal is complete only once a delimiter follows
+                # it; "1." or "1e" at the end of a chunk decodes as a shorter number.
+                if (
+                    not isinstance(value, (dict, list, str))
+                    and (end == len(buf) or buf[end] not in _VALUE_DELIMITERS)
+                    and read_more()
+                ):
+                    continue
+                pos = end
+                return value
+
+        def expect_end() -> None:
+            skip_whitespace()
+            if pos < len(buf):
+                raise json.JSONDecodeError("Extra data", buf, pos)
+
+        expect("{")
+        skip_whitespace()
+        if pos < len(buf) and buf[pos] == "}":
+            pos += 1
+            expect_end()
+            return
+        while True:
+            key = decode_value()
+            if not isinstance(key, str):
+                raise json.JSONDecodeError("Expecting property name", buf, pos)
+            expect(":")
+            yield key, decode_value()
+            if expect(",}") == "}":
+                expect_end()
+                return
+
 
 @dataclass(frozen=True)
 class ApiRoute:
@@ -58,25 +157,131 @@ class ApiRoute:
         return "overview" in self.slug
 
 
+@dataclass(frozen=True)
+class _LazySchema:
+    """A schema node whose simplified form has not been built yet."""
+    schema: dict
+    max_depth: int
+    depth: int
+
+
+@dataclass(frozen=True)
+class _LazyProperties:
+    """The "properties" map of a schema node, simplified one entry at a time."""
+    properties: dict
+    max_depth: int
+    depth: int
+
+
+def _simplified_items(node: _LazySchema) -> Iterator[Tuple[str, Any]]:
+    """Yield the items of node.schema simplified to max_depth levels, in order.
+
+    Keeps type/description/required/enum, recurses into properties and items,
+    merges allOf members, and collapses nodes at max_depth to a type and
+    description stub.
+
+    Nested schemas are yielded as lazy placeholders, so nothing below this
+    node is walked until a consumer serializes it.
+    """
+    schema, max_depth, depth = node.schema, node.max_depth, node.depth
+    if depth >= max_depth:
+        yield "type", schema.get("type", "object")
+        yield "description", schema.get("description", "...")
+        return
+
+    if "allOf" in schema:
+        # Same first-key-order / last-value-wins semantics as the dict.update merge.
+        merged: dict = {}
+        for sub in schema["allOf"]:
+            if isinstance(sub, dict):
+                merged.update(_simplified_items(_LazySchema(sub, max_depth, depth)))
+        yield from merged.items()
+        return
+
+    for key in ("type", "description", "required", "enum"):
+        if key in schema:
+            yield key, schema[key]
+    if "properties" in schema:
+        yield "properties", _LazyProperties(schema["properties"], max_depth, depth + 1)
+    if "items" in schema and isinstance(schema["items"], dict):
+        yield "items", _LazySchema(schema["items"], max_depth, depth + 1)
+
+
+def _iter_json(value: Any, level: int = 0) -> Iterator[str]:
+    """Serialize value in chunks, exactly as json.dumps(value, indent=2) would.
+
+    Lazy schema placeholders are expanded only when reached, so a consumer
+    that stops iterating early never walks the rest of the schema.
+    """
+    if isinstance(value, _LazySchema):
+        yield from _iter_json_container(_simplified_items(value), "{", "}", level)
+    elif isinstance(value, _LazyProperties):
+        entries = (
+            (name, _LazySchema(prop, value.max_depth, value.depth))
+            for name, prop in value.properties.items()
+        )
+        yield from _iter_json_container(entries, "{", "}", level)
+    elif isinstance(value, dict):
+        yield from _iter_json_container(iter(value.items()), "{", "}", level)
+    elif isinstance(value, (list, tuple)):
+        yield from _iter_json_container(((None, item) for item in value), "[", "]", level)
+    else:
+        yield json.dumps(value)
+
+
+def _iter_json_container(
+    entries: Iterator[Tuple[Optional[str], Any]], open_char: str, close_char: str, level: int
+) -> Iterator[str]:
+    first = next(entries, None)
+    if first is None:
+        yield open_char + close_char
+        return
+    inner = "\n" + "  " * (level + 1)
+    separator = open_char
+    for key, item in itertools.chain((first,), entries):
+        yield separator + inner
+        if key is not None:
+            yield json.dumps(key) + ": "
+        yield from _iter_json(item, level + 1)
+        separator = ","
+    yield "\n" + "  " * level + close_char
+
+
 class DeveloperDocsDataClient:
     """Reads documentation content from Docusaurus build output files."""
 
     MAX_SCHEMA_CHARS = 20_000
+    SCHEMA_MAX_DEPTH = 2
+    # Bump when a renderer's output format changes to invalidate on-disk entries.
+    SCHEMA_CACHE_VERSION = 1
 
     def __init__(
         self,
         repo_root: Optional[str] = None,
         indexing_logger: Optional["IndexingLogger"] = None,
+        workers: int = 1,
+        schema_cache_dir: Optional[str] = None,
     ):
         if repo_root is None:
             repo_root = str(Path(__file__).parent.parent.parent)
         self.repo_root = Path(repo_root)
         self.indexing_logger = indexing_logger
+        # >1 builds API reference pages in a process pool of this size.
+        self.workers = workers
+        self.schema_cache_dir = schema_cache_dir
+        self.schema_cache = SchemaCache(schema_cache_dir) if schema_cache_dir else None
 
         self.docs_json_path = self.repo_root / "build" / "mcp" / "docs.json"
         self.timestamps_path = self.repo_root / "build" / "indexing" / "timestamps.json"
         self.api_docs_dir = self.repo_root / "docs" / "api"
         self._timestamps: Optional[dict[str, dict]] = None
+        # Schema-file memoization: stat key -> content digest, and
+        # (renderer, digest) -> rendered output.
+        self._digests: dict[tuple, str] = {}
+        self._rendered: dict[tuple[str, str], Any] = {}
+        # Set in pool workers, which have no logger: (stage, duration_ms) pairs
+        # handed back with each page for the parent to record.
+        self._worker_timings: Optional[List[Tuple[str, float]]] = None
 
     def _load_timestamps(self) -> dict[str, dict]:
         """Load timestamps map produced by the doc-timestamps Docusaurus plugin.
@@ -107,105 +312,148 @@ class DeveloperDocsDataClient:
         if self.indexing_logger:
             self.indexing_logger.log(msg)
 
+    def _record_timing(self, stage: str, duration_ms: float) -> None:
+        if self.indexing_logger:
+            self.indexing_logger.record_timing(stage, duration_ms)
+        elif self._worker_timings is not None:
+            self._worker_timings.append((stage, duration_ms))
+
+    @contextmanager
+    def _timed(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record_timing(stage, (time.perf_counter() - start) * 1000)
+
     def _is_api_reference(self, route: str) -> bool:
         """Check if a route is an API reference page (not an overview)."""
         parsed = ApiRoute.parse(route)
         return parsed is not None and not parsed.is_overview
 
-    def _simplify_schema(self, schema: dict, max_depth: int = 2, depth: int = 0) -> dict:
-        """Simplify a JSON schema by limiting nesting depth."""
-        if depth >= max_depth:
-            return {"type": schema.get("type", "object"), "description": schema.get("description", "...")}
-
-        result = {}
-        for key in ("type", "description", "required", "enum"):
-            if key in schema:
-                result[key] = schema[key]
-
-        if "properties" in schema:
-            result["properties"] = {
-                name: self._simplify_schema(prop, max_depth, depth + 1)
-                for name, prop in schema["properties"].items()
-            }
-
-        if "items" in schema and isinstance(schema["items"], dict):
-            result["items"] = self._simplify_schema(schema["items"], max_depth, depth + 1)
-
-        if "allOf" in schema:
-            merged = {}
-            for sub in schema["allOf"]:
-                if isinstance(sub, dict):
-                    simplified = self._simplify_schema(sub, max_depth, depth)
-                    merged.update(simplified)
-            return merged
+    def _file_digest(self, path: Path) -> tuple[str, Optional[bytes]]:
+        """Content digest of a file, plus its bytes if they had to be read.
 
-        return result
-
-    def _load_request_schema(self, route: ApiRoute) -> str:
-        """Load and format the request schema for an endpoint."""
-        path = self.api_docs_dir / route.schema_dir / f"{route.slug}.RequestSchema.json"
+        Digests are remembered per (device, inode, size, mtime) so a file that
+        is looked up again is not re-read or re-hashed.
+        """
+        st = path.stat()
+        stat_key = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+        digest = self._digests.get(stat_key)
+        if digest is not None:
+            return digest, None
+        raw = path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        self._digests[stat_key] = digest
+        return digest, raw
+
+    def _load_rendered(self, path: Path, render: Callable[[dict], T], default: T) -> T:
+        """Parse a schema file and render it, memoized by file content.
+
+        Byte-identical files (e.g. the chat and chat-stream request schemas) are
+        parsed, simplified and serialized once per client, whatever their path.
+        With a schema cache configured, rendered output also persists across
+        runs, so unchanged specs are not parsed at all.
+        """
         if not path.exists():
-            return ""
+            return default
         try:
-            data = json.loads(path.read_text())
-            body = data.get("body", {})
-            content = body.get("content", {})
+            digest, raw = self._file_digest(path)
+            key = (render.__name__, digest)
+            if key in self._rendered:
+                return self._rendered[key]
+
+            disk_key = self._schema_cache_key(render.__name__, digest)
+            cached = self.schema_cache.get(disk_key) if self.schema_cache else None
+            if cached is not None:
+                # JSON turns tuples into lists; restore the renderer's shape.
+                result = tuple(cached) if isinstance(default, tuple) else cached
+            else:
+                if raw is None:
+                    raw = path.read_bytes()
+                result = render(json.loads(raw))
+                if self.schema_cache:
+                    self.schema_cache.put(disk_key, result)
+        except (json.JSONDecodeError, UnicodeDecodeError, OSError):
+            return default
+        self._rendered[key] = result
+        return result
+
+    def _schema_cache_key(self, renderer: str, digest: str) -> str:
+        """On-disk cache key: file content plus every setting that shapes the output."""
+        settings = (
+            f"{renderer}:{digest}:{self.MAX_SCHEMA_CHARS}:"
+            f"{self.SCHEMA_MAX_DEPTH}:{self.SCHEMA_CACHE_VERSION}"
+        )
+        return hashlib.sha256(settings.encode()).hexdigest()
+
+    def _render_schema_text(self, schema: dict) -> str:
+        """Simplify a schema and serialize it, truncated to MAX_SCHEMA_CHARS.
+
+        Produces the same text as json.dumps of the fully simplified schema
+        with indent=2, cut at the budget, but simplifies and serializes lazily
+        and stops as soon as the budget is exceeded, so giant schemas cost no
+        more than MAX_SCHEMA_CHARS worth of work.
+        """
+        chunks: List[str] = []
+        length = 0
+        for chunk in _iter_json(_LazySchema(schema, self.SCHEMA_MAX_DEPTH, 0)):
+            chunks.append(chunk)
+            length += len(chunk)
+            if length > self.MAX_SCHEMA_CHARS:
+                return "".join(chunks)[:self.MAX_SCHEMA_CHARS] + "\n... (truncated)"
+        return "".join(chunks)
+
+    def _render_request_schema(self, data: dict) -> str:
+        body = data.get("body", {})
+        content = body.get("content", {})
+        for content_type, spec in content.items():
+            schema = spec.get("schema", {})
+            if schema:
+                return self._render_schema_text(schema)
+        return ""
+
+    def _render_status_codes(self, data: dict) -> tuple[tuple[str, ...], str]:
+        responses = data.get("responses", {})
+        codes = tuple(f"{code}: {info.get('description', '')}" for code, info in responses.items())
+
+        response_body = ""
+        success = responses.get("200", responses.get("201", {}))
+        if isinstance(success, dict):
+            content = success.get("content", {})
             for content_type, spec in content.items():
                 schema = spec.get("schema", {})
                 if schema:
-                    simplified = self._simplify_schema(schema)
-                    text = json.dumps(simplified, indent=2)
-                    if len(text) > self.MAX_SCHEMA_CHARS:
-                        text = text[:self.MAX_SCHEMA_CHARS] + "\n... (truncated)"
-                    return text
-            return ""
-        except (json.JSONDecodeError, OSError):
-            return ""
+                    response_body = self._render_schema_text(schema)
+                    break
+
+        return codes, response_body
+
+    def _render_params(self, data: dict) -> tuple[str, str]:
+        params = data.get("parameters", [])
+        query = {p["name"]: p for p in params if p.get("in") == "query"}
+        path_params = {p["name"]: p for p in params if p.get("in") == "path"}
+        return (
+            json.dumps(query, indent=2) if query else "",
+            json.dumps(path_params, indent=2) if path_params else "",
+        )
+
+    def _load_request_schema(self, route: ApiRoute) -> str:
+        """Load and format the request schema for an endpoint."""
+        path = self.api_docs_dir / route.schema_dir / f"{route.slug}.RequestSchema.json"
+        return self._load_rendered(path, self._render_request_schema, "")
 
     def _load_status_codes(self, route: ApiRoute) -> tuple[List[str], str]:
         """Load response status codes and the success response body schema."""
         path = self.api_docs_dir / route.schema_dir / f"{route.slug}.StatusCodes.json"
-        if not path.exists():
-            return [], ""
-        try:
-            data = json.loads(path.read_text())
-            responses = data.get("responses", {})
-            codes = [f"{code}: {info.get('description', '')}" for code, info in responses.items()]
-
-            response_body = ""
-            success = responses.get("200", responses.get("201", {}))
-            if isinstance(success, dict):
-                content = success.get("content", {})
-                for content_type, spec in content.items():
-                    schema = spec.get("schema", {})
-                    if schema:
-                        simplified = self._simplify_schema(schema)
-                        text = json.dumps(simplified, indent=2)
-                        if len(text) > self.MAX_SCHEMA_CHARS:
-                            text = text[:self.MAX_SCHEMA_CHARS] + "\n... (truncated)"
-                        response_body = text
-                        break
-
-            return codes, response_body
-        except (json.JSONDecodeError, OSError):
-            return [], ""
+        codes, response_body = self._load_rendered(path, self._render_status_codes, ((), ""))
+        # Cached results are shared between pages; hand each page its own list.
+        return list(codes), response_body
 
     def _load_params(self, route: ApiRoute) -> tuple[str, str]:
         """Load query and path parameters. Returns (query_params, path_params) as JSON strings."""
         path = self.api_docs_dir / route.schema_dir / f"{route.slug}.ParamsDetails.json"
-        if not path.exists():
-            return "", ""
-        try:
-            data = json.loads(path.read_text())
-            params = data.get("parameters", [])
-            query = {p["name"]: p for p in params if p.get("in") == "query"}
-            path_params = {p["name"]: p for p in params if p.get("in") == "path"}
-            return (
-                json.dumps(query, indent=2) if query else "",
-                json.dumps(path_params, indent=2) if path_params else "",
-            )
-        except (json.JSONDecodeError, OSError):
-            return "", ""
+        return self._load_rendered(path, self._render_params, ("", ""))
 
     def _extract_method_and_endpoint(self, markdown: str) -> tuple[str, str]:
         """Extract HTTP method and endpoint path from the markdown content."""
@@ -245,9 +493,10 @@ class DeveloperDocsDataClient:
         method, endpoint = self._extract_method_and_endpoint(markdown)
         description = doc.get("description", "")
 
-        request_body = self._load_request_schema(route)
-        response_codes, response_body = self._load_status_codes(route)
-        query_params, path_params = self._load_params(route)
+        with self._timed("load_schemas"):
+            request_body = self._load_request_schema(route)
+            response_codes, response_body = self._load_status_codes(route)
+            query_params, path_params = self._load_params(route)
 
         return ApiReferencePage(
             id=str(uuid.uuid5(uuid.NAMESPACE_URL, url)),
@@ -275,27 +524,110 @@ class DeveloperDocsDataClient:
             updated_at=ts.get("lastUpdate"),
         )
 
+    def _build_page(self, url: str, doc: dict) -> Union[DocumentationPage, ApiReferencePage]:
+        if self._is_api_reference(doc.get("route", "")):
+            return self._build_api_reference(url, doc)
+        return self._build_info_page(url, doc)
+
+    def _build_timed(
+        self, url: str, doc: dict, build: Callable[[str, dict], T]
+    ) -> Tuple[T, float]:
+        """build(url, doc) and its duration in ms, also recorded as the build_page stage."""
+        start = time.perf_counter()
+        page = build(url, doc)
+        duration_ms = (time.perf_counter() - start) * 1000
+        self._record_timing("build_page", duration_ms)
+        return page, duration_ms
+
+    def _timed_entries(self, entries: Iterator[Tuple[str, dict]]) -> Iterator[Tuple[str, dict]]:
+        """Pass entries through, timing how long each takes to decode from docs.json."""
+        while True:
+            start = time.perf_counter()
+            try:
+                entry = next(entries)
+            except StopIteration:
+                return
+            self._record_timing("parse_docs_json", (time.perf_counter() - start) * 1000)
+            yield entry
+
+    def _iter_built_pages(
+        self, entries: Iterator[Tuple[str, dict]]
+    ) -> Iterator[Tuple[str, Union[DocumentationPage, ApiReferencePage], float]]:
+        """Build pages from (url, doc) entries, yielding (url, page, build_ms) in input order.
+
+        With workers > 1, API reference pages (the expensive ones) are built in
+        a process pool. At most a few pages per worker are in flight at a time,
+        so results still stream out in order without buffering the corpus.
+        """
+        if self.workers <= 1:
+            for url, doc in entries:
+                yield (url, *self._build_timed(url, doc, self._build_page))
+            return
+
+        self._log(f"  Building API reference pages with {self.workers} worker processes")
+        window = self.workers * 4
+        pending: Deque[Tuple[str, Union[Future, Tuple[DocumentationPage, float]]]] = deque()
+        # Spawn, not fork: the background log writer and the uploader's producer
+        # thread may be running, and forking a threaded process can deadlock.
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self._worker_kwargs(),),
+        ) as pool:
+            for url, doc in entries:
+                if self._is_api_reference(doc.get("route", "")):
+                    pending.append((url, pool.submit(_build_api_reference_in_worker, url, doc)))
+                else:
+                    pending.append((url, self._build_timed(url, doc, self._build_info_page)))
+                while len(pending) >= window:
+                    yield self._resolve_pending(pending.popleft())
+            while pending:
+                yield self._resolve_pending(pending.popleft())
+
+    def _resolve_pending(
+        self, item: Tuple[str, Union[Future, Tuple[DocumentationPage, float]]]
+    ) -> Tuple[str, Union[DocumentationPage, ApiReferencePage], float]:
+        url, built = item
+        if not isinstance(built, Future):
+            return (url, *built)
+        page, duration_ms, timings = built.result()
+        for stage, stage_ms in timings:
+            self._record_timing(stage, stage_ms)
+        return url, page, duration_ms
+
+    def _worker_kwargs(self) -> dict:
+        """Constructor arguments for the per-process clients in the pool.
+
+        Workers are spawned, so this is everything they know about the parent's
+        client; it must be picklable.
+        """
+        return {"repo_root": str(self.repo_root), "schema_cache_dir": self.schema_cache_dir}
+
     def get_source_data(
         self, since: Optional[str] = None
     ) -> List[Union[DocumentationPage, ApiReferencePage]]:
         """Read all documentation pages from the build output."""
+        return list(self.iter_source_data(since=since))
+
+    def iter_source_data(
+        self, since: Optional[str] = None
+    ) -> Iterator[Union[DocumentationPage, ApiReferencePage]]:
+        """Yield documentation pages one at a time while docs.json is being decoded."""
         if not self.docs_json_path.exists():
             raise RuntimeError(
                 f"docs.json not found at {self.docs_json_path}. "
                 "Run 'pnpm build' first to generate the build output."
             )
 
-        docs = json.loads(self.docs_json_path.read_text())
-        self._log(f"  Loaded {len(docs)} pages from {self.docs_json_path}")
+        self._log(f"  Reading pages from {self.docs_json_path}")
 
-        pages: List[Union[DocumentationPage, ApiReferencePage]] = []
         info_count = 0
         api_count = 0
 
-        for url, doc in docs.items():
-            route = doc.get("route", "")
-            if self._is_api_reference(route):
-                page = self._build_api_reference(url, doc)
+        entries = self._timed_entries(iter_json_object(self.docs_json_path))
+        for url, page, duration_ms in self._iter_built_pages(entries):
+            if page["page_type"] == "api_reference":
                 api_count += 1
                 if self.indexing_logger:
                     self.indexing_logger.log_document(
@@ -304,13 +636,12 @@ class DeveloperDocsDataClient:
                         title=page["title"],
                         content_length=len(page.get("request_body", "")),
                         status="success",
-                        duration_ms=0,
+                        duration_ms=duration_ms,
                         tag=page["tag"],
                         method=page["method"],
                         endpoint=page["endpoint"],
                     )
             else:
-                page = self._build_info_page(url, doc)
                 info_count += 1
                 if self.indexing_logger:
                     self.indexing_logger.log_document(
@@ -319,9 +650,32 @@ class DeveloperDocsDataClient:
                         title=page["title"],
                         content_length=len(page["content"]),
                         status="success",
-                        duration_ms=0,
+                        duration_ms=duration_ms,
                     )
-            pages.append(page)
+            yield page
 
         self._log(f"  Processed {info_count} info pages and {api_count} API reference pages")
-        return pages
+        if self.schema_cache:
+            evicted = self.schema_cache.prune()
+            # Hit/miss counters only cover this process; pool workers keep their own.
+            self._log(
+                f"  Schema cache: {self.schema_cache.hits} hits, "
+                f"{self.schema_cache.misses} misses, {evicted} evicted"
+            )
+
+
+# Per-process client used by the worker pool in _iter_built_pages.
+_worker_client: Optional[DeveloperDocsDataClient] = None
+
+
+def _init_worker(client_kwargs: dict) -> None:
+    global _worker_client
+    _worker_client = DeveloperDocsDataClient(**client_kwargs)
+
+
+def _build_api_reference_in_worker(
+    url: str, doc: dict
+) -> Tuple[ApiReferencePage, float, List[Tuple[str, float]]]:
+    _worker_client._worker_timings = timings = []
+    page, duration_ms = _worker_client._build_timed(url, doc, _worker_client._build_api_reference)
+    return page, duration_ms, timings
@@ -1,19 +1,26 @@
-from typing import Union, List, Tuple, Optional, TYPE_CHECKING, AsyncGenerator
+from typing import Any, Callable, ContextManager, Union, List, Tuple, Optional, TYPE_CHECKING, AsyncGenerator, AsyncIterator, Iterator, TypeVar
 from pathlib import PurePosixPath
 from urllib.parse import urlparse
 import asyncio
 import uuid
+from contextlib import aclosing, asynccontextmanager, nullcontext
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 import json
 import logging
+import multiprocessing
 import time
-import xml.etree.ElementTree as ET
 
 import aiohttp
+import lxml.html
 import trafilatura
 from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 
 from glean.indexing.connectors import BaseAsyncStreamingDataClient
+from browser_pool import BrowserPagePool
+from crawl_cache import CrawlCache
+from crawl_scheduler import schedule
+from sitemap_stream import stream_sitemap
 from data_types import DocumentationPage, ApiReferencePage
 
 if TYPE_CHECKING:
@@ -21,120 +28,337 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# DOM markers the API reference scraper waits for. The endpoint block is in the
+# server-rendered HTML, so it says nothing about hydration; Docusaurus sets
+# data-has-hydrated on <html> once every page hydrates, and code sample lines
+# appear with it (or not at all, for endpoints without samples).
+CODE_LINE_SELECTOR = ".openapi-explorer__code-block-code-line-content"
+HYDRATED_SELECTOR = "html[data-has-hydrated]"
+
+# Code-sample tab suffix (openapi-tabs__code-item--<lang>) -> ApiReferencePage field.
+CODE_SAMPLE_LANGUAGES = {
+    'python': 'python_code_sample',
+    'go': 'go_code_sample',
+    'java': 'java_code_sample',
+    'javascript': 'typescript_code_sample',
+    'curl': 'curl_code_sample',
+}
+
+# Collects every language's code sample in one round trip: clicks each tab
+# in-page, polls until it is selected and its lines are visible (bounded per
+# tab by timeoutMs, the short code sample timeout), and returns {lang: text}
+# for the languages that rendered.
+_EXTRACT_CODE_SAMPLES_JS = """
+async ({languages, lineSelector, timeoutMs}) => {
+    const visibleLines = () => Array.from(document.querySelectorAll(lineSelector))
+        .filter((line) => line.offsetParent !== null)
+        .map((line) => line.innerText)
+        .filter((text) => text.trim());
+    const samples = {};
+    for (const lang of languages) {
+        const tab = document.querySelector(`.openapi-tabs__code-item--${lang}`);
+        if (!tab) continue;
+        tab.click();
+        const deadline = Date.now() + timeoutMs;
+        let lines = [];
+        while (Date.now() < deadline) {
+            if (tab.getAttribute('aria-selected') === 'true') {
+                lines = visibleLines();
+                if (lines.length) break;
+            }
+            await new Promise((resolve) => setTimeout(resolve, 25));
+        }
+        if (lines.length) samples[lang] = lines.join('\\n');
+    }
+    return samples;
+}
+"""
+
+# Read size for streamed sitemap bodies.
+SITEMAP_CHUNK_BYTES = 64 * 1024
+
+ENDPOINT_MARKER = "openapi__method-endpoint"
+_ENDPOINT_XPATH = (
+    "//pre[contains(concat(' ', normalize-space(@class), ' '), ' %s ')]" % ENDPOINT_MARKER
+)
+
+
+def _title_from_url(url: str) -> str:
+    path = PurePosixPath(urlparse(url).path)
+    last_segment = path.name or ""
+    return last_segment.replace('-', ' ').replace('_', ' ').title()
+
+
+class ParsedHtml:
+    """A fetched page parsed at most once, shared by classification, title and content extraction.
+
+    Classification first checks for the endpoint marker as a plain substring;
+    pages without it (all info pages) are only parsed if their content is needed.
+    """
+
+    def __init__(self, html: str):
+        self.html = html
+        self._tree: Optional[lxml.html.HtmlElement] = None
+
+    @property
+    def tree(self) -> Optional[lxml.html.HtmlElement]:
+        if self._tree is None and self.html.strip():
+            self._tree = lxml.html.fromstring(self.html)
+        return self._tree
+
+    @property
+    def is_api_reference(self) -> bool:
+        if ENDPOINT_MARKER not in self.html:
+            return False
+        return self.tree is not None and bool(self.tree.xpath(_ENDPOINT_XPATH))
+
+    def h1_text(self) -> Optional[str]:
+        h1 = self.tree.find('.//h1') if self.tree is not None else None
+        return h1.text_content().strip() if h1 is not None else None
+
+    def extract_documentation_page(self, url: str) -> Tuple[Optional[DocumentationPage], Optional[str]]:
+        """Build the info page for this HTML, or return (None, error)."""
+        if self.tree is None:
+            return None, "No content extracted"
+        # Read the title before trafilatura, which prunes the tree it is given.
+        title = self.h1_text() or _title_from_url(url)
+        content = trafilatura.extract(
+            self.tree,
+            include_tables=True,
+            include_comments=False,
+            include_images=False,
+            output_format="txt"
+        ) or ""
+        if not content:
+            return None, "No content extracted"
+        page = DocumentationPage(
+            id=str(uuid.uuid5(uuid.NAMESPACE_URL, url)),
+            title=title,
+            content=content,
+            url=url,
+            page_type="info_page"
+        )
+        return page, None
+
+
+def _extract_documentation_page(url: str, html: str) -> Tuple[Optional[DocumentationPage], Optional[str]]:
+    return ParsedHtml(html).extract_documentation_page(url)
+
+
+def _classify_and_extract(url: str, html: str) -> Tuple[bool, Optional[DocumentationPage], Optional[str]]:
+    """(is_api_reference, info page, error) for a crawled page; API pages are left to Playwright."""
+    parsed = ParsedHtml(html)
+    if parsed.is_api_reference:
+        return True, None, None
+    page, error = parsed.extract_documentation_page(url)
+    return False, page, error
+
+
+T = TypeVar("T")
+
+
+class _ExtractionStage:
+    """Runs CPU-bound HTML extraction off the event loop.
+
+    The crawl scheduler runs fetch_limit + 2 * workers page workers, each doing
+    fetch then extract. When extraction falls behind, workers wait on it and no
+    new downloads start, while the extra workers beyond the fetch limit keep
+    the executor fed.
+    """
+
+    @staticmethod
+    def page_workers(fetch_limit: int, workers: int) -> int:
+        return fetch_limit + 2 * workers
+
+    def __init__(self, kind: str, workers: int):
+        if kind == "process":
+            # Spawn, not fork: the event loop and log writer threads are already running.
+            self.executor: Executor = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        elif kind == "thread":
+            self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="html-extract")
+        else:
+            raise ValueError(f"Unknown extraction executor {kind!r}; expected 'thread' or 'process'")
+
+    async def __aenter__(self) -> "_ExtractionStage":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    def close(self) -> None:
+        # Don't block the event loop; anything still queued belongs to an abandoned crawl.
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
 class DeveloperDocsDataClient(BaseAsyncStreamingDataClient[Union[DocumentationPage, ApiReferencePage]]):
 
-    def __init__(self, dev_docs_base_url: str, indexing_logger: Optional["IndexingLogger"] = None):
+    def __init__(
+        self,
+        dev_docs_base_url: str,
+        indexing_logger: Optional["IndexingLogger"] = None,
+        api_concurrency: int = 3,
+        page_max_uses: int = 50,
+        render_timeout_ms: int = 15000,
+        code_sample_timeout_ms: int = 1000,
+        api_result_buffer: int = 16,
+        extract_executor: str = "thread",
+        extract_workers: int = 4,
+        crawl_cache_path: Optional[str] = None,
+        crawl_concurrency: int = 10,
+        per_host_concurrency: Optional[int] = None,
+        sitemap_concurrency: int = 4,
+    ):
         self.dev_docs_base_url = dev_docs_base_url
         self.indexing_logger = indexing_logger
+        # Warm browser pages shared by API reference scrapes; also the scrape concurrency.
+        self.api_concurrency = api_concurrency
+        # Scrapes served by one pooled page before it is replaced.
+        self.page_max_uses = page_max_uses
+        # Upper bound on each wait for a rendered DOM marker; scrapes normally finish well before it.
+        self.render_timeout_ms = render_timeout_ms
+        # Bound on waits for code sample lines after hydration and after each tab click; endpoints
+        # and tabs without samples never render any, so keep it far below render_timeout_ms.
+        self.code_sample_timeout_ms = code_sample_timeout_ms
+        # Scraped API reference pages allowed to wait for the caller before scraping pauses.
+        self.api_result_buffer = api_result_buffer
+        # Where trafilatura/lxml extraction runs: "thread" or "process" pool of extract_workers.
+        self.extract_executor = extract_executor
+        self.extract_workers = extract_workers
+        # Validators and extracted pages from previous crawls; None crawls everything.
+        self.crawl_cache = CrawlCache(crawl_cache_path) if crawl_cache_path else None
+        # Concurrent page downloads overall and per host; hosts are served round-robin.
+        self.crawl_concurrency = crawl_concurrency
+        self.per_host_concurrency = per_host_concurrency
+        # Child sitemaps of a sitemap index fetched at once.
+        self.sitemap_concurrency = sitemap_concurrency
+        # One HTTP session for the sitemap, page crawl and fallback fetches; see http_session().
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_users = 0
+
+    async def __aenter__(self) -> "DeveloperDocsDataClient":
+        """Keep the shared HTTP session open across several crawl calls."""
+        await self._acquire_session()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._release_session()
+
+    @asynccontextmanager
+    async def http_session(self) -> AsyncIterator[aiohttp.ClientSession]:
+        """The client's shared session, opened on first use and closed when the last user exits.
+
+        Connections are kept alive and DNS answers cached for the whole run, so
+        TLS handshakes and lookups are paid once rather than once per phase.
+        """
+        session = await self._acquire_session()
+        try:
+            yield session
+        finally:
+            await self._release_session()
+
+    async def _acquire_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.crawl_concurrency,
+                limit_per_host=self.per_host_concurrency or 0,
+                ttl_dns_cache=300,
+                keepalive_timeout=30,
+            )
+            # aiohttp negotiates Accept-Encoding itself (adding br when brotli is
+            # installed) and decompresses responses transparently.
+            self._session = aiohttp.ClientSession(connector=connector)
+        self._session_users += 1
+        return self._session
+
+    async def _release_session(self) -> None:
+        self._session_users -= 1
+        if self._session_users == 0 and self._session is not None:
+            session, self._session = self._session, None
+            await session.close()
 
     async def _get_all_sitemap_urls(self, sitemap_url: str) -> List[str]:
-        async with aiohttp.ClientSession() as session:
+        return [url for url, _ in await self._get_sitemap_entries(sitemap_url)]
+
+    async def _get_sitemap_entries(self, sitemap_url: str) -> List[Tuple[str, Optional[str]]]:
+        """(loc, lastmod) for every page in the sitemap; lastmod is None when absent."""
+        async with aclosing(self._stream_sitemap_entries(sitemap_url)) as entries:
+            return [entry async for entry in entries]
+
+    def _stream_sitemap_entries(self, sitemap_url: str) -> AsyncIterator[Tuple[str, Optional[str]]]:
+        """(loc, lastmod) pairs as they are parsed, following sitemap indexes and .xml.gz sitemaps."""
+        return stream_sitemap(sitemap_url, self._fetch_sitemap, concurrency=self.sitemap_concurrency)
+
+    async def _fetch_sitemap(self, sitemap_url: str) -> AsyncIterator[bytes]:
+        async with self.http_session() as session:
             async with session.get(sitemap_url) as response:
                 if response.status != 200:
-                    raise RuntimeError(f"Failed to fetch sitemap: {response.status}")
-                content = await response.read()
-                root = ET.fromstring(content)
-                urls = [elem.text for elem in root.findall('.//{http://www.sitemaps.org/schemas/sitemap/0.9}loc')]
-                return urls
+                    raise RuntimeError(f"Failed to fetch sitemap {sitemap_url}: {response.status}")
+                async for chunk in response.content.iter_chunked(SITEMAP_CHUNK_BYTES):
+                    yield chunk
 
     def _is_api_reference_page(self, html: str) -> bool:
-        soup = BeautifulSoup(html, 'html.parser')
-        return bool(soup.find('pre', class_='openapi__method-endpoint'))
+        return ParsedHtml(html).is_api_reference
 
     async def get_documentation_page_data(self, urls: List[str]) -> AsyncGenerator[DocumentationPage, None]:
         """Extract documentation pages using trafilatura for clean content extraction."""
 
-        def title_from_url(url: str) -> str:
-            path = PurePosixPath(urlparse(url).path)
-            last_segment = path.name or ""
-            return last_segment.replace('-', ' ').replace('_', ' ').title()
-
         async def extract_page(session: aiohttp.ClientSession, url: str) -> Tuple[Optional[DocumentationPage], Optional[str], float]:
             """Extract a page and return (page, error, duration_ms)."""
             start_time = time.time()
             try:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                    if response.status != 200:
-                        error = f"HTTP {response.status}"
-                        return None, error, (time.time() - start_time) * 1000
-
-                    html = await response.text()
-                    content = trafilatura.extract(
-                        html,
-                        include_tables=True,
-                        include_comments=False,
-                        include_images=False,
-                        output_format="txt"
-                    ) or ""
-
-                    if not content:
-                        return None, "No content extracted", (time.time() - start_time) * 1000
-
-                    soup = BeautifulSoup(html, 'lxml')
-                    h1 = soup.find('h1')
-                    title = h1.text.strip() if h1 else title_from_url(url)
-
-                    page = DocumentationPage(
-                        id=str(uuid.uuid5(uuid.NAMESPACE_URL, url)),
-                        title=title,
-                        content=content,
-                        url=url,
-                        page_type="info_page"
-                    )
-                    return page, None, (time.time() - start_time) * 1000
+                with self._timed("fetch"):
+                    async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
+                        if response.status != 200:
+                            error = f"HTTP {response.status}"
+                            return None, error, (time.time() - start_time) * 1000
+                        html = await response.text()
+
+                with self._timed("parse"):
+                    page, error = await stage.run(_extract_documentation_page, url, html)
+                return page, error, (time.time() - start_time) * 1000
 
             except Exception as e:
                 return None, str(e), (time.time() - start_time) * 1000
 
-        connector = aiohttp.TCPConnector(limit=10)
-        async with aiohttp.ClientSession(connector=connector) as session:
-            # Create tasks with URL tracking for incremental yielding
+        async with _ExtractionStage(self.extract_executor, self.extract_workers) as stage, \
+                self.http_session() as session:
+            # Track the URL alongside each result for logging
             async def extract_with_url(url: str) -> Tuple[str, Tuple[Optional[DocumentationPage], Optional[str], float]]:
                 result = await extract_page(session, url)
                 return (url, result)
 
-            tasks = [asyncio.create_task(extract_with_url(url)) for url in urls]
-
-            # Use as_completed to yield results incrementally as they finish
-            for coro in asyncio.as_completed(tasks):
-                try:
-                    url, result = await coro
-                except Exception as e:
-                    if self.indexing_logger:
-                        self.indexing_logger.log_document(
-                            url="unknown",
-                            doc_type="info_page",
-                            title="",
-                            content_length=0,
-                            status="error",
-                            error=str(e),
-                        )
-                    continue
-
-                page, error, duration_ms = result
-
-                if page is not None:
-                    if self.indexing_logger:
-                        self.indexing_logger.log_document(
-                            url=url,
-                            doc_type="info_page",
-                            title=page["title"],
-                            content_length=len(page["content"]),
-                            status="success",
-                            duration_ms=duration_ms,
-                        )
-                    yield page
-                else:
-                    if self.indexing_logger:
-                        self.indexing_logger.log_document(
-                            url=url,
-                            doc_type="info_page",
-                            title="",
-                            content_length=0,
-                            status="error",
-                            error=error,
-                            duration_ms=duration_ms,
-                        )
+            # A bounded pool of workers; results are yielded as they finish
+            async with aclosing(self._schedule_crawl(urls, extract_with_url)) as results:
+                async for url, result in results:
+                    page, error, duration_ms = result
+
+                    if page is not None:
+                        if self.indexing_logger:
+                            self.indexing_logger.log_document(
+                                url=url,
+                                doc_type="info_page",
+                                title=page["title"],
+                                content_length=len(page["content"]),
+                                status="success",
+                                duration_ms=duration_ms,
+                            )
+                        yield page
+                    else:
+                        if self.indexing_logger:
+                            self.indexing_logger.log_document(
+                                url=url,
+                                doc_type="info_page",
+                                title="",
+                                content_length=0,
+                                status="error",
+                                error=error,
+                                duration_ms=duration_ms,
+                            )
 
     async def get_api_reference_page_data(self, urls: List[str]) -> AsyncGenerator[ApiReferencePage, None]:
 
@@ -157,8 +381,7 @@ class DeveloperDocsDataClient(BaseAsyncStreamingDataClient[Union[DocumentationPa
                     return header.text.strip()
             return ""
 
-        def _extract_api_reference(url: str, html: str) -> dict:
-            soup = BeautifulSoup(html, 'html.parser')
+        def _extract_api_reference(url: str, soup: BeautifulSoup) -> dict:
             title = soup.find('h1').text.strip() if soup.find('h1') else ""
 
             # Extract tag from breadcrumbs first
@@ -561,59 +784,51 @@ class DeveloperDocsDataClient(BaseAsyncStreamingDataClient[Union[DocumentationPa
             
             return ""
 
-        async def _extract_code_samples(page) -> dict:
-            languages = {
-                'python': 'python_code_sample',
-                'go': 'go_code_sample',
-                'java': 'java_code_sample',
-                'javascript': 'typescript_code_sample',
-                'curl': 'curl_code_sample',
-            }
+        render_timeout_ms = self.render_timeout_ms
+        code_sample_timeout_ms = self.code_sample_timeout_ms
 
-            code_samples = {key: '' for key in languages.values()}
+        async def _extract_code_samples(page) -> dict:
+            code_samples = {key: '' for key in CODE_SAMPLE_LANGUAGES.values()}
+            try:
+                rendered = await page.evaluate(
+                    _EXTRACT_CODE_SAMPLES_JS,
+                    {
+                        "languages": list(CODE_SAMPLE_LANGUAGES),
+                        "lineSelector": CODE_LINE_SELECTOR,
+                        "timeoutMs": code_sample_timeout_ms,
+                    },
+                )
+            except Exception as e:
+                logger.debug(f"Code sample extraction failed: {e}")
+                return code_samples
+            for lang, text in rendered.items():
+                code_samples[CODE_SAMPLE_LANGUAGES[lang]] = text
+            return code_samples
 
-            for lang, key in languages.items():
+        async def _scrape_single_page_with_page(url: str, page) -> ApiReferencePage:
+            with self._timed("render"):
                 try:
-                    tab_selector = f'.openapi-tabs__code-item--{lang}'
-                    tab_count = await page.locator(tab_selector).count()
-                    if tab_count > 0:
-                        await page.click(tab_selector)
-                        await page.wait_for_timeout(500)
-
-                        code_lines = []
-                        content_spans = page.locator('.openapi-explorer__code-block-code-line-content')
-                        span_count = await content_spans.count()
-
-                        for i in range(span_count):
-                            span_element = content_spans.nth(i)
-                            is_visible = await span_element.is_visible()
-                            if is_visible:
-                                line_content = await span_element.inner_text()
-                                if line_content.strip():
-                                    code_lines.append(line_content)
-
-                        if len(code_lines) > 0:
-                            code_text = '\n'.join(code_lines)
-                            code_samples[key] = code_text
+                    await page.goto(url, wait_until="domcontentloaded", timeout=render_timeout_ms)
+                    await page.wait_for_selector(HYDRATED_SELECTOR, state="attached", timeout=render_timeout_ms)
                 except Exception as e:
-                    continue
-            return code_samples
+                    raise RuntimeError(f"Failed to load {url}: {e}") from e
 
-        async def _scrape_single_page_with_page(url: str, page) -> ApiReferencePage:
-            try:
-                await page.goto(url, wait_until="networkidle")
-            except Exception as e:
-                raise RuntimeError(f"Failed to load {url}: {e}") from e
-
-            await page.wait_for_timeout(3000)
-            html_content = await page.content()
-            soup = BeautifulSoup(html_content, 'html.parser')
-            api_ref_data = _extract_api_reference(url, html_content)
-            request_query_parameters = _extract_request_parameters(soup, "query")
-            request_path_parameters = _extract_request_parameters(soup, "path")
-            request_body = _extract_body_schema(soup, "request")
-            response_body = _extract_body_schema(soup, "response")
-            code_samples = await _extract_code_samples(page)
+                try:
+                    # Code samples render client-side right after hydration; some endpoints have none.
+                    await page.wait_for_selector(CODE_LINE_SELECTOR, timeout=code_sample_timeout_ms)
+                except PlaywrightTimeoutError:
+                    logger.debug(f"No code samples rendered for {url} within {code_sample_timeout_ms} ms of hydration")
+
+                html_content = await page.content()
+            with self._timed("parse"):
+                soup = BeautifulSoup(html_content, 'html.parser')
+                api_ref_data = _extract_api_reference(url, soup)
+                request_query_parameters = _extract_request_parameters(soup, "query")
+                request_path_parameters = _extract_request_parameters(soup, "path")
+                request_body = _extract_body_schema(soup, "request")
+                response_body = _extract_body_schema(soup, "response")
+            with self._timed("render_code_samples"):
+                code_samples = await _extract_code_samples(page)
             api_ref = ApiReferencePage(
                 id=api_ref_data["id"],
                 title=api_ref_data["title"],
@@ -639,220 +854,282 @@ class DeveloperDocsDataClient(BaseAsyncStreamingDataClient[Union[DocumentationPa
             )
             return api_ref
 
-        async def _scrape_with_context(url: str, browser, semaphore: asyncio.Semaphore) -> Tuple[str, Optional[ApiReferencePage], Optional[str], float]:
-            """Scrape a single URL using an isolated browser context."""
-            async with semaphore:
-                start_time = time.time()
-                context = None
-                page = None
-                try:
-                    # Use isolated context per page for better stability
-                    context = await browser.new_context()
-                    page = await context.new_page()
+        async def _scrape_with_pool(url: str, pool: BrowserPagePool) -> Tuple[str, Optional[ApiReferencePage], Optional[str], float]:
+            """Scrape a single URL on a page borrowed from the pool."""
+            start_time = None
+            try:
+                async with pool.page() as page:
+                    start_time = time.time()
                     data = await _scrape_single_page_with_page(url, page)
-                    duration_ms = (time.time() - start_time) * 1000
-                    return (url, data, None, duration_ms)
-                except Exception as e:
-                    duration_ms = (time.time() - start_time) * 1000
-                    return (url, None, str(e), duration_ms)
+                duration_ms = (time.time() - start_time) * 1000
+                return (url, data, None, duration_ms)
+            except Exception as e:
+                duration_ms = (time.time() - start_time) * 1000 if start_time else 0.0
+                return (url, None, str(e), duration_ms)
+
+        async def _scrape_worker(url_iter: Iterator[str], pool: BrowserPagePool, results: asyncio.Queue) -> None:
+            # Workers share one URL iterator, so each URL is scraped exactly once.
+            for url in url_iter:
+                await results.put(await _scrape_with_pool(url, pool))
+
+        async def _scrape_all(results: asyncio.Queue) -> None:
+            """Run the browser and feed scrape results into the queue until every URL is done."""
+            async with async_playwright() as p:
+                browser = await p.chromium.launch(headless=True)
+                pool = BrowserPagePool(browser, size=self.api_concurrency, max_uses=self.page_max_uses)
+                url_iter = iter(urls)
+                workers = [
+                    asyncio.create_task(_scrape_worker(url_iter, pool, results))
+                    for _ in range(min(self.api_concurrency, len(urls)))
+                ]
+                try:
+                    await asyncio.gather(*workers)
                 finally:
-                    # Close in order: page first, then context
-                    if page:
-                        try:
-                            await page.close()
-                        except Exception:
-                            pass  # Ignore close errors
-                    if context:
-                        try:
-                            await context.close()
-                        except Exception:
-                            pass  # Ignore close errors
+                    # Also reached when the consumer stops early and cancels us.
+                    for worker in workers:
+                        worker.cancel()
+                    await asyncio.gather(*workers, return_exceptions=True)
+                    await pool.close()
+                    logger.info(
+                        f"Browser page pool: opened {pool.created} pages, recycled {pool.recycled}"
+                    )
+                    try:
+                        await browser.close()
+                    except Exception:
+                        pass  # Ignore browser close errors
 
         indexing_logger = self.indexing_logger
-        # Reduced from 5 to 3 for better stability with Playwright's IPC
-        semaphore = asyncio.Semaphore(3)
-
-        # Collect all results first, then yield (avoids yielding mid-browser-operation)
-        results: List[Tuple[str, Optional[ApiReferencePage], Optional[str], float]] = []
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            try:
-                tasks = [asyncio.create_task(_scrape_with_context(url, browser, semaphore)) for url in urls]
+        # The browser lives in its own task and results reach the caller through a
+        # bounded queue, so pages are yielded as soon as they are scraped without
+        # this generator ever suspending inside the Playwright context. A full
+        # queue pauses the scrape workers until the caller catches up.
+        results: asyncio.Queue = asyncio.Queue(maxsize=self.api_result_buffer)
+        producer = asyncio.create_task(_scrape_all(results))
+        try:
+            while True:
+                getter = asyncio.ensure_future(results.get())
+                await asyncio.wait({getter, producer}, return_when=asyncio.FIRST_COMPLETED)
+                if getter.done():
+                    result = getter.result()
+                elif not results.empty():
+                    getter.cancel()
+                    result = results.get_nowait()
+                else:
+                    getter.cancel()
+                    producer.result()  # Re-raise a browser launch/shutdown failure
+                    break
 
-                # Collect all results
-                for coro in asyncio.as_completed(tasks):
-                    try:
-                        result = await coro
-                        results.append(result)
-
-                        # Log progress immediately
-                        url, data, error, duration_ms = result
-                        if error:
-                            if indexing_logger:
-                                indexing_logger.log_document(
-                                    url=url,
-                                    doc_type="api_reference",
-                                    title="",
-                                    content_length=0,
-                                    status="error",
-                                    error=error,
-                                    duration_ms=duration_ms,
-                                )
-                        elif data and indexing_logger:
-                            content_length = (
-                                len(data["description"] or "") +
-                                len(data["request_body"] or "") +
-                                len(data["response_body"] or "")
-                            )
-                            indexing_logger.log_document(
-                                url=data["url"],
-                                doc_type="api_reference",
-                                title=data["title"],
-                                content_length=content_length,
-                                status="success",
-                                duration_ms=duration_ms,
-                                tag=data["tag"],
-                                method=data["method"],
-                                endpoint=data["endpoint"],
-                            )
-                    except Exception as e:
-                        if indexing_logger:
-                            indexing_logger.log_document(
-                                url="unknown",
-                                doc_type="api_reference",
-                                title="",
-                                content_length=0,
-                                status="error",
-                                error=str(e),
-                            )
-            finally:
+                url, data, error, duration_ms = result
+                if error:
+                    if indexing_logger:
+                        indexing_logger.log_document(
+                            url=url,
+                            doc_type="api_reference",
+                            title="",
+                            content_length=0,
+                            status="error",
+                            error=error,
+                            duration_ms=duration_ms,
+                        )
+                elif data:
+                    if indexing_logger:
+                        content_length = (
+                            len(data["description"] or "") +
+                            len(data["request_body"] or "") +
+                            len(data["response_body"] or "")
+                        )
+                        indexing_logger.log_document(
+                            url=data["url"],
+                            doc_type="api_reference",
+                            title=data["title"],
+                            content_length=content_length,
+                            status="success",
+                            duration_ms=duration_ms,
+                            tag=data["tag"],
+                            method=data["method"],
+                            endpoint=data["endpoint"],
+                        )
+                    yield data
+        finally:
+            if not producer.done():
+                producer.cancel()
                 try:
-                    await browser.close()
-                except Exception:
-                    pass  # Ignore browser close errors
-
-        # Now yield results after browser is closed (safer)
-        for url, data, error, duration_ms in results:
-            if data:
-                yield data
+                    await producer
+                except asyncio.CancelledError:
+                    pass
 
     async def get_source_data(self, **kwargs) -> AsyncGenerator[Union[DocumentationPage, ApiReferencePage], None]:
         """Fetch and process all pages inline, yielding as they complete."""
-        all_urls = await self._get_all_sitemap_urls(self.dev_docs_base_url + "/sitemap.xml")
+        # Hold the shared session for the whole crawl so the sitemap fetch warms its connections.
+        async with self.http_session(), aclosing(self._crawl_site()) as pages:
+            async for page in pages:
+                yield page
+
+    async def _crawl_site(self) -> AsyncGenerator[Union[DocumentationPage, ApiReferencePage], None]:
+        cache = self.crawl_cache
+        if cache is not None:
+            cache.load()
+
+        # URLs are crawled as the sitemap is parsed; all_urls is only complete
+        # once the sitemap stream is exhausted.
+        all_urls: List[str] = []
+        sitemap_complete = False
+
+        async def sitemap_entries() -> AsyncIterator[Tuple[str, Optional[str]]]:
+            nonlocal sitemap_complete
+            async with aclosing(self._stream_sitemap_entries(self.dev_docs_base_url + "/sitemap.xml")) as entries:
+                async for entry in entries:
+                    all_urls.append(entry[0])
+                    yield entry
+            sitemap_complete = True
+            if self.indexing_logger:
+                self.indexing_logger.log(f"Sitemap read: {len(all_urls)} URLs")
 
         if self.indexing_logger:
-            self.indexing_logger.log(f"Processing {len(all_urls)} URLs from sitemap...")
+            self.indexing_logger.log("Processing URLs from sitemap as they are discovered...")
+        sitemap = sitemap_entries()
 
         # Process all URLs in parallel, yielding results as they complete
         # Info pages are processed inline; API reference pages are queued for Playwright
         api_ref_urls: List[str] = []
 
-        async def process_url(session: aiohttp.ClientSession, url: str) -> Tuple[str, Optional[Union[DocumentationPage, ApiReferencePage]], bool, Optional[str], float]:
+        async def process_url(session: aiohttp.ClientSession, url: str, lastmod: Optional[str]) -> Tuple[str, Optional[Union[DocumentationPage, ApiReferencePage]], bool, Optional[str], float]:
             """
             Process a single URL.
             Returns: (url, result, is_api_ref, error, duration_ms)
             - If info page: result is DocumentationPage, is_api_ref=False
             - If API ref: result is None, is_api_ref=True (needs Playwright)
+            - If reused from the crawl cache: result is the cached page of either type
             """
+            if cache is not None:
+                cached = cache.unchanged_page(url, lastmod)
+                if cached is not None:
+                    return url, cached, False, None, 0.0
+
             start_time = time.time()
             try:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                    if response.status != 200:
-                        return url, None, False, f"HTTP {response.status}", (time.time() - start_time) * 1000
-
-                    html = await response.text()
-
-                    # Check if it's an API reference page
-                    if self._is_api_reference_page(html):
-                        # API reference pages need Playwright for JS rendering
-                        return url, None, True, None, (time.time() - start_time) * 1000
-
-                    # Process as info page inline
-                    content = trafilatura.extract(
-                        html,
-                        include_tables=True,
-                        include_comments=False,
-                        include_images=False,
-                        output_format="txt"
-                    ) or ""
-
-                    if not content:
-                        return url, None, False, "No content extracted", (time.time() - start_time) * 1000
-
-                    soup = BeautifulSoup(html, 'lxml')
-                    h1 = soup.find('h1')
-                    path = PurePosixPath(urlparse(url).path)
-                    last_segment = path.name or ""
-                    title = h1.text.strip() if h1 else last_segment.replace('-', ' ').replace('_', ' ').title()
-
-                    page = DocumentationPage(
-                        id=str(uuid.uuid5(uuid.NAMESPACE_URL, url)),
-                        title=title,
-                        content=content,
-                        url=url,
-                        page_type="info_page"
-                    )
-                    return url, page, False, None, (time.time() - start_time) * 1000
+                headers = cache.conditional_headers(url) if cache is not None else {}
+                with self._timed("fetch"):
+                    async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=30)) as response:
+                        if response.status == 304 and cache is not None:
+                            cached = cache.not_modified(url, lastmod)
+                            if cached is not None:
+                                return url, cached, False, None, (time.time() - start_time) * 1000
+                        if response.status != 200:
+                            return url, None, False, f"HTTP {response.status}", (time.time() - start_time) * 1000
+                        html = await response.text()
+                        if cache is not None:
+                            cache.record_response(url, response.headers, lastmod)
+
+                # Classify and extract on the executor; API reference pages
+                # come back flagged since they need Playwright for JS rendering
+                with self._timed("parse"):
+                    is_api_ref, page, error = await stage.run(_classify_and_extract, url, html)
+                if page is not None and cache is not None:
+                    cache.record_page(url, page)
+                return url, page, is_api_ref, error, (time.time() - start_time) * 1000
 
             except Exception as e:
                 return url, None, False, str(e), (time.time() - start_time) * 1000
 
-        # Process URLs incrementally - yield results as they complete
-        connector = aiohttp.TCPConnector(limit=10)
-        async with aiohttp.ClientSession(connector=connector) as session:
-            tasks = [asyncio.create_task(process_url(session, url)) for url in all_urls]
-
-            # Use as_completed to yield results as they finish (not wait for all)
-            for coro in asyncio.as_completed(tasks):
-                try:
-                    result = await coro
-                except Exception as e:
-                    if self.indexing_logger:
-                        self.indexing_logger.log_document(
-                            url="unknown",
-                            doc_type="info_page",
-                            title="",
-                            content_length=0,
-                            status="error",
-                            error=str(e),
-                        )
-                    continue
-
-                url, page_result, is_api_ref, error, duration_ms = result
-
-                if is_api_ref:
-                    # Queue API reference pages for Playwright processing
-                    api_ref_urls.append(url)
-                elif page_result is not None:
-                    # Yield info page immediately as it completes
-                    if self.indexing_logger:
-                        self.indexing_logger.log_document(
-                            url=url,
-                            doc_type="info_page",
-                            title=page_result["title"],
-                            content_length=len(page_result["content"]),
-                            status="success",
-                            duration_ms=duration_ms,
-                        )
-                    yield page_result
-                elif error:
-                    if self.indexing_logger:
-                        self.indexing_logger.log_document(
-                            url=url,
-                            doc_type="info_page",
-                            title="",
-                            content_length=0,
-                            status="error",
-                            error=error,
-                            duration_ms=duration_ms,
-                        )
+        try:
+            # Process URLs incrementally - yield results as they complete
+            async with _ExtractionStage(self.extract_executor, self.extract_workers) as stage, \
+                    self.http_session() as session:
+                async def process_entry(entry: Tuple[str, Optional[str]]):
+                    return await process_url(session, *entry)
+
+                # A bounded pool of workers, fair across hosts; results are yielded as they finish
+                async with aclosing(self._schedule_crawl(sitemap, process_entry)) as results:
+                    async for result in results:
+                        url, page_result, is_api_ref, error, duration_ms = result
+
+                        if is_api_ref:
+                            # Queue API reference pages for Playwright processing
+                            api_ref_urls.append(url)
+                        elif page_result is not None:
+                            # Yield the page immediately as it completes
+                            self._log_page(page_result, duration_ms)
+                            yield page_result
+                        elif error:
+                            if self.indexing_logger:
+                                self.indexing_logger.log_document(
+                                    url=url,
+                                    doc_type="info_page",
+                                    title="",
+                                    content_length=0,
+                                    status="error",
+                                    error=error,
+                                    duration_ms=duration_ms,
+                                )
 
-        # Now process API reference pages with Playwright (these need JS rendering)
-        if api_ref_urls:
-            if self.indexing_logger:
-                self.indexing_logger.log("")
-                self.indexing_logger.log(f"Processing {len(api_ref_urls)} API reference pages with Playwright...")
+            # Now process API reference pages with Playwright (these need JS rendering)
+            if api_ref_urls:
+                if self.indexing_logger:
+                    self.indexing_logger.log("")
+                    self.indexing_logger.log(f"Processing {len(api_ref_urls)} API reference pages with Playwright...")
 
-            async for page in self.get_api_reference_page_data(api_ref_urls):
-                yield page
+                async for page in self.get_api_reference_page_data(api_ref_urls):
+                    if cache is not None:
+                        cache.record_page(page["url"], page)
+                    yield page
+        finally:
+            # Stop the sitemap readers if the crawl ended early.
+            await sitemap.aclose()
+            if cache is not None:
+                # A partial URL list must not evict entries for pages it didn't reach.
+                if sitemap_complete:
+                    cache.retain(all_urls)
+                cache.save()
+                logger.info(
+                    f"Crawl cache: {cache.skipped} unchanged in sitemap, "
+                    f"{cache.revalidated} not modified, {len(cache.entries)} entries saved"
+                )
+
+    def _schedule_crawl(self, items, worker) -> AsyncIterator:
+        """Run worker over items on a bounded, host-fair worker pool.
+
+        Workers beyond the connection limit are parked on the extraction
+        executor, which keeps downloads and extraction overlapping.
+        """
+        limit = _ExtractionStage.page_workers(self.crawl_concurrency, self.extract_workers)
+        return schedule(items, worker, limit=limit, per_host_limit=self._per_host_workers())
+
+    def _per_host_workers(self) -> Optional[int]:
+        if self.per_host_concurrency is None:
+            return None
+        return _ExtractionStage.page_workers(self.per_host_concurrency, self.extract_workers)
+
+    def _timed(self, stage: str) -> ContextManager[None]:
+        return self.indexing_logger.timed(stage) if self.indexing_logger else nullcontext()
+
+    def _log_page(self, page: Union[DocumentationPage, ApiReferencePage], duration_ms: float) -> None:
+        if not self.indexing_logger:
+            return
+        if page["page_type"] == "api_reference":
+            content_length = (
+                len(page["description"] or "") +
+                len(page["request_body"] or "") +
+                len(page["response_body"] or "")
+            )
+            self.indexing_logger.log_document(
+                url=page["url"],
+                doc_type="api_reference",
+                title=page["title"],
+                content_length=content_length,
+                status="success",
+                duration_ms=duration_ms,
+                tag=page["tag"],
+                method=page["method"],
+                endpoint=page["endpoint"],
+            )
+        else:
+            self.indexing_logger.log_document(
+                url=page["url"],
+                doc_type="info_page",
+                title=page["title"],
+                content_length=len(page["content"]),
+                status="success",
+                duration_ms=duration_ms,
+            )
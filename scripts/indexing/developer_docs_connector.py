@@ -1,12 +1,17 @@
 import logging
-from typing import Union, List, Sequence
+from contextlib import nullcontext
+from functools import partial
+from typing import ContextManager, Iterable, Iterator, Union, List, Optional, Sequence, TYPE_CHECKING
 
 from glean.indexing.connectors import BaseDatasourceConnector
-from glean.indexing.common import api_client
+from glean.indexing.common import BatchProcessor, api_client
+from glean.indexing.connectors.base_data_client import BaseDataClient
 from glean.indexing.models import (
+    ConnectorOptions,
     ContentDefinition,
     CustomDatasourceConfig,
     DocumentDefinition,
+    IndexingMode,
 )
 from glean.api_client.models import (
     ObjectDefinition,
@@ -14,9 +19,25 @@ from glean.api_client.models import (
     DocumentPermissionsDefinition,
 )
 from data_types import DocumentationPage, ApiReferencePage
+from document_uploader import DeferredDocument, PipelinedUploader, build_documents, estimate_document_bytes
+from indexing_manifest import IndexingManifest, content_hash
+from rate_limiter import RequestScheduler
+
+if TYPE_CHECKING:
+    from indexing_logger import IndexingLogger
 
 logger = logging.getLogger(__name__)
 
+# page_type -> Glean object type
+OBJECT_TYPES = {
+    "info_page": "infoPage",
+    "api_reference": "apiReference",
+}
+
+# Refuse an incremental run that would delete more than this share of the
+# previously indexed documents, mirroring the bulk-upload stale-deletion check.
+MAX_INCREMENTAL_DELETE_FRACTION = 0.2
+
 
 def _format_api_reference(page: ApiReferencePage) -> str:
     """Format an API reference page as a single coherent plain-text document.
@@ -64,6 +85,28 @@ def _format_api_reference(page: ApiReferencePage) -> str:
     return "\n".join(sections)
 
 
+# Text fields _format_api_reference copies into the body, and a bound on the
+# headings and separators it adds around them.
+_API_REFERENCE_BODY_FIELDS = (
+    "title", "method", "endpoint", "tag", "description", "authentication",
+    "request_content_type", "request_path_parameters", "request_query_parameters",
+    "request_body", "response_content_type", "response_body",
+)
+_API_REFERENCE_HEADING_CHARS = 256
+
+
+def _estimated_body_chars(page: Union[DocumentationPage, ApiReferencePage]) -> int:
+    """Length of the body transform_page would build, without building it."""
+    if page["page_type"] == "info_page":
+        return len(page["content"])
+    codes = page.get("response_codes") or []
+    return (
+        sum(len(page.get(name) or "") for name in _API_REFERENCE_BODY_FIELDS)
+        + sum(len(code) + 3 for code in codes)
+        + _API_REFERENCE_HEADING_CHARS
+    )
+
+
 class DeveloperDocsConnector(BaseDatasourceConnector[Union[DocumentationPage, ApiReferencePage]]):
     configuration: CustomDatasourceConfig = CustomDatasourceConfig(
         name="devdocs",
@@ -88,6 +131,44 @@ class DeveloperDocsConnector(BaseDatasourceConnector[Union[DocumentationPage, Ap
         ],
     )
 
+    def __init__(
+        self,
+        name: str,
+        data_client: BaseDataClient[Union[DocumentationPage, ApiReferencePage]],
+        manifest: Optional[IndexingManifest] = None,
+        pipeline_depth: int = 0,
+        upload_workers: int = 1,
+        max_batch_bytes: Optional[int] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        indexing_logger: Optional["IndexingLogger"] = None,
+    ):
+        super().__init__(name, data_client)
+        self.manifest = manifest
+        # Built upload pages allowed to wait for the network; 0 disables pipelining.
+        self.pipeline_depth = pipeline_depth
+        # Concurrent bulk-index requests for the pages between the first and last.
+        self.upload_workers = upload_workers
+        # Estimated request-size budget per bulk-index page; None keeps fixed-count pages.
+        self.max_batch_bytes = max_batch_bytes
+        # Shared by every indexing API call this connector makes.
+        self.scheduler = scheduler or RequestScheduler()
+        # Receives transform and upload timings when set.
+        self.indexing_logger = indexing_logger
+
+    def _log(self, message: str) -> None:
+        """Report progress to the run's indexing logger, or the module logger without one."""
+        if self.indexing_logger:
+            self.indexing_logger.log(message)
+        else:
+            logger.info(message)
+
+    def _timed(self, stage: str) -> ContextManager[None]:
+        return self.indexing_logger.timed(stage) if self.indexing_logger else nullcontext()
+
+    @property
+    def _uses_uploader(self) -> bool:
+        return bool(self.pipeline_depth) or self.upload_workers > 1 or self.max_batch_bytes is not None
+
     def configure_datasource(self, is_test: bool = False) -> None:
         """Configure the datasource, working around a camelCase serialization
         bug in glean-indexing-sdk where config.model_dump() returns camelCase
@@ -109,36 +190,211 @@ class DeveloperDocsConnector(BaseDatasourceConnector[Union[DocumentationPage, Ap
         }
 
         with api_client() as client:
-            client.indexing.datasources.add(**kwargs)
+            self.scheduler.call(client.indexing.datasources.add, **kwargs)
         logger.info(f"Successfully configured datasource: {config.name}")
 
     def transform(
-        self, data: List[Union[DocumentationPage, ApiReferencePage]]
+        self, data: Sequence[Union[DocumentationPage, ApiReferencePage]]
     ) -> List[DocumentDefinition]:
         documents = []
         for page in data:
-            if page["page_type"] == "info_page":
-                body_text = page["content"]
-            elif page["page_type"] == "api_reference":
-                body_text = _format_api_reference(page)
-            else:
-                continue
-
-            document = DocumentDefinition(
-                id=page["id"],
-                title=page["title"],
+            document = self.transform_page(page)
+            if document is not None:
+                documents.append(document)
+        return documents
+
+    def transform_page(
+        self, page: Union[DocumentationPage, ApiReferencePage]
+    ) -> Optional[DocumentDefinition]:
+        """Transform one page, or return None for an unknown page type."""
+        with self._timed("transform"):
+            return self._transform_page(page)
+
+    def _transform_page(
+        self, page: Union[DocumentationPage, ApiReferencePage]
+    ) -> Optional[DocumentDefinition]:
+        if page["page_type"] == "info_page":
+            body_text = page["content"]
+        elif page["page_type"] == "api_reference":
+            body_text = _format_api_reference(page)
+        else:
+            return None
+
+        return DocumentDefinition(
+            id=page["id"],
+            title=page["title"],
+            datasource=self.name,
+            view_url=page["url"],
+            object_type=OBJECT_TYPES[page["page_type"]],
+            body=ContentDefinition(
+                mime_type="text/plain",
+                text_content=body_text,
+            ),
+            permissions=DocumentPermissionsDefinition(
+                allow_anonymous_access=True
+            ),
+            created_at=page.get("created_at"),
+            updated_at=page.get("updated_at"),
+        )
+
+    def defer_page(
+        self, page: Union[DocumentationPage, ApiReferencePage]
+    ) -> Optional[DeferredDocument]:
+        """transform_page(page), postponed until the document's upload page is sent.
+
+        The deferred document holds the page until then; its body is built
+        right before the request and the page is released once built.
+        """
+        object_type = OBJECT_TYPES.get(page["page_type"])
+        if object_type is None:
+            return None
+        return DeferredDocument(
+            id=page["id"],
+            object_type=object_type,
+            build=partial(self.transform_page, page),
+            estimated_bytes=estimate_document_bytes(page["title"], page["url"], _estimated_body_chars(page)),
+        )
+
+    def index_data(
+        self,
+        mode: IndexingMode = IndexingMode.FULL,
+        options: Optional[ConnectorOptions] = None,
+    ) -> None:
+        """Index documents, using the content-hash manifest when one is attached.
+
+        Without a manifest or pipelining this is the SDK's regular flow. With a
+        manifest, FULL runs re-seed it after the bulk upload, and INCREMENTAL
+        runs upload only new/changed documents and delete vanished ones; an
+        INCREMENTAL run with no usable manifest falls back to FULL. With
+        pipelining, concurrent upload workers or a byte budget configured,
+        FULL runs stream pages through PipelinedUploader. Outside the SDK's
+        flow, documents are deferred (see defer_page), so only the pages being
+        sent have their bodies built.
+        """
+        try:
+            if self.manifest is None and not self._uses_uploader:
+                super().index_data(mode=mode, options=options)
+                return
+
+            if mode == IndexingMode.INCREMENTAL and self.manifest is not None:
+                if self.manifest.load():
+                    self._index_incremental(options)
+                    return
+                self._log(f"No usable manifest at {self.manifest.path}; running a full upload instead")
+
+            self._index_full(options)
+        finally:
+            logger.info(f"Indexing API: {self.scheduler.summary()}")
+            if self.indexing_logger:
+                self.indexing_logger.record_api_stats(self.scheduler.stats.as_dict())
+
+    def _batch_index_documents(
+        self,
+        documents: Sequence[DocumentDefinition],
+        options: Optional[ConnectorOptions] = None,
+    ) -> None:
+        """The SDK's sequential bulk upload, with requests sent through the scheduler."""
+        PipelinedUploader(
+            datasource=self.name,
+            batch_size=self.batch_size,
+            queue_depth=1,
+            scheduler=self.scheduler,
+            indexing_logger=self.indexing_logger,
+        ).upload(documents, options=options)
+
+    def _index_full(self, options: Optional[ConnectorOptions]) -> None:
+        entries: List[tuple[str, str, str]] = []
+
+        def documents(pages: Iterable[Union[DocumentationPage, ApiReferencePage]]) -> Iterator[DeferredDocument]:
+            for page in pages:
+                document = self.defer_page(page)
+                if document is None:
+                    continue
+                if self.manifest is not None:
+                    entries.append((page["id"], content_hash(page), document.object_type))
+                yield document
+
+        if self._uses_uploader:
+            uploader = PipelinedUploader(
                 datasource=self.name,
-                view_url=page["url"],
-                object_type="infoPage" if page["page_type"] == "info_page" else "apiReference",
-                body=ContentDefinition(
-                    mime_type="text/plain",
-                    text_content=body_text,
-                ),
-                permissions=DocumentPermissionsDefinition(
-                    allow_anonymous_access=True
-                ),
-                created_at=page.get("created_at"),
-                updated_at=page.get("updated_at"),
+                batch_size=self.batch_size,
+                queue_depth=max(self.pipeline_depth, 1),
+                workers=self.upload_workers,
+                max_batch_bytes=self.max_batch_bytes,
+                scheduler=self.scheduler,
+                indexing_logger=self.indexing_logger,
+            )
+            count = uploader.upload(documents(self.data_client.iter_source_data()), options=options)
+        else:
+            all_documents = list(documents(self.get_data()))
+            self._batch_index_documents(all_documents, options=options)
+            count = len(all_documents)
+        self._log(f"Successfully indexed {count} documents to Glean")
+
+        if self.manifest is not None:
+            self.manifest.clear()
+            for doc_id, page_hash, object_type in entries:
+                self.manifest.record(doc_id, page_hash, object_type)
+            self.manifest.save()
+            self._log(f"Wrote manifest with {len(self.manifest.entries)} entries to {self.manifest.path}")
+
+    def _index_incremental(self, options: Optional[ConnectorOptions]) -> None:
+        # Unchanged pages are dropped as soon as the diff is taken.
+        diff = self.manifest.diff(self.get_data())
+        added = sum(page["id"] not in self.manifest.entries for page, _ in diff.changed)
+        self._log(
+            f"Incremental run: {added} new, {len(diff.changed) - added} changed, "
+            f"{diff.unchanged} unchanged, {len(diff.deleted)} to delete"
+        )
+
+        disable_check = options.disable_stale_deletion_check if options else False
+        if (
+            not disable_check
+            and self.manifest.entries
+            and len(diff.deleted) > MAX_INCREMENTAL_DELETE_FRACTION * len(self.manifest.entries)
+        ):
+            message = (
+                f"Incremental run would delete {len(diff.deleted)} of {len(self.manifest.entries)} "
+                "documents; refusing. Set DISABLE_STALE_DELETION_CHECK to override."
+            )
+            if self.indexing_logger:
+                self.indexing_logger.log_error(message)
+            raise RuntimeError(message)
+
+        hashes = {page["id"]: page_hash for page, page_hash in diff.changed}
+        documents = [
+            document for document in (self.defer_page(page) for page, _ in diff.changed) if document is not None
+        ]
+        # The deferred documents now hold the only references to the changed pages.
+        diff.changed.clear()
+
+        uploaded = deleted = 0
+        try:
+            for batch in BatchProcessor(documents, batch_size=self.batch_size):
+                built = build_documents(batch)
+                with api_client() as client, self._timed("upload_batch"):
+                    self.scheduler.call(
+                        client.indexing.documents.index, datasource=self.name, documents=built
+                    )
+                for document in batch:
+                    self.manifest.record(document.id, hashes[document.id], document.object_type)
+                uploaded += len(batch)
+
+            if diff.deleted:
+                with api_client() as client:
+                    for doc_id, object_type in diff.deleted.items():
+                        self.scheduler.call(
+                            client.indexing.documents.delete,
+                            datasource=self.name,
+                            object_type=object_type,
+                            id=doc_id,
+                        )
+                        self.manifest.remove(doc_id)
+                        deleted += 1
+        finally:
+            # Persist whatever made it to Glean so a failed run resumes from there.
+            self.manifest.save()
+            self._log(
+                f"Uploaded {uploaded} of {len(documents)} and deleted {deleted} of {len(diff.deleted)} documents; "
+                f"wrote manifest with {len(self.manifest.entries)} entries to {self.manifest.path}"
             )
-            documents.append(document)
-        return documents
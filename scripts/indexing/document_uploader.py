@@ -0,0 +1,286 @@
+"""Pipelined bulk-index upload for the developer docs connector.
+
+The SDK's regular flow builds the full List[DocumentDefinition] before the
+first request goes out. PipelinedUploader instead pulls documents from an
+iterator on a producer thread, groups them into fixed-size pages, and hands
+them to the uploading thread through a bounded queue: page N+1 is being built
+while page N is in flight, and at most `queue_depth` built pages wait in
+memory at any time.
+
+Bulk-upload semantics are unchanged: one uploadId for the whole session,
+isFirstPage only on the first request, isLastPage only on the final one. The
+uploader keeps one page of lookahead so it knows which page is last before
+sending it.
+
+With workers > 1 the pages between the first and the last are sent
+concurrently: the first page opens the session on its own, middle pages go
+out on a thread pool (at most `workers` in flight), and the last page is sent
+only after every middle page has succeeded.
+
+With max_batch_bytes set, a page is closed once adding the next document
+would push its estimated request size past the budget, so a handful of large
+API-reference bodies and hundreds of small info pages both land near the same
+request size. batch_size still caps the document count per page.
+
+Every request goes through a RequestScheduler (see rate_limiter.py), shared
+with the connector's other API calls when it passes one in.
+
+Pages may hold DeferredDocuments instead of DocumentDefinitions. Those are
+built right before their page is sent and dropped with it, so document bodies
+only exist for the pages in flight rather than for every page waiting in the
+queue.
+"""
+
+import logging
+import queue
+import threading
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, Optional, Set, Union
+
+from glean.indexing.common import api_client
+from glean.indexing.models import ConnectorOptions, DocumentDefinition
+
+from rate_limiter import RequestScheduler
+
+if TYPE_CHECKING:
+    from indexing_logger import IndexingLogger
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+# Rough per-document JSON overhead beyond the body text: field names, id,
+# datasource, object type, permissions and timestamps.
+_DOCUMENT_OVERHEAD_BYTES = 512
+
+
+class DeferredDocument:
+    """A document whose DocumentDefinition is built only when its page is sent.
+
+    build() runs once and then drops the builder, releasing whatever source
+    data it closed over.
+    """
+
+    __slots__ = ("id", "object_type", "estimated_bytes", "_build")
+
+    def __init__(
+        self,
+        id: str,
+        object_type: str,
+        build: Callable[[], DocumentDefinition],
+        estimated_bytes: int,
+    ):
+        self.id = id
+        self.object_type = object_type
+        self.estimated_bytes = estimated_bytes
+        self._build: Optional[Callable[[], DocumentDefinition]] = build
+
+    def build(self) -> DocumentDefinition:
+        build, self._build = self._build, None
+        if build is None:
+            raise RuntimeError(f"Document {self.id} was already built")
+        return build()
+
+
+UploadDocument = Union[DocumentDefinition, DeferredDocument]
+
+
+def build_documents(documents: Iterable[UploadDocument]) -> List[DocumentDefinition]:
+    """Materialize a page of documents for a request."""
+    return [d.build() if isinstance(d, DeferredDocument) else d for d in documents]
+
+
+def estimate_document_bytes(title: Optional[str], view_url: Optional[str], body_chars: int) -> int:
+    """Cheap estimate of one document's share of a bulk-index request body."""
+    return _DOCUMENT_OVERHEAD_BYTES + len(title or "") + len(view_url or "") + body_chars
+
+
+def estimated_request_bytes(document: UploadDocument) -> int:
+    """estimate_document_bytes() for a built or deferred document."""
+    if isinstance(document, DeferredDocument):
+        return document.estimated_bytes
+    body_chars = len(document.body.text_content or "") if document.body is not None else 0
+    return estimate_document_bytes(document.title, document.view_url, body_chars)
+
+
+class _ProducerError:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class PipelinedUploader:
+    """Upload documents as bulk-index pages while later pages are still being built."""
+
+    def __init__(
+        self,
+        datasource: str,
+        batch_size: int = 1000,
+        queue_depth: int = 2,
+        workers: int = 1,
+        max_batch_bytes: Optional[int] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        indexing_logger: Optional["IndexingLogger"] = None,
+    ):
+        self.datasource = datasource
+        self.batch_size = batch_size
+        self.queue_depth = queue_depth
+        self.workers = workers
+        self.max_batch_bytes = max_batch_bytes
+        self.scheduler = scheduler or RequestScheduler()
+        # Receives one upload_batch timing per bulk-index request when set.
+        self.indexing_logger = indexing_logger
+
+    def upload(
+        self,
+        documents: Iterable[UploadDocument],
+        options: Optional[ConnectorOptions] = None,
+    ) -> int:
+        """Upload every document in one bulk session. Returns the number uploaded."""
+        pages: queue.Queue = queue.Queue(maxsize=self.queue_depth)
+        stop = threading.Event()
+        producer = threading.Thread(
+            target=self._produce,
+            args=(iter(documents), pages, stop),
+            name="bulk-index-producer",
+            daemon=True,
+        )
+        producer.start()
+
+        try:
+            return self._consume(pages, options)
+        finally:
+            stop.set()
+            producer.join()
+
+    def _produce(
+        self,
+        documents: Iterator[UploadDocument],
+        pages: queue.Queue,
+        stop: threading.Event,
+    ) -> None:
+        def put(item: object) -> bool:
+            # Poll so an aborted upload never leaves this thread blocked on a full queue.
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        try:
+            batch: List[UploadDocument] = []
+            batch_bytes = 0
+            for document in documents:
+                if self.max_batch_bytes is not None:
+                    size = estimated_request_bytes(document)
+                    if batch and batch_bytes + size > self.max_batch_bytes:
+                        if not put(batch):
+                            return
+                        batch, batch_bytes = [], 0
+                    batch_bytes += size
+                batch.append(document)
+                if len(batch) >= self.batch_size:
+                    if not put(batch):
+                        return
+                    batch, batch_bytes = [], 0
+            if batch and not put(batch):
+                return
+            put(_DONE)
+        except BaseException as e:
+            put(_ProducerError(e))
+
+    def _consume(self, pages: queue.Queue, options: Optional[ConnectorOptions]) -> int:
+        def next_page() -> Optional[List[UploadDocument]]:
+            item = pages.get()
+            if isinstance(item, _ProducerError):
+                raise item.error
+            return None if item is _DONE else item
+
+        upload_id = str(uuid.uuid4())
+        current = next_page()
+        if current is None:
+            logger.info("No documents to upload")
+            return 0
+
+        uploaded = 0
+        page_number = 1
+        in_flight: Set[Future] = set()
+        with ThreadPoolExecutor(
+            max_workers=max(self.workers, 1), thread_name_prefix="bulk-index-upload"
+        ) as pool:
+            try:
+                while current is not None:
+                    upcoming = next_page()
+                    is_first_page = page_number == 1
+                    is_last_page = upcoming is None
+
+                    if is_first_page or is_last_page or self.workers <= 1:
+                        # The first page opens the session and the last one
+                        # closes it, so neither may overlap with other pages.
+                        self._wait(in_flight, until=0)
+                        self._upload_page(current, upload_id, page_number, is_first_page, is_last_page, options)
+                    else:
+                        self._wait(in_flight, until=self.workers - 1)
+                        in_flight.add(pool.submit(
+                            self._upload_page, current, upload_id, page_number, False, False, options
+                        ))
+
+                    uploaded += len(current)
+                    page_number += 1
+                    current = upcoming
+            except BaseException:
+                for future in in_flight:
+                    future.cancel()
+                raise
+
+        logger.info(f"Uploaded {uploaded} documents in {page_number - 1} pages")
+        return uploaded
+
+    @staticmethod
+    def _wait(in_flight: Set[Future], until: int) -> None:
+        """Block until at most `until` uploads are in flight, re-raising any failure."""
+        while len(in_flight) > until:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                in_flight.discard(future)
+                future.result()
+
+    def _upload_page(
+        self,
+        documents: List[UploadDocument],
+        upload_id: str,
+        page_number: int,
+        is_first_page: bool,
+        is_last_page: bool,
+        options: Optional[ConnectorOptions],
+    ) -> None:
+        force_restart = options.force_restart if options else False
+        disable_stale_check = options.disable_stale_deletion_check if options else False
+
+        if force_restart and is_first_page:
+            logger.info("Force restarting upload - discarding any previous upload progress")
+
+        documents = build_documents(documents)
+        try:
+            timed = self.indexing_logger.timed("upload_batch") if self.indexing_logger else nullcontext()
+            with api_client() as client, timed:
+                self.scheduler.call(
+                    client.indexing.documents.bulk_index,
+                    datasource=self.datasource,
+                    documents=documents,
+                    upload_id=upload_id,
+                    is_first_page=is_first_page,
+                    is_last_page=is_last_page,
+                    force_restart_upload=True if (force_restart and is_first_page) else None,
+                    disable_stale_document_deletion_check=True
+                    if (disable_stale_check and is_last_page)
+                    else None,
+                )
+        except Exception as e:
+            logger.error(f"Failed to upload document page {page_number}: {e}")
+            raise
+
+        logger.info(f"Document page {page_number} uploaded ({len(documents)} documents)")
@@ -5,13 +5,19 @@ Provides per-document logging, progress tracking, and summary generation.
 Designed to be backportable to the glean-indexing-sdk.
 """
 
+import io
 import logging
+import math
+import queue
 import sys
+import threading
 import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional, Protocol, TextIO
+from typing import Any, Dict, Iterator, List, Optional, Protocol, TextIO
 
 
 class LogLevel(Enum):
@@ -33,6 +39,72 @@ class DocumentLogEntry:
     error: Optional[str] = None
     duration_ms: Optional[float] = None
     extra: Dict[str, Any] = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram in the spirit of HdrHistogram.
+
+    Each bucket spans a fixed ratio of `1 + precision`, so quantiles are
+    reported within that relative error while memory stays bounded by the
+    value range (about 2,200 buckets from 1µs to an hour at 1%), not by the
+    number of samples.
+    """
+
+    MIN_MS = 0.001
+
+    def __init__(self, precision: float = 0.01):
+        self._log_ratio = math.log1p(precision)
+        self._ratio = 1 + precision
+        self._buckets: Counter = Counter()
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, duration_ms: float) -> None:
+        duration_ms = max(duration_ms, 0.0)
+        if duration_ms <= self.MIN_MS:
+            index = 0
+        else:
+            index = math.ceil(math.log(duration_ms / self.MIN_MS) / self._log_ratio)
+        self._buckets[index] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def percentile(self, percent: float) -> float:
+        """Upper bound of the bucket holding the given percentile; 0 when empty."""
+        if not self.count:
+            return 0.0
+        rank = max(math.ceil(percent / 100 * self.count), 1)
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                return min(self.MIN_MS * self._ratio ** index, self.max_ms)
+        return self.max_ms
+
+    def stats(self) -> "StageTiming":
+        return StageTiming(
+            count=self.count,
+            total_ms=self.total_ms,
+            p50_ms=self.percentile(50),
+            p95_ms=self.percentile(95),
+            p99_ms=self.percentile(99),
+            max_ms=self.max_ms,
+        )
+
+
+@dataclass
+class StageTiming:
+    """Latency distribution of one instrumented stage."""
+    count: int = 0
+    total_ms: float = 0.0
+    p50_ms: float = 0.0
+    p95_ms: float = 0.0
+    p99_ms: float = 0.0
+    max_ms: float = 0.0
 
 
 @dataclass
@@ -50,6 +122,9 @@ class IndexingSummary:
     max_content_length: int = 0
     errors: List[str] = field(default_factory=list)
     warnings_list: List[str] = field(default_factory=list)
+    stage_timings: Dict[str, StageTiming] = field(default_factory=dict)
+    # Indexing API request, retry and throttling counters (see record_api_stats).
+    api_stats: Dict[str, float] = field(default_factory=dict)
 
 
 class LogWriter(Protocol):
@@ -58,6 +133,7 @@ class LogWriter(Protocol):
     def write_document(self, entry: DocumentLogEntry) -> None: ...
     def write_summary(self, summary: IndexingSummary) -> None: ...
     def flush(self) -> None: ...
+    def close(self) -> None: ...
 
 
 class StdoutLogWriter:
@@ -122,25 +198,49 @@ class StdoutLogWriter:
         self.stream.write(f"\n")
         self.stream.write(f"  Duration:           {summary.total_duration_s:.2f}s\n")
 
-        if summary.errors:
-            self.stream.write(f"\n  ERRORS ({len(summary.errors)}):\n")
-            for error in summary.errors[:10]:
-                self.stream.write(f"    - {error}\n")
-            if len(summary.errors) > 10:
-                self.stream.write(f"    ... and {len(summary.errors) - 10} more\n")
+        if summary.api_stats:
+            api = summary.api_stats
+            self.stream.write(f"\n  Indexing API:\n")
+            self.stream.write(f"    - Requests:       {api['requests']:.0f}\n")
+            self.stream.write(f"    - Retries:        {api['retries']:.0f} ({api['throttled']:.0f} throttled)\n")
+            self.stream.write(
+                f"    - Waiting:        {api['throttled_seconds']:.1f}s ({api['token_wait_seconds']:.1f}s rate limit, "
+                f"{api['backoff_seconds']:.1f}s backoff)\n"
+            )
 
-        if summary.warnings_list:
-            self.stream.write(f"\n  WARNINGS ({len(summary.warnings_list)}):\n")
-            for warning in summary.warnings_list[:10]:
-                self.stream.write(f"    - {warning}\n")
-            if len(summary.warnings_list) > 10:
-                self.stream.write(f"    ... and {len(summary.warnings_list) - 10} more\n")
+        if summary.stage_timings:
+            self.stream.write(f"\n  Stage timings (ms):\n")
+            self.stream.write(
+                f"    {'stage':<22} {'count':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9} {'total':>11}\n"
+            )
+            for stage, timing in sorted(summary.stage_timings.items()):
+                self.stream.write(
+                    f"    {stage:<22} {timing.count:>8} {timing.p50_ms:>9.1f} {timing.p95_ms:>9.1f} "
+                    f"{timing.p99_ms:>9.1f} {timing.max_ms:>9.1f} {timing.total_ms:>11.1f}\n"
+                )
+
+        # The stored messages are a sample capped at max_messages; the counts are exact.
+        self._write_messages("ERRORS", summary.failed, summary.errors)
+        self._write_messages("WARNINGS", summary.warnings, summary.warnings_list)
 
         self.stream.write("\n")
 
+    def _write_messages(self, heading: str, count: int, messages: List[str]) -> None:
+        if not messages:
+            return
+        shown = messages[:10]
+        self.stream.write(f"\n  {heading} ({count}):\n")
+        for message in shown:
+            self.stream.write(f"    - {message}\n")
+        if count > len(shown):
+            self.stream.write(f"    ... and {count - len(shown)} more\n")
+
     def flush(self) -> None:
         self.stream.flush()
 
+    def close(self) -> None:
+        self.flush()
+
 
 class JsonLogWriter:
     """Write logs as JSON lines for structured logging systems."""
@@ -167,7 +267,7 @@ class JsonLogWriter:
             "title_length": entry.title_length,
             "content_length": entry.content_length,
             "status": entry.status,
-            "timestamp": time.time(),
+            "timestamp": entry.timestamp,
         }
         if entry.error:
             log_entry["error"] = entry.error
@@ -192,6 +292,8 @@ class JsonLogWriter:
             "max_content_length": summary.max_content_length,
             "errors": summary.errors,
             "warnings_list": summary.warnings_list,
+            "stage_timings": {stage: asdict(timing) for stage, timing in summary.stage_timings.items()},
+            "api_stats": summary.api_stats,
             "timestamp": time.time(),
         }
         self.stream.write(self._json.dumps(entry) + "\n")
@@ -199,19 +301,129 @@ class JsonLogWriter:
     def flush(self) -> None:
         self.stream.flush()
 
+    def close(self) -> None:
+        self.flush()
+
+
+class BackgroundLogWriter:
+    """
+    Run another writer on a background thread so logging costs callers an enqueue.
+
+    Calls are queued in order and replayed on a worker thread. The worker points
+    the wrapped writer's stream at an in-memory buffer and writes what each
+    drained batch produced to the real stream in one call, so formatting and
+    JSON serialization happen off the caller's thread. The queue is bounded: if
+    the stream can't keep up, callers block instead of buffering without limit.
+
+    flush() returns once everything logged before it has been written; close()
+    also stops the thread. An error raised by the wrapped writer is re-raised
+    from the next flush() or close().
+    """
+
+    def __init__(self, writer: Any, max_queue: int = 10000, max_batch_bytes: int = 64 * 1024):
+        self.writer = writer
+        self.stream: TextIO = writer.stream
+        self.max_batch_bytes = max_batch_bytes
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._buffer = io.StringIO()
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        writer.stream = self._buffer
+        self._thread = threading.Thread(target=self._run, name="indexing-log-writer", daemon=True)
+        self._thread.start()
+
+    def write_line(self, message: str, level: LogLevel = LogLevel.INFO) -> None:
+        self._queue.put((self.writer.write_line, (message, level)))
+
+    def write_document(self, entry: DocumentLogEntry) -> None:
+        self._queue.put((self.writer.write_document, (entry,)))
+
+    def write_summary(self, summary: IndexingSummary) -> None:
+        self._queue.put((self.writer.write_summary, (summary,)))
+
+    def flush(self) -> None:
+        if self._closed:
+            return
+        written = threading.Event()
+        self._queue.put(written)
+        written.wait()
+        self._raise_error()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self._raise_error()
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if isinstance(item, threading.Event):
+                self._write_out(flush=True)
+                item.set()
+                continue
+            method, args = item
+            try:
+                method(*args)
+            except Exception as e:
+                self._error = self._error or e
+            # Keep batching while more calls are waiting; write once the queue runs dry.
+            if self._queue.empty() or self._buffer.tell() >= self.max_batch_bytes:
+                self._write_out()
+
+    def _write_out(self, flush: bool = False) -> None:
+        try:
+            text = self._buffer.getvalue()
+            if text:
+                self._buffer.seek(0)
+                self._buffer.truncate()
+                self.stream.write(text)
+            if flush:
+                self.stream.flush()
+        except Exception as e:
+            self._error = self._error or e
+
 
 class IndexingLogger:
     """
     Main logging interface for indexing operations.
 
-    Tracks documents, collects metrics, and generates summaries.
+    Tracks documents, collects metrics, and generates summaries. Metrics are
+    aggregated as documents are logged, so memory stays constant however many
+    documents a run processes; only the first `max_messages` error and warning
+    messages are kept for the summary.
     """
 
-    def __init__(self, writer: Optional[LogWriter] = None, verbose: bool = False):
+    def __init__(
+        self,
+        writer: Optional[LogWriter] = None,
+        verbose: bool = False,
+        max_messages: int = 1000,
+    ):
         self.writer = writer or StdoutLogWriter(verbose=verbose)
-        self._documents: List[DocumentLogEntry] = []
+        self.max_messages = max_messages
         self._start_time: Optional[float] = None
-        self._content_lengths: List[int] = []
+        self._doc_types: Counter = Counter()
+        self._statuses: Counter = Counter()
+        self._total_documents = 0
+        self._content_total = 0
+        self._min_content: Optional[int] = None
+        self._max_content: Optional[int] = None
+        self._errors: List[str] = []
+        self._warnings: List[str] = []
+        self._timings: Dict[str, LatencyHistogram] = {}
+        self._timings_lock = threading.Lock()
+        self._api_stats: Dict[str, float] = {}
 
     def start(self, message: str = "Starting indexing operation") -> None:
         """Mark the start of indexing."""
@@ -246,10 +458,51 @@ class IndexingLogger:
             duration_ms=duration_ms,
             extra=extra,
         )
-        self._documents.append(entry)
-        self._content_lengths.append(content_length)
+        self._record(entry)
         self.writer.write_document(entry)
 
+    def _record(self, entry: DocumentLogEntry) -> None:
+        self._total_documents += 1
+        self._doc_types[entry.doc_type] += 1
+        self._statuses[entry.status] += 1
+
+        length = entry.content_length
+        self._content_total += length
+        if self._min_content is None or length < self._min_content:
+            self._min_content = length
+        if self._max_content is None or length > self._max_content:
+            self._max_content = length
+
+        if entry.error:
+            messages = {"error": self._errors, "warning": self._warnings}.get(entry.status)
+            if messages is not None and len(messages) < self.max_messages:
+                messages.append(entry.error)
+
+    def record_timing(self, stage: str, duration_ms: float) -> None:
+        """Add one duration to a stage's latency histogram. Safe to call from any thread."""
+        with self._timings_lock:
+            histogram = self._timings.get(stage)
+            if histogram is None:
+                histogram = self._timings[stage] = LatencyHistogram()
+            histogram.record(duration_ms)
+
+    @contextmanager
+    def timed(self, stage: str) -> Iterator[None]:
+        """Record how long the with-block takes under `stage`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_timing(stage, (time.perf_counter() - start) * 1000)
+
+    def record_api_stats(self, stats: Dict[str, float]) -> None:
+        """Report the indexing API's request, retry and throttling counters in the summary.
+
+        Expects requests, retries, throttled, token_wait_seconds,
+        backoff_seconds and throttled_seconds.
+        """
+        self._api_stats = dict(stats)
+
     def log_warning(self, message: str) -> None:
         """Log a warning."""
         self.writer.write_line(message, LogLevel.WARNING)
@@ -262,32 +515,22 @@ class IndexingLogger:
         """Complete indexing and generate summary."""
         duration = time.time() - self._start_time if self._start_time else 0.0
 
-        info_pages = sum(1 for d in self._documents if d.doc_type == "info_page")
-        api_refs = sum(1 for d in self._documents if d.doc_type == "api_reference")
-        successful = sum(1 for d in self._documents if d.status == "success")
-        failed = sum(1 for d in self._documents if d.status == "error")
-        warnings = sum(1 for d in self._documents if d.status == "warning")
-
-        errors = [d.error for d in self._documents if d.error and d.status == "error"]
-        warnings_list = [d.error for d in self._documents if d.error and d.status == "warning"]
-
-        avg_content = sum(self._content_lengths) / len(self._content_lengths) if self._content_lengths else 0
-        min_content = min(self._content_lengths) if self._content_lengths else 0
-        max_content = max(self._content_lengths) if self._content_lengths else 0
-
+        count = self._total_documents
         summary = IndexingSummary(
-            total_documents=len(self._documents),
-            info_pages=info_pages,
-            api_references=api_refs,
-            successful=successful,
-            failed=failed,
-            warnings=warnings,
+            total_documents=count,
+            info_pages=self._doc_types["info_page"],
+            api_references=self._doc_types["api_reference"],
+            successful=self._statuses["success"],
+            failed=self._statuses["error"],
+            warnings=self._statuses["warning"],
             total_duration_s=duration,
-            avg_content_length=avg_content,
-            min_content_length=min_content,
-            max_content_length=max_content,
-            errors=errors,
-            warnings_list=warnings_list,
+            avg_content_length=self._content_total / count if count else 0,
+            min_content_length=self._min_content or 0,
+            max_content_length=self._max_content or 0,
+            errors=list(self._errors),
+            warnings_list=list(self._warnings),
+            stage_timings=self._stage_timings(),
+            api_stats=dict(self._api_stats),
         )
 
         self.writer.write_summary(summary)
@@ -295,11 +538,20 @@ class IndexingLogger:
 
         return summary
 
+    def _stage_timings(self) -> Dict[str, StageTiming]:
+        with self._timings_lock:
+            return {stage: histogram.stats() for stage, histogram in self._timings.items()}
+
+    def close(self) -> None:
+        """Write out anything still buffered and release the writer."""
+        self.writer.close()
+
 
 def create_logger(
     format: str = "stdout",
     verbose: bool = False,
     stream: Optional[TextIO] = None,
+    background: bool = False,
 ) -> IndexingLogger:
     """
     Factory function to create an IndexingLogger with the specified writer.
@@ -308,6 +560,7 @@ def create_logger(
         format: Output format - "stdout" for human-readable, "json" for structured
         verbose: Whether to include extra details in output
         stream: Output stream (defaults to sys.stdout)
+        background: Format and write on a background thread; call close() when done
 
     Returns:
         Configured IndexingLogger instance
@@ -319,4 +572,7 @@ def create_logger(
     else:
         writer = StdoutLogWriter(stream=stream, verbose=verbose)
 
+    if background:
+        writer = BackgroundLogWriter(writer)
+
     return IndexingLogger(writer=writer, verbose=verbose)
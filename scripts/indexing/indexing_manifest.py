@@ -0,0 +1,118 @@
+"""Per-document content-hash manifest for incremental indexing.
+
+The manifest maps each document id (the uuid5 the data client derives from the
+page URL) to a hash of its source page and the Glean object type it was
+uploaded as. An incremental run diffs the current pages against it to decide
+which documents to (re)upload and which ones to delete.
+
+Bump MANIFEST_VERSION whenever the page -> document transform changes in a way
+that should force every document to be re-uploaded; a version mismatch makes
+the stored manifest unusable and the next run falls back to a full upload.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+
+def content_hash(page: Mapping[str, Any]) -> str:
+    """Stable hash of a page dict, independent of key order."""
+    payload = json.dumps(page, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    """What was last uploaded for one document."""
+    hash: str
+    object_type: str
+
+
+@dataclass
+class ManifestDiff:
+    """Result of comparing the current pages against the manifest."""
+    changed: List[Tuple[Mapping[str, Any], str]] = field(default_factory=list)  # (page, hash)
+    deleted: Dict[str, str] = field(default_factory=dict)  # id -> object_type
+    unchanged: int = 0
+
+
+class IndexingManifest:
+    """JSON file of {document id: {hash, objectType}} from the last successful upload."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.entries: Dict[str, ManifestEntry] = {}
+
+    def load(self) -> bool:
+        """Load the manifest from disk.
+
+        Returns False (leaving the manifest empty) when the file is missing,
+        unreadable, or was written by a different MANIFEST_VERSION.
+        """
+        self.entries = {}
+        if not self.path.exists():
+            return False
+        try:
+            data = json.loads(self.path.read_text())
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Ignoring unreadable manifest {self.path}: {e}")
+            return False
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            logger.warning(f"Ignoring manifest {self.path} with unexpected version")
+            return False
+        self.entries = {
+            doc_id: ManifestEntry(hash=entry["hash"], object_type=entry["objectType"])
+            for doc_id, entry in data.get("documents", {}).items()
+        }
+        return True
+
+    def save(self) -> None:
+        """Write the manifest atomically so a crash never leaves a partial file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": MANIFEST_VERSION,
+            "documents": {
+                doc_id: {"hash": entry.hash, "objectType": entry.object_type}
+                for doc_id, entry in sorted(self.entries.items())
+            },
+        }
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(json.dumps(data, indent=2))
+        os.replace(tmp_path, self.path)
+
+    def diff(self, pages: Iterable[Mapping[str, Any]]) -> ManifestDiff:
+        """Split pages into new-or-changed vs. unchanged, and find vanished ids."""
+        result = ManifestDiff()
+        seen = set()
+        for page in pages:
+            doc_id = page["id"]
+            seen.add(doc_id)
+            page_hash = content_hash(page)
+            entry = self.entries.get(doc_id)
+            if entry is not None and entry.hash == page_hash:
+                result.unchanged += 1
+            else:
+                result.changed.append((page, page_hash))
+        result.deleted = {
+            doc_id: entry.object_type
+            for doc_id, entry in self.entries.items()
+            if doc_id not in seen
+        }
+        return result
+
+    def record(self, doc_id: str, page_hash: str, object_type: str) -> None:
+        self.entries[doc_id] = ManifestEntry(hash=page_hash, object_type=object_type)
+
+    def remove(self, doc_id: str) -> None:
+        self.entries.pop(doc_id, None)
+
+    def clear(self) -> None:
+        self.entries = {}
@@ -2,6 +2,7 @@
 
 import os
 import sys
+from contextlib import nullcontext
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -15,6 +16,11 @@ from data_client import DeveloperDocsDataClient
 from developer_docs_connector import DeveloperDocsConnector
 from glean.indexing.models import ConnectorOptions, IndexingMode
 from indexing_logger import create_logger
+from indexing_manifest import IndexingManifest
+from rate_limiter import RequestScheduler
+from run_profiler import RunProfiler
+
+DEFAULT_CACHE_DIR = Path(__file__).parent / ".cache"
 
 
 def main():
@@ -22,8 +28,26 @@ def main():
     disable_stale_deletion_check = os.getenv(
         "DISABLE_STALE_DELETION_CHECK", ""
     ).lower() in ("true", "1", "yes")
+    incremental = os.getenv("INDEXING_MODE", "full").lower() == "incremental"
+    manifest_path = os.getenv(
+        "INDEXING_MANIFEST_PATH", str(DEFAULT_CACHE_DIR / "manifest.json")
+    )
+    workers = int(os.getenv("INDEXING_WORKERS", "1"))
+    schema_cache_dir = os.getenv("SCHEMA_CACHE_DIR", str(DEFAULT_CACHE_DIR / "schemas"))
+    pipeline_depth = int(os.getenv("UPLOAD_PIPELINE_DEPTH", "0"))
+    upload_workers = int(os.getenv("UPLOAD_WORKERS", "1"))
+    upload_batch_bytes = os.getenv("UPLOAD_BATCH_BYTES")
+    rate_limit = os.getenv("INDEXING_RATE_LIMIT")
+    max_retries = int(os.getenv("INDEXING_MAX_RETRIES", "5"))
     log_format = os.getenv("LOG_FORMAT", "stdout")
-    indexing_logger = create_logger(format=log_format, verbose=True)
+    profile = os.getenv("PROFILE", "").lower() in ("true", "1", "yes")
+    profile_dir = os.getenv("PROFILE_DIR", str(DEFAULT_CACHE_DIR / "profile"))
+    profile_top_n = int(os.getenv("PROFILE_TOP_N", "20"))
+    indexing_logger = create_logger(format=log_format, verbose=True, background=True)
+    profiler = RunProfiler(profile_dir, top_n=profile_top_n) if profile else None
+
+    def phase(name: str):
+        return profiler.phase(name) if profiler else nullcontext()
 
     try:
         if dry_run:
@@ -31,17 +55,43 @@ def main():
         else:
             indexing_logger.start("Starting indexing operation")
 
-        data_client = DeveloperDocsDataClient(indexing_logger=indexing_logger)
-        connector = DeveloperDocsConnector(name="devdocs", data_client=data_client)
+        data_client = DeveloperDocsDataClient(
+            indexing_logger=indexing_logger,
+            workers=workers,
+            schema_cache_dir=schema_cache_dir,
+        )
+        manifest = IndexingManifest(manifest_path)
+        connector = DeveloperDocsConnector(
+            name="devdocs",
+            data_client=data_client,
+            manifest=manifest,
+            pipeline_depth=pipeline_depth,
+            upload_workers=upload_workers,
+            max_batch_bytes=int(upload_batch_bytes) if upload_batch_bytes else None,
+            scheduler=RequestScheduler(
+                rate=float(rate_limit) if rate_limit else None,
+                max_retries=max_retries,
+            ),
+            indexing_logger=indexing_logger,
+        )
 
         if dry_run:
-            data = connector.get_data()
+            with phase("get_source_data"):
+                data = connector.get_data()
             indexing_logger.log("")
             indexing_logger.log(f"Fetched {len(data)} pages total")
 
-            documents = connector.transform(data)
+            with phase("transform"):
+                documents = connector.transform(data)
             indexing_logger.log(f"Transformed {len(documents)} documents")
 
+            if incremental and manifest.load():
+                diff = manifest.diff(data)
+                indexing_logger.log(
+                    f"Incremental run would upload {len(diff.changed)} documents "
+                    f"and delete {len(diff.deleted)} ({diff.unchanged} unchanged)"
+                )
+
             summary = indexing_logger.finish()
 
             if summary.failed > 0:
@@ -56,12 +106,13 @@ def main():
                 indexing_logger.log(
                     "WARNING: stale document deletion safeguard is DISABLED for this run"
                 )
-            connector.index_data(
-                mode=IndexingMode.FULL,
-                options=ConnectorOptions(
-                    disable_stale_deletion_check=disable_stale_deletion_check
-                ),
-            )
+            with phase("index_data"):
+                connector.index_data(
+                    mode=IndexingMode.INCREMENTAL if incremental else IndexingMode.FULL,
+                    options=ConnectorOptions(
+                        disable_stale_deletion_check=disable_stale_deletion_check
+                    ),
+                )
 
             summary = indexing_logger.finish()
 
@@ -74,6 +125,13 @@ def main():
     except Exception as e:
         indexing_logger.log_error(f"Error occurred during indexing: {e}")
         raise
+    finally:
+        if profiler and profiler.phases:
+            indexing_logger.log("")
+            for line in profiler.report():
+                indexing_logger.log(line)
+            indexing_logger.log(f"Profiles written to {profiler.output_dir}")
+        indexing_logger.close()
 
 
 if __name__ == "__main__":
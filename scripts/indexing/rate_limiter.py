@@ -0,0 +1,192 @@
+"""Client-side rate limiting and retries for Glean indexing API calls.
+
+Every indexing request (datasource setup, bulk-index pages, incremental
+index/delete calls) goes through one shared RequestScheduler:
+
+- A token bucket spaces requests out to `rate` per second, with bursts of up
+  to `burst`, so concurrent upload workers share one quota instead of each
+  sending as fast as it can. Without a rate only the retry handling applies.
+- Failures with a retryable status (429, 500, 502, 503, 504) or a transport
+  error are retried up to `max_retries` times. Any other error is raised
+  immediately.
+- A Retry-After header (seconds or HTTP date) is honored, up to
+  `max_retry_after`; longer values are clamped with a warning, since a 429
+  pauses every worker. Otherwise the delay is exponential backoff with full
+  jitter, capped at `max_delay`.
+- A 429 pauses every caller, not just the one that was throttled, so a burst
+  of workers doesn't turn one rejection into a 429 storm.
+
+The Glean client's own retries are off by default, so the scheduler is the
+only retry layer.
+"""
+
+import logging
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, TypeVar
+
+import httpx
+from glean.api_client.errors import GleanBaseError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: Optional[str], now: Optional[datetime] = None) -> Optional[float]:
+    """Seconds to wait according to a Retry-After header, or None if absent or invalid."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    return max((when - now).total_seconds(), 0.0)
+
+
+class TokenBucket:
+    """Thread-safe token bucket that hands out reservations instead of blocking.
+
+    reserve() always takes a token, letting the balance go negative, and
+    returns how long the caller must wait before using it. Callers sleep
+    outside the lock and are served in the order they reserved.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self._clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+@dataclass
+class SchedulerStats:
+    """Counters for one scheduler. Seconds are time spent sleeping, summed across threads."""
+    requests: int = 0
+    retries: int = 0
+    throttled: int = 0  # 429 responses
+    token_wait_seconds: float = 0.0
+    backoff_seconds: float = 0.0
+
+    @property
+    def throttled_seconds(self) -> float:
+        return self.token_wait_seconds + self.backoff_seconds
+
+    def as_dict(self) -> Dict[str, float]:
+        return {**asdict(self), "throttled_seconds": self.throttled_seconds}
+
+
+class RequestScheduler:
+    """Run indexing API calls under a shared rate limit with retry and backoff."""
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        max_retry_after: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Optional[random.Random] = None,
+    ):
+        self.bucket = TokenBucket(rate, burst or rate, clock=clock) if rate else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.stats = SchedulerStats()
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+
+    def call(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """Call fn(*args, **kwargs), retrying retryable failures."""
+        attempt = 0
+        while True:
+            self._wait_for_turn()
+            with self._lock:
+                self.stats.requests += 1
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                status = getattr(e, "status_code", None) if isinstance(e, GleanBaseError) else None
+                retryable = status in RETRYABLE_STATUSES or isinstance(e, httpx.TransportError)
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                delay = self._retry_delay(e, attempt)
+                with self._lock:
+                    self.stats.retries += 1
+                    if status == 429:
+                        self.stats.throttled += 1
+                        self._resume_at = max(self._resume_at, self._clock() + delay)
+                reason = f"status {status}" if status is not None else type(e).__name__
+                logger.warning(f"Indexing request failed ({reason}); retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+                self._pause(delay, backoff=True)
+                attempt += 1
+
+    def summary(self) -> str:
+        s = self.stats
+        return (
+            f"{s.requests} requests, {s.retries} retries ({s.throttled} throttled), "
+            f"{s.throttled_seconds:.1f}s waiting ({s.token_wait_seconds:.1f}s rate limit, "
+            f"{s.backoff_seconds:.1f}s backoff)"
+        )
+
+    def _wait_for_turn(self) -> None:
+        with self._lock:
+            paused = self._resume_at - self._clock()
+        if paused > 0:
+            self._pause(paused, backoff=True)
+        if self.bucket is not None:
+            self._pause(self.bucket.reserve(), backoff=False)
+
+    def _retry_delay(self, error: Exception, attempt: int) -> float:
+        if isinstance(error, GleanBaseError):
+            retry_after = parse_retry_after(error.headers.get("retry-after"))
+            if retry_after is not None:
+                if retry_after > self.max_retry_after:
+                    logger.warning(
+                        f"Retry-After of {retry_after:.0f}s exceeds the {self.max_retry_after:.0f}s limit; "
+                        f"waiting {self.max_retry_after:.0f}s instead"
+                    )
+                    return self.max_retry_after
+                return retry_after
+        return self._rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _pause(self, seconds: float, backoff: bool) -> None:
+        if seconds <= 0:
+            return
+        with self._lock:
+            if backoff:
+                self.stats.backoff_seconds += seconds
+            else:
+                self.stats.token_wait_seconds += seconds
+        self._sleep(seconds)
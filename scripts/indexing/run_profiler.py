@@ -0,0 +1,146 @@
+"""Opt-in CPU and memory profiling for indexing runs.
+
+RunProfiler.phase(name) wraps one stage of a run (get_source_data, transform,
+index_data) in a cProfile profile and a tracemalloc window. For each phase it
+writes to the output directory:
+
+- `<name>.pstats` - cProfile stats, readable with `python -m pstats` and by
+  snakeviz, flameprof, gprof2dot and other flamegraph tools,
+- `<name>.tracemalloc` - a tracemalloc snapshot taken at the end of the phase
+  (load with tracemalloc.Snapshot.load),
+
+and report() returns a top-N table of CPU hotspots (by own time) and
+allocation growth per phase, which is also written to `hotspots.txt`.
+
+cProfile only sees the thread that runs the phase; work done on upload or
+producer threads shows up as time spent waiting on them.
+"""
+
+import cProfile
+import logging
+import os
+import pstats
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, List, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Frames kept per allocation; enough to attribute growth to callers, cheap enough to leave on.
+TRACEMALLOC_FRAMES = 8
+
+
+@dataclass
+class PhaseProfile:
+    name: str
+    seconds: float
+    peak_bytes: int
+    stats: pstats.Stats
+    # (location, size_diff_bytes, count_diff) of the largest allocation growth.
+    allocations: List[Tuple[str, int, int]] = field(default_factory=list)
+
+
+class RunProfiler:
+    """Collects a CPU profile and memory snapshot per phase of a run."""
+
+    def __init__(self, output_dir: Union[str, Path], top_n: int = 20):
+        self.output_dir = Path(output_dir)
+        self.top_n = top_n
+        self.phases: List[PhaseProfile] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Profile the with-block as `name`. Profiles are written even if it raises."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            after = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            if started_tracing:
+                tracemalloc.stop()
+            self._record(name, profile, before, after, peak)
+
+    def _record(
+        self,
+        name: str,
+        profile: cProfile.Profile,
+        before: tracemalloc.Snapshot,
+        after: tracemalloc.Snapshot,
+        peak: int,
+    ) -> None:
+        profile.dump_stats(str(self.output_dir / f"{name}.pstats"))
+        after.dump(str(self.output_dir / f"{name}.tracemalloc"))
+
+        stats = pstats.Stats(profile)
+        growth = [
+            diff for diff in after.compare_to(before, "lineno")
+            if diff.size_diff > 0 and not _is_profiler_frame(diff.traceback[0].filename)
+        ]
+        allocations = [
+            (_format_location(diff.traceback[0].filename, diff.traceback[0].lineno), diff.size_diff, diff.count_diff)
+            for diff in growth[: self.top_n]
+        ]
+        self.phases.append(PhaseProfile(
+            name=name,
+            seconds=stats.total_tt,
+            peak_bytes=peak,
+            stats=stats,
+            allocations=allocations,
+        ))
+        logger.info(f"Profiled {name}: {stats.total_tt:.2f}s, peak {peak / 1e6:.1f} MB traced")
+
+    def report(self) -> List[str]:
+        """Hotspot table lines for every phase; also written to hotspots.txt."""
+        lines = []
+        for phase in self.phases:
+            lines.append(
+                f"Profile: {phase.name} ({phase.seconds:.2f}s profiled, "
+                f"peak {phase.peak_bytes / 1e6:.1f} MB traced)"
+            )
+            lines.append(f"  {'own s':>8} {'cum s':>8} {'calls':>10}  function")
+            for location, calls, own, cumulative in self._hotspots(phase.stats):
+                lines.append(f"  {own:>8.3f} {cumulative:>8.3f} {calls:>10}  {location}")
+            if phase.allocations:
+                lines.append(f"  {'+KiB':>8} {'+blocks':>8}  allocated at")
+                for location, size, count in phase.allocations:
+                    lines.append(f"  {size / 1024:>8.1f} {count:>8}  {location}")
+            lines.append("")
+        if lines:
+            (self.output_dir / "hotspots.txt").write_text("\n".join(lines) + "\n")
+        return lines
+
+    def _hotspots(self, stats: pstats.Stats) -> List[Tuple[str, int, float, float]]:
+        rows = []
+        for (filename, lineno, function), (_, calls, own, cumulative, _) in stats.stats.items():
+            if _is_profiler_frame(filename):
+                continue
+            rows.append((f"{function} ({_format_location(filename, lineno)})", calls, own, cumulative))
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return rows[: self.top_n]
+
+
+def _is_profiler_frame(filename: str) -> bool:
+    return filename == __file__ or filename.endswith(("/tracemalloc.py", "/cProfile.py"))
+
+
+def _format_location(filename: str, lineno: int) -> str:
+    if filename == "~":  # built-in functions
+        return "built-in"
+    try:
+        relative = os.path.relpath(filename)
+    except ValueError:  # different drive on Windows
+        relative = filename
+    if not relative.startswith(".."):
+        filename = relative
+    return f"{filename}:{lineno}"
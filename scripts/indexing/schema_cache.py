@@ -0,0 +1,83 @@
+"""Persistent, size-bounded cache of rendered API schema text.
+
+The data client renders each docs/api/**/*.json schema file into the text that
+ends up in the indexed document. That output depends only on the file content
+and the simplification settings, so it can be reused across runs: the client
+keys entries by a hash of both and stores them here as small JSON files.
+
+Eviction is least-recently-used by file mtime, which get() refreshes on hit.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class SchemaCache:
+    """Directory of <key>.json files holding JSON-serializable rendered values."""
+
+    def __init__(self, directory: Union[str, Path], max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None on a miss or unreadable entry."""
+        path = self._path(key)
+        try:
+            value = json.loads(path.read_text())
+            os.utime(path)
+        except (json.JSONDecodeError, UnicodeDecodeError, OSError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a value. Failures only cost a cache miss next time."""
+        path = self._path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(value))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write schema cache entry {path}: {e}")
+
+    def prune(self) -> int:
+        """Evict least-recently-used entries until the cache fits max_bytes.
+
+        Returns the number of evicted entries.
+        """
+        if not self.directory.exists():
+            return 0
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            evicted += 1
+        return evicted
@@ -0,0 +1,156 @@
+"""Incremental sitemap reading for the live-site crawler.
+
+SitemapParser takes a sitemap in chunks as they arrive off the wire, inflating
+gzip (.xml.gz) bodies on the fly, and returns each <url> or <sitemap> entry as
+soon as its closing tag is parsed. Finished elements are dropped from the tree,
+so memory stays flat however many URLs the sitemap lists.
+
+stream_sitemap() starts from one sitemap URL, follows <sitemap> entries of
+sitemap indexes (fetching up to `concurrency` child sitemaps at once) and
+yields every page's (loc, lastmod) as it is discovered, so the crawl can start
+before the sitemap has been read to the end.
+"""
+
+import asyncio
+import xml.etree.ElementTree as ET
+import zlib
+from contextlib import aclosing
+from typing import AsyncIterator, Callable, List, NamedTuple, Optional, Set, Tuple
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+_DONE = object()
+
+
+class SitemapEntry(NamedTuple):
+    kind: str  # "url" for a page, "sitemap" for a child sitemap of an index
+    loc: str
+    lastmod: Optional[str]
+
+
+def _local_name(tag: str) -> str:
+    return tag.rpartition("}")[2]
+
+
+class SitemapParser:
+    """Push parser for urlset and sitemapindex documents, plain or gzipped."""
+
+    def __init__(self) -> None:
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._root: Optional[ET.Element] = None
+        self._head = b""
+        self._inflate = None
+        self._sniffed = False
+
+    def feed(self, chunk: bytes) -> List[SitemapEntry]:
+        """Parse the next chunk of the body; returns the entries it completed."""
+        if not self._sniffed:
+            # Servers often send .xml.gz as a plain gzip file rather than with
+            # Content-Encoding, so decide by the body's magic bytes.
+            self._head += chunk
+            if len(self._head) < len(GZIP_MAGIC):
+                return []
+            chunk, self._head = self._head, b""
+            if chunk.startswith(GZIP_MAGIC):
+                self._inflate = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            self._sniffed = True
+        if self._inflate is not None:
+            chunk = self._inflate.decompress(chunk)
+        self._parser.feed(chunk)
+        return self._entries()
+
+    def close(self) -> List[SitemapEntry]:
+        """Finish parsing; raises ET.ParseError if the document is truncated or malformed."""
+        if not self._sniffed and self._head:
+            self._sniffed = True
+            self._parser.feed(self._head)
+        elif self._inflate is not None:
+            self._parser.feed(self._inflate.flush())
+        self._parser.close()
+        return self._entries()
+
+    def _entries(self) -> List[SitemapEntry]:
+        entries = []
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                if self._root is None:
+                    self._root = elem
+                continue
+            kind = _local_name(elem.tag)
+            if kind not in ("url", "sitemap"):
+                continue
+            fields = {_local_name(child.tag): (child.text or "").strip() for child in elem}
+            if fields.get("loc"):
+                entries.append(SitemapEntry(kind, fields["loc"], fields.get("lastmod") or None))
+            # Entries are children of the root; drop the ones already handled.
+            self._root.clear()
+        return entries
+
+
+async def stream_sitemap(
+    sitemap_url: str,
+    fetch: Callable[[str], AsyncIterator[bytes]],
+    concurrency: int = 4,
+    buffer: int = 256,
+) -> AsyncIterator[Tuple[str, Optional[str]]]:
+    """Yield (loc, lastmod) for every page reachable from sitemap_url, each loc once.
+
+    fetch(url) yields a sitemap's body in chunks and raises if it can't be
+    fetched. At most `buffer` discovered URLs wait for the caller before the
+    readers pause. A sitemap that fails to fetch or parse fails the stream,
+    since crawling a partial URL list would look like deleted pages.
+    """
+    pending: asyncio.Queue = asyncio.Queue()
+    results: asyncio.Queue = asyncio.Queue(maxsize=buffer)
+    seen_sitemaps: Set[str] = {sitemap_url}
+    seen_pages: Set[str] = set()
+    outstanding = 1
+    pending.put_nowait(sitemap_url)
+
+    async def read(url: str) -> None:
+        parser = SitemapParser()
+        async with aclosing(fetch(url)) as chunks:
+            async for chunk in chunks:
+                for entry in parser.feed(chunk):
+                    await handle(entry)
+        for entry in parser.close():
+            await handle(entry)
+
+    async def handle(entry: SitemapEntry) -> None:
+        nonlocal outstanding
+        if entry.kind == "sitemap":
+            if entry.loc not in seen_sitemaps:
+                seen_sitemaps.add(entry.loc)
+                outstanding += 1
+                pending.put_nowait(entry.loc)
+        elif entry.loc not in seen_pages:
+            seen_pages.add(entry.loc)
+            await results.put((entry.loc, entry.lastmod))
+
+    async def work() -> None:
+        nonlocal outstanding
+        while True:
+            url = await pending.get()
+            try:
+                await read(url)
+            except Exception as e:
+                await results.put(e)
+                return
+            outstanding -= 1
+            if outstanding == 0:
+                await results.put(_DONE)
+                return
+
+    workers = [asyncio.create_task(work()) for _ in range(max(concurrency, 1))]
+    try:
+        while True:
+            item = await results.get()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
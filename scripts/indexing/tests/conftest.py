@@ -15,6 +15,7 @@ checked-out build/ tree or the actual API specs.
 from __future__ import annotations
 
 import json
+import random
 import sys
 from pathlib import Path
 from typing import Any
@@ -33,7 +34,7 @@ def _write_json(path: Path, data: Any) -> None:
 
 
 # Sample JSON-Schema fragments used across tests. Kept tiny but exercising
-# enough shape for _simplify_schema to do something interesting.
+# enough shape for schema simplification to do something interesting.
 SIMPLE_REQUEST_SCHEMA = {
     "title": "FeedbackRequest",
     "body": {
@@ -183,6 +184,78 @@ def _build_repo(tmp_path: Path) -> Path:
     return tmp_path
 
 
+def _synthetic_object_schema(name: str, properties: int) -> dict:
+    """A request/response schema with `properties` two-level properties."""
+    return {
+        "type": "object",
+        "description": f"{name} payload.",
+        "required": [f"{name}_field_0"],
+        "properties": {
+            f"{name}_field_{i}": {
+                "type": "object",
+                "description": f"Field {i} of {name}. " + "Lorem ipsum dolor sit amet. " * 3,
+                "properties": {
+                    f"sub_{j}": {"type": "string", "description": f"Sub-field {j}.", "enum": ["A", "B"]}
+                    for j in range(4)
+                },
+            }
+            for i in range(properties)
+        },
+    }
+
+
+def _build_synthetic_repo(
+    tmp_path: Path, pages: int, api_ratio: float = 0.3, seed: int = 0
+) -> Path:
+    """Materialize a fake repo with `pages` docs.json entries, for benchmarks.
+
+    Roughly `api_ratio` of the pages are client-api endpoints with their own
+    schema files. Schema sizes follow the real docs/api spread: mostly a few
+    hundred bytes, ~10% around 10 KB and ~1% around 300 KB (chat-sized).
+    """
+    rng = random.Random(seed)
+    api = tmp_path / "docs" / "api" / "client-api"
+    docs_json = {}
+    timestamps = {}
+    for i in range(pages):
+        if rng.random() < api_ratio:
+            group, slug = f"group-{i % 25}", f"endpoint-{i}"
+            roll = rng.random()
+            properties = 250 if roll < 0.01 else 12 if roll < 0.11 else 1
+            schema = _synthetic_object_schema(slug, properties)
+            _write_json(
+                api / group / f"{slug}.RequestSchema.json",
+                {"title": slug, "body": {"content": {"application/json": {"schema": schema}}}},
+            )
+            _write_json(
+                api / group / f"{slug}.StatusCodes.json",
+                {
+                    "responses": {
+                        "200": {"description": "OK", "content": {"application/json": {"schema": schema}}},
+                        "400": {"description": "Bad Request"},
+                    }
+                },
+            )
+            _write_json(api / group / f"{slug}.ParamsDetails.json", PARAMS_DETAILS)
+            route = f"/api/client-api/{group}/{slug}"
+            markdown = f"# Endpoint {i}\n\nPOST\n/rest/api/v1/{slug}\n\nDescription."
+        else:
+            route = f"/guides/section-{i % 50}/page-{i}"
+            markdown = f"# Page {i}\n\n" + "Some guide text with `code` and [links](/x). " * rng.randint(20, 400)
+        url = f"https://developers.glean.com{route}"
+        docs_json[url] = {
+            "title": f"Page {i}",
+            "description": f"Description of page {i}.",
+            "route": route,
+            "markdown": markdown,
+        }
+        timestamps[url] = {"createdAt": 1700000000 + i, "lastUpdate": 1735689600 + i}
+
+    _write_json(tmp_path / "build" / "mcp" / "docs.json", docs_json)
+    _write_json(tmp_path / "build" / "indexing" / "timestamps.json", timestamps)
+    return tmp_path
+
+
 @pytest.fixture
 def fake_repo(tmp_path: Path) -> Path:
     """Path to a freshly-built fake repo for one test."""
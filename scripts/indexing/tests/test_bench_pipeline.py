@@ -0,0 +1,35 @@
+"""Tests for the pipeline benchmark harness."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from benchmarks.bench_pipeline import _measure, main
+
+
+def test_writes_results_per_stage(tmp_path: Path) -> None:
+    output = tmp_path / "bench.json"
+    report = main(["--sizes", "30", "--output", str(output)])
+
+    assert json.loads(output.read_text()) == report
+    assert [r["stage"] for r in report["results"]] == ["source", "transform", "format"]
+    for result in report["results"]:
+        assert result["corpus_pages"] == 30
+        assert result["seconds"] > 0
+        assert result["peak_bytes"] > 0
+
+
+def test_allocations_include_and_retention_excludes_the_stage_output() -> None:
+    kept = []
+
+    def returns_output():
+        return [object() for _ in range(10_000)]
+
+    def caches_output():
+        kept.append([object() for _ in range(10_000)])
+
+    returned = _measure(returns_output)
+    assert returned["allocated_blocks"] >= 10_000
+    assert returned["retained_blocks"] < 1_000
+    assert _measure(caches_output)["retained_blocks"] >= 10_000
@@ -0,0 +1,150 @@
+"""Tests for the scraper's browser page pool, against fake Playwright objects."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Callable, Dict, List
+
+import pytest
+
+from browser_pool import BrowserPagePool
+
+
+class FakePage:
+    def __init__(self, number: int) -> None:
+        self.number = number
+        self.closed = False
+        self.handlers: Dict[str, Callable] = {}
+
+    def on(self, event: str, handler: Callable) -> None:
+        self.handlers[event] = handler
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    async def close(self) -> None:
+        self.closed = True
+
+    def crash(self) -> None:
+        self.handlers["crash"](self)
+
+
+class FakeContext:
+    def __init__(self, browser: "FakeBrowser") -> None:
+        self.browser = browser
+        self.closed = False
+
+    async def new_page(self) -> FakePage:
+        page = FakePage(len(self.browser.pages))
+        self.browser.pages.append(page)
+        return page
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self) -> None:
+        self.contexts: List[FakeContext] = []
+        self.pages: List[FakePage] = []
+
+    async def new_context(self, **options) -> FakeContext:
+        context = FakeContext(self)
+        self.contexts.append(context)
+        return context
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+class TestBrowserPagePool:
+    def test_reuses_pages(self) -> None:
+        async def scenario():
+            browser = FakeBrowser()
+            async with BrowserPagePool(browser, size=2) as pool:
+                for _ in range(10):
+                    async with pool.page():
+                        pass
+            return browser, pool
+
+        browser, pool = _run(scenario())
+        assert len(browser.pages) == 1
+        assert pool.created == 1
+        assert all(c.closed for c in browser.contexts)
+
+    def test_size_bounds_concurrency(self) -> None:
+        async def scenario():
+            browser = FakeBrowser()
+            active = peak = 0
+
+            async def scrape(pool: BrowserPagePool) -> None:
+                nonlocal active, peak
+                async with pool.page():
+                    active += 1
+                    peak = max(peak, active)
+                    await asyncio.sleep(0.01)
+                    active -= 1
+
+            async with BrowserPagePool(browser, size=4) as pool:
+                await asyncio.gather(*(scrape(pool) for _ in range(20)))
+            return browser, peak
+
+        browser, peak = _run(scenario())
+        assert peak == 4
+        assert len(browser.pages) == 4
+
+    def test_recycles_after_max_uses(self) -> None:
+        async def scenario():
+            browser = FakeBrowser()
+            seen = []
+            async with BrowserPagePool(browser, size=1, max_uses=3) as pool:
+                for _ in range(7):
+                    async with pool.page() as page:
+                        seen.append(page.number)
+            return seen, pool
+
+        seen, pool = _run(scenario())
+        assert seen == [0, 0, 0, 1, 1, 1, 2]
+        assert pool.recycled == 2
+
+    def test_replaces_crashed_and_closed_pages(self) -> None:
+        async def scenario():
+            browser = FakeBrowser()
+            seen = []
+            async with BrowserPagePool(browser, size=1) as pool:
+                async with pool.page() as page:
+                    seen.append(page.number)
+                browser.pages[0].crash()
+                async with pool.page() as page:
+                    seen.append(page.number)
+                    await page.close()
+                async with pool.page() as page:
+                    seen.append(page.number)
+            return seen
+
+        assert _run(scenario()) == [0, 1, 2]
+
+    def test_failed_scrape_discards_page(self) -> None:
+        async def scenario():
+            browser = FakeBrowser()
+            async with BrowserPagePool(browser, size=1) as pool:
+                with pytest.raises(RuntimeError):
+                    async with pool.page():
+                        raise RuntimeError("navigation failed")
+                async with pool.page() as page:
+                    return browser, page.number
+
+        browser, number = _run(scenario())
+        assert number == 1
+        assert browser.contexts[0].closed
+
+    def test_rejects_use_after_close(self) -> None:
+        async def scenario():
+            pool = BrowserPagePool(FakeBrowser())
+            await pool.close()
+            async with pool.page():
+                pass
+
+        with pytest.raises(RuntimeError, match="closed"):
+            _run(scenario())
@@ -0,0 +1,59 @@
+"""Tests for the crawler's persistent HTTP validator cache."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from crawl_cache import CACHE_VERSION, CrawlCache
+
+URL = "https://developers.glean.com/guides/intro"
+PAGE = {"id": "1", "title": "Intro", "content": "x", "url": URL, "page_type": "info_page"}
+
+
+def _cached(tmp_path: Path) -> CrawlCache:
+    cache = CrawlCache(tmp_path / "crawl.json")
+    cache.record_response(URL, {"ETag": '"abc"', "Last-Modified": "Wed, 01 Jan 2026 00:00:00 GMT"}, "2026-01-01")
+    cache.record_page(URL, PAGE)
+    return cache
+
+
+class TestCrawlCache:
+    def test_round_trip(self, tmp_path: Path) -> None:
+        cache = _cached(tmp_path)
+        cache.save()
+        reloaded = CrawlCache(cache.path)
+        assert reloaded.load() is True
+        assert reloaded.entries == cache.entries
+
+    def test_version_mismatch_is_discarded(self, tmp_path: Path) -> None:
+        path = tmp_path / "crawl.json"
+        path.write_text(json.dumps({"version": CACHE_VERSION + 1, "urls": {}}))
+        assert CrawlCache(path).load() is False
+
+    def test_unchanged_page_requires_matching_lastmod(self, tmp_path: Path) -> None:
+        cache = _cached(tmp_path)
+        assert cache.unchanged_page(URL, "2026-01-01") == PAGE
+        assert cache.unchanged_page(URL, "2026-02-01") is None
+        assert cache.unchanged_page(URL, None) is None
+        assert cache.skipped == 1
+
+    def test_conditional_headers_only_with_a_cached_page(self, tmp_path: Path) -> None:
+        cache = _cached(tmp_path)
+        assert cache.conditional_headers(URL) == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Wed, 01 Jan 2026 00:00:00 GMT",
+        }
+        cache.record_response(URL, {"ETag": '"def"'}, None)
+        assert cache.conditional_headers(URL) == {}
+
+    def test_not_modified_refreshes_lastmod(self, tmp_path: Path) -> None:
+        cache = _cached(tmp_path)
+        assert cache.not_modified(URL, "2026-03-01") == PAGE
+        assert cache.unchanged_page(URL, "2026-03-01") == PAGE
+        assert cache.revalidated == 1
+
+    def test_retain_drops_vanished_urls(self, tmp_path: Path) -> None:
+        cache = _cached(tmp_path)
+        cache.retain([])
+        assert cache.entries == {}
@@ -0,0 +1,123 @@
+"""Tests for the crawler's bounded, host-fair scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import AsyncIterator, List
+
+import pytest
+
+from crawl_scheduler import HostFairQueue, schedule, url_host
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+class TestHostFairQueue:
+    def test_round_robin_across_hosts(self) -> None:
+        async def scenario():
+            queue: HostFairQueue[str] = HostFairQueue()
+            for url in ["http://a/1", "http://a/2", "http://a/3", "http://b/1", "http://c/1"]:
+                await queue.put(url)
+            await queue.close()
+            return [await queue.get() for _ in range(5)]
+
+        assert _run(scenario()) == ["http://a/1", "http://b/1", "http://c/1", "http://a/2", "http://a/3"]
+
+    def test_per_host_limit_skips_busy_hosts(self) -> None:
+        async def scenario():
+            queue: HostFairQueue[str] = HostFairQueue(per_host_limit=1)
+            for url in ["http://a/1", "http://a/2", "http://b/1"]:
+                await queue.put(url)
+            first, second = await queue.get(), await queue.get()
+            waiter = asyncio.ensure_future(queue.get())
+            await asyncio.sleep(0)
+            blocked = not waiter.done()
+            await queue.done(first)
+            return first, second, blocked, await waiter
+
+        assert _run(scenario()) == ("http://a/1", "http://b/1", True, "http://a/2")
+
+    def test_url_host_accepts_entries(self) -> None:
+        assert url_host(("https://developers.glean.com/x", "2026-01-01")) == "developers.glean.com"
+
+
+class TestSchedule:
+    def test_bounds_in_flight_and_yields_everything(self) -> None:
+        active = peak = 0
+
+        async def worker(n: int) -> int:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.001)
+            active -= 1
+            return n * 2
+
+        async def scenario():
+            items = (f"http://h{n % 3}/{n}" for n in range(200))
+            return [r async for r in schedule(items, lambda url: worker(int(url.rsplit("/", 1)[1])), limit=5)]
+
+        results = _run(scenario())
+        assert sorted(results) == [n * 2 for n in range(200)]
+        assert peak == 5
+
+    def test_streamed_items_are_read_ahead_boundedly(self) -> None:
+        produced = []
+
+        async def stream() -> AsyncIterator[str]:
+            for n in range(1000):
+                produced.append(n)
+                yield f"http://h/{n}"
+
+        async def scenario():
+            gate = asyncio.Event()
+
+            async def worker(url: str) -> str:
+                await gate.wait()
+                return url
+
+            results = schedule(stream(), worker, limit=2, max_pending=10)
+            first = asyncio.ensure_future(results.__anext__())
+            await asyncio.sleep(0.05)
+            read_ahead = len(produced)
+            gate.set()
+            await first
+            await results.aclose()
+            return read_ahead
+
+        # Two in flight plus at most max_pending (+1 being put) queued.
+        assert _run(scenario()) <= 2 + 10 + 1
+
+    def test_worker_failure_propagates(self) -> None:
+        async def worker(url: str) -> str:
+            if url.endswith("/3"):
+                raise RuntimeError("boom")
+            return url
+
+        async def scenario():
+            return [r async for r in schedule([f"http://h/{n}" for n in range(10)], worker, limit=2)]
+
+        with pytest.raises(RuntimeError, match="boom"):
+            _run(scenario())
+
+    def test_early_close_cancels_workers(self) -> None:
+        cancelled: List[str] = []
+
+        async def worker(url: str) -> str:
+            try:
+                await asyncio.sleep(0 if url.endswith("/0") else 10)
+            except asyncio.CancelledError:
+                cancelled.append(url)
+                raise
+            return url
+
+        async def scenario():
+            results = schedule([f"http://h/{n}" for n in range(5)], worker, limit=3)
+            first = await results.__anext__()
+            await results.aclose()
+            return first
+
+        assert _run(scenario()) == "http://h/0"
+        assert len(cancelled) >= 2
@@ -7,12 +7,17 @@ parsing paths. No mocking of the filesystem.
 
 from __future__ import annotations
 
+import functools
+import io
 import json
 from pathlib import Path
+from typing import List, Optional
 
 import pytest
 
-from data_client import ApiRoute, DeveloperDocsDataClient
+import data_client
+from data_client import ApiRoute, DeveloperDocsDataClient, iter_json_object
+from indexing_logger import IndexingLogger, create_logger
 
 
 @pytest.fixture
@@ -20,27 +25,120 @@ def client(fake_repo: Path) -> DeveloperDocsDataClient:
     return DeveloperDocsDataClient(repo_root=str(fake_repo))
 
 
+def simplify_schema(schema: dict, max_depth: int = 2, depth: int = 0) -> dict:
+    """Eager reference for the lazy schema simplification in _render_schema_text."""
+    if depth >= max_depth:
+        return {"type": schema.get("type", "object"), "description": schema.get("description", "...")}
+
+    result = {}
+    for key in ("type", "description", "required", "enum"):
+        if key in schema:
+            result[key] = schema[key]
+
+    if "properties" in schema:
+        result["properties"] = {
+            name: simplify_schema(prop, max_depth, depth + 1)
+            for name, prop in schema["properties"].items()
+        }
+
+    if "items" in schema and isinstance(schema["items"], dict):
+        result["items"] = simplify_schema(schema["items"], max_depth, depth + 1)
+
+    if "allOf" in schema:
+        merged = {}
+        for sub in schema["allOf"]:
+            if isinstance(sub, dict):
+                merged.update(simplify_schema(sub, max_depth, depth))
+        return merged
+
+    return result
+
+
+def spy(monkeypatch: pytest.MonkeyPatch, client: DeveloperDocsDataClient, name: str) -> list:
+    """Record the arguments of every call to client.<name>; returns the call list."""
+    calls = []
+    original = getattr(client, name)
+
+    @functools.wraps(original)
+    def recording(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(client, name, recording)
+    return calls
+
+
+class TestIterJsonObject:
+    """iter_json_object decodes a top-level object incrementally."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+    def test_matches_json_loads(self, fake_repo: Path, chunk_size: int) -> None:
+        path = fake_repo / "build" / "mcp" / "docs.json"
+        items = list(iter_json_object(path, chunk_size=chunk_size))
+        assert items == list(json.loads(path.read_text()).items())
+
+    def test_handles_scalars_and_compact_input(self, tmp_path: Path) -> None:
+        path = tmp_path / "x.json"
+        path.write_text('{"a":12345,"b":true,"c":null,"d":"\\u00e9 \\"q\\"","e":[1,{"f":2.5}]}')
+        assert dict(iter_json_object(path, chunk_size=2)) == json.loads(path.read_text())
+
+    def test_empty_object(self, tmp_path: Path) -> None:
+        path = tmp_path / "x.json"
+        path.write_text(" { } ")
+        assert list(iter_json_object(path)) == []
+
+    @pytest.mark.parametrize("chunk_size", range(1, 9))
+    def test_numbers_split_at_any_offset(self, tmp_path: Path, chunk_size: int) -> None:
+        numbers = ["1.5", "-0.25", "-7", "1e5", "2.5E-3", "-1.0e+10", "123456789", "0"]
+        body = '{"a": %s, "b": [%s], "c": %s}'
+        path = tmp_path / "x.json"
+        for number in numbers:
+            # Leading padding moves every chunk boundary across the number.
+            for padding in range(chunk_size + len(number)):
+                text = " " * padding + body % (number, number, number)
+                path.write_text(text)
+                assert dict(iter_json_object(path, chunk_size=chunk_size)) == json.loads(text), text
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 4096])
+    @pytest.mark.parametrize("text", ['{"a": 1} x', "{} {}", '{"a": 1}}'])
+    def test_raises_on_trailing_data(self, tmp_path: Path, chunk_size: int, text: str) -> None:
+        path = tmp_path / "x.json"
+        path.write_text(text)
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_json_object(path, chunk_size=chunk_size))
+
+    @pytest.mark.parametrize("text", ["", "[]", '{"a": 1', '{"a" 1}', '{"a": 1,}', '{"a": 1.}', '{"a": -}'])
+    def test_raises_on_malformed(self, tmp_path: Path, text: str) -> None:
+        path = tmp_path / "x.json"
+        path.write_text(text)
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_json_object(path, chunk_size=3))
+
+
 class TestSimplifySchema:
-    """_simplify_schema flattens deeply-nested JSON Schema into a small dict."""
+    """_render_schema_text flattens deeply-nested JSON Schema into a small dict."""
 
-    def test_keeps_basic_keys(self) -> None:
+    @staticmethod
+    def _simplify(schema: dict, max_depth: int = 2) -> dict:
         c = DeveloperDocsDataClient()
-        out = c._simplify_schema(
+        c.SCHEMA_MAX_DEPTH = max_depth
+        return json.loads(c._render_schema_text(schema))
+
+    def test_keeps_basic_keys(self) -> None:
+        out = self._simplify(
             {"type": "string", "description": "foo", "enum": ["A", "B"]}
         )
         assert out == {"type": "string", "description": "foo", "enum": ["A", "B"]}
 
     def test_drops_unknown_keys(self) -> None:
-        c = DeveloperDocsDataClient()
-        out = c._simplify_schema(
+        out = self._simplify(
             {"type": "string", "x-internal": "secret", "$id": "#/foo"}
         )
         assert "x-internal" not in out
         assert "$id" not in out
 
     def test_recurses_into_properties(self) -> None:
-        c = DeveloperDocsDataClient()
-        out = c._simplify_schema(
+        out = self._simplify(
             {
                 "type": "object",
                 "properties": {
@@ -53,16 +151,14 @@ class TestSimplifySchema:
         assert out["properties"]["age"] == {"type": "integer", "description": "a"}
 
     def test_recurses_into_items(self) -> None:
-        c = DeveloperDocsDataClient()
-        out = c._simplify_schema(
+        out = self._simplify(
             {"type": "array", "items": {"type": "string", "description": "s"}}
         )
         assert out["items"] == {"type": "string", "description": "s"}
 
     def test_truncates_at_max_depth(self) -> None:
         # max_depth=2: nodes at depth 2 should be collapsed to a stub.
-        c = DeveloperDocsDataClient()
-        out = c._simplify_schema(
+        out = self._simplify(
             {
                 "type": "object",
                 "properties": {
@@ -87,8 +183,7 @@ class TestSimplifySchema:
         assert inner == {"type": "object", "description": "deeply nested"}
 
     def test_merges_allof(self) -> None:
-        c = DeveloperDocsDataClient()
-        out = c._simplify_schema(
+        out = self._simplify(
             {
                 "description": "wrapper",
                 "allOf": [
@@ -106,6 +201,64 @@ class TestSimplifySchema:
         assert "name" in out["properties"]
 
 
+class TestRenderSchemaText:
+    """_render_schema_text matches json.dumps(simplify_schema(...)) and stops at the budget."""
+
+    @staticmethod
+    def _reference(c: DeveloperDocsDataClient, schema: dict) -> str:
+        text = json.dumps(simplify_schema(schema, c.SCHEMA_MAX_DEPTH), indent=2)
+        if len(text) > c.MAX_SCHEMA_CHARS:
+            text = text[:c.MAX_SCHEMA_CHARS] + "\n... (truncated)"
+        return text
+
+    @pytest.mark.parametrize(
+        "schema",
+        [
+            {},
+            {"type": "object", "properties": {}},
+            {"type": "array", "items": {"type": "string", "enum": ["A", "\u00e9"]}},
+            {"enum": [1, 2.5, True, None, {"a": []}], "required": []},
+            {
+                "description": "wrapper",
+                "allOf": [
+                    {"type": "object", "properties": {"a": {"type": "string"}}},
+                    {"description": "second", "allOf": [{"type": "string", "required": ["b"]}]},
+                    "not-a-dict",
+                ],
+            },
+            {
+                "type": "object",
+                "properties": {
+                    "outer": {
+                        "type": "object",
+                        "properties": {"inner": {"type": "object", "properties": {"leaf": {}}}},
+                    }
+                },
+            },
+        ],
+    )
+    def test_matches_reference(self, schema: dict) -> None:
+        c = DeveloperDocsDataClient()
+        assert c._render_schema_text(schema) == self._reference(c, schema)
+
+    def test_matches_reference_when_truncated(self) -> None:
+        c = DeveloperDocsDataClient()
+        schema = {
+            "type": "object",
+            "properties": {f"p{i}": {"type": "string", "description": "x" * 200} for i in range(500)},
+        }
+        assert c._render_schema_text(schema) == self._reference(c, schema)
+
+    def test_stops_walking_at_budget(self) -> None:
+        # Properties past the budget are never simplified; the non-dict entry
+        # at the end would raise if it were.
+        c = DeveloperDocsDataClient()
+        properties = {f"p{i}": {"type": "string", "description": "x" * 200} for i in range(500)}
+        properties["unreachable"] = None
+        text = c._render_schema_text({"type": "object", "properties": properties})
+        assert text.endswith("... (truncated)")
+
+
 class TestLoadRequestSchema:
     """_load_request_schema reads <slug>.RequestSchema.json from schema_dir."""
 
@@ -216,6 +369,40 @@ class TestLoadStatusCodes:
         assert "id" in body
 
 
+class TestSchemaMemoization:
+    """Schema files are rendered once per distinct content."""
+
+    def test_identical_files_rendered_once(
+        self, client: DeveloperDocsDataClient, fake_repo: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        src = fake_repo / "docs" / "api" / "client-api" / "activity" / "feedback.RequestSchema.json"
+        (src.parent / "copy.RequestSchema.json").write_bytes(src.read_bytes())
+
+        calls = spy(monkeypatch, client, "_render_request_schema")
+        first = client._load_request_schema(ApiRoute(api="client-api", group="activity", slug="feedback"))
+        assert len(calls) == 1
+        second = client._load_request_schema(ApiRoute(api="client-api", group="activity", slug="copy"))
+        assert second == first
+        assert len(calls) == 1
+
+    def test_changed_file_is_rendered_again(
+        self, client: DeveloperDocsDataClient, fake_repo: Path
+    ) -> None:
+        route = ApiRoute(api="client-api", group="activity", slug="feedback")
+        before = client._load_request_schema(route)
+        path = fake_repo / "docs" / "api" / "client-api" / "activity" / "feedback.RequestSchema.json"
+        path.write_text(json.dumps({"body": {"content": {"application/json": {"schema": {"type": "string"}}}}}))
+        after = client._load_request_schema(route)
+        assert after != before
+        assert json.loads(after) == {"type": "string"}
+
+    def test_status_code_lists_are_not_shared(self, client: DeveloperDocsDataClient) -> None:
+        route = ApiRoute(api="client-api", group="activity", slug="feedback")
+        codes, _ = client._load_status_codes(route)
+        codes.append("mutated")
+        assert "mutated" not in client._load_status_codes(route)[0]
+
+
 class TestLoadParams:
     def test_separates_query_and_path_params(self, client: DeveloperDocsDataClient) -> None:
         route = ApiRoute(api="client-api", group="activity", slug="feedback")
@@ -415,6 +602,36 @@ class TestGetSourceData:
         )
         assert overview["page_type"] == "info_page"
 
+    def test_iter_source_data_yields_same_pages(self, client: DeveloperDocsDataClient) -> None:
+        assert list(client.iter_source_data()) == client.get_source_data()
+
+    def test_worker_pool_matches_serial_order(self, fake_repo: Path) -> None:
+        serial = DeveloperDocsDataClient(repo_root=str(fake_repo)).get_source_data()
+        parallel = DeveloperDocsDataClient(repo_root=str(fake_repo), workers=2).get_source_data()
+        assert parallel == serial
+
+    def test_worker_pool_spawns_alongside_a_logging_thread(
+        self, fake_repo: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        start_methods = []
+        pool_class = data_client.ProcessPoolExecutor
+
+        def recording_pool(*args, **kwargs):
+            start_methods.append(kwargs["mp_context"].get_start_method())
+            return pool_class(*args, **kwargs)
+
+        monkeypatch.setattr(data_client, "ProcessPoolExecutor", recording_pool)
+        serial = DeveloperDocsDataClient(repo_root=str(fake_repo)).get_source_data()
+        indexing_logger = create_logger(stream=io.StringIO(), background=True)
+        try:
+            parallel = DeveloperDocsDataClient(
+                repo_root=str(fake_repo), workers=2, indexing_logger=indexing_logger
+            ).get_source_data()
+        finally:
+            indexing_logger.close()
+        assert start_methods == ["spawn"]
+        assert parallel == serial
+
     def test_raises_when_docs_json_missing(self, empty_repo: Path) -> None:
         c = DeveloperDocsDataClient(repo_root=str(empty_repo))
         with pytest.raises(RuntimeError, match="docs.json not found"):
@@ -437,3 +654,41 @@ class TestGetSourceData:
         )
         assert au["created_at"] is None
         assert au["updated_at"] is None
+
+
+class _QuietWriter:
+    def __init__(self) -> None:
+        self.durations: List[Optional[float]] = []
+
+    def write_line(self, message, level=None) -> None:
+        pass
+
+    def write_document(self, entry) -> None:
+        self.durations.append(entry.duration_ms)
+
+    def write_summary(self, summary) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class TestStageTimings:
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_records_build_stages(self, fake_repo: Path, workers: int) -> None:
+        writer = _QuietWriter()
+        indexing_logger = IndexingLogger(writer=writer)
+        client = DeveloperDocsDataClient(repo_root=str(fake_repo), indexing_logger=indexing_logger, workers=workers)
+
+        client.get_source_data()
+        timings = indexing_logger.finish().stage_timings
+
+        assert timings["parse_docs_json"].count == 4
+        assert timings["build_page"].count == 4
+        # Schemas are loaded for the two API reference pages, in workers or not.
+        assert timings["load_schemas"].count == 2
+        assert all(d is not None and d > 0 for d in writer.durations)
+
@@ -0,0 +1,447 @@
+"""Tests for the live-site crawler, with Playwright replaced by in-process fakes.
+
+The crawler's dependencies (aiohttp, trafilatura, bs4, playwright) are not part
+of the indexing project's requirements, so these tests skip without them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional
+
+import pytest
+
+pytest.importorskip("aiohttp")
+pytest.importorskip("trafilatura")
+pytest.importorskip("playwright")
+
+from aiohttp import web  # noqa: E402
+
+import data_clients  # noqa: E402
+from data_clients import DeveloperDocsDataClient, ParsedHtml  # noqa: E402
+
+API_PAGE_HTML = """
+<html><body>
+<h1>{title}</h1>
+<ul class="breadcrumbs">
+  <li><span class="breadcrumbs__link">API</span></li>
+  <li><span class="breadcrumbs__link">Activity</span></li>
+</ul>
+<pre class="openapi__method-endpoint">
+  <span class="badge">post</span>
+  <h2 class="openapi__method-endpoint-path">https://example.glean.com/rest/api/v1/{slug}</h2>
+</pre>
+</body></html>
+"""
+
+
+INFO_PAGE_HTML = """
+<html><body><nav>Docs menu</nav>
+<article><h1>Getting <em>Started</em></h1>
+<p>Use the indexing API to push documents from any source into Glean so they can be searched.</p>
+<p>Each document needs an id, a datasource, a view URL and a body; permissions control who sees it.</p>
+</article></body></html>
+"""
+
+
+class TestParsedHtml:
+    def test_classifies_api_reference_pages(self) -> None:
+        assert ParsedHtml(API_PAGE_HTML.format(title="x", slug="x")).is_api_reference
+
+    def test_marker_outside_endpoint_block_is_not_api_reference(self) -> None:
+        html = "<html><body><p>The openapi__method-endpoint class marks endpoints.</p></body></html>"
+        assert not ParsedHtml(html).is_api_reference
+
+    def test_info_page_without_marker_is_not_parsed_for_classification(self) -> None:
+        parsed = ParsedHtml(INFO_PAGE_HTML)
+        assert not parsed.is_api_reference
+        assert parsed._tree is None
+
+    def test_extracts_title_and_content_from_one_parse(self) -> None:
+        page, error = ParsedHtml(INFO_PAGE_HTML).extract_documentation_page(
+            "https://developers.glean.com/get-started"
+        )
+        assert error is None
+        assert page["title"] == "Getting Started"
+        assert "indexing API" in page["content"]
+        assert page["page_type"] == "info_page"
+
+    def test_title_falls_back_to_url(self) -> None:
+        html = INFO_PAGE_HTML.replace("<h1>Getting <em>Started</em></h1>", "")
+        page, _ = ParsedHtml(html).extract_documentation_page("https://developers.glean.com/get-started_now")
+        assert page["title"] == "Get Started Now"
+
+    def test_empty_page_reports_error(self) -> None:
+        assert ParsedHtml("   ").extract_documentation_page("https://x") == (None, "No content extracted")
+
+
+class FakePage:
+    def __init__(self, browser: "FakeBrowser") -> None:
+        self.browser = browser
+        self.url = ""
+        self.closed = False
+
+    def on(self, event: str, handler) -> None:
+        pass
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    async def close(self) -> None:
+        self.closed = True
+
+    async def goto(self, url: str, **kwargs) -> None:
+        self.url = url
+        await asyncio.sleep(self.browser.delays.get(url, 0))
+
+    async def wait_for_selector(self, selector: str, **kwargs) -> None:
+        self.browser.waits.append((selector, kwargs.get("timeout")))
+        if selector in self.browser.missing:
+            raise data_clients.PlaywrightTimeoutError(f"Timeout waiting for {selector}")
+
+    async def content(self) -> str:
+        slug = self.url.rsplit("/", 1)[-1]
+        self.browser.scraped.append(self.url)
+        return API_PAGE_HTML.format(title=slug.title(), slug=slug)
+
+    async def evaluate(self, script: str, arg=None) -> Dict[str, str]:
+        self.browser.evaluated.append(arg)
+        return {"curl": f"curl {self.url}"}
+
+
+class FakeContext:
+    def __init__(self, browser: "FakeBrowser") -> None:
+        self.browser = browser
+
+    async def new_page(self) -> FakePage:
+        return FakePage(self.browser)
+
+    async def close(self) -> None:
+        pass
+
+
+class FakeBrowser:
+    def __init__(self, delays: Dict[str, float]) -> None:
+        self.delays = delays
+        self.scraped: List[str] = []
+        # (selector, timeout) of every wait_for_selector; selectors in `missing` time out.
+        self.waits: List[tuple] = []
+        self.missing: set = set()
+        self.evaluated: List[dict] = []
+        self.closed = False
+
+    async def new_context(self, **kwargs) -> FakeContext:
+        return FakeContext(self)
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def browser(monkeypatch: pytest.MonkeyPatch) -> FakeBrowser:
+    fake = FakeBrowser(delays={})
+
+    class FakePlaywright:
+        async def __aenter__(self):
+            async def launch(**kwargs):
+                return fake
+
+            return SimpleNamespace(chromium=SimpleNamespace(launch=launch))
+
+        async def __aexit__(self, *exc_info):
+            return False
+
+    monkeypatch.setattr(data_clients, "async_playwright", FakePlaywright)
+    return fake
+
+
+def _urls(n: int) -> List[str]:
+    return [f"https://developers.glean.com/api/client-api/activity/endpoint-{i}" for i in range(n)]
+
+
+class TestApiReferenceStreaming:
+    def test_yields_in_completion_order(self, browser: FakeBrowser) -> None:
+        urls = _urls(3)
+        browser.delays = {urls[0]: 0.2}
+
+        async def collect():
+            client = DeveloperDocsDataClient("https://developers.glean.com", api_concurrency=3)
+            return [page["url"] async for page in client.get_api_reference_page_data(urls)]
+
+        seen = asyncio.run(collect())
+        assert seen[-1] == urls[0]
+        assert sorted(seen) == sorted(urls)
+        assert browser.closed
+
+    def test_parses_scraped_page(self, browser: FakeBrowser) -> None:
+        async def first():
+            client = DeveloperDocsDataClient("https://developers.glean.com")
+            async for page in client.get_api_reference_page_data(_urls(1)):
+                return page
+
+        page = asyncio.run(first())
+        assert (page["method"], page["endpoint"], page["tag"]) == ("post", "/rest/api/v1/endpoint-0", "activity")
+        assert page["curl_code_sample"].startswith("curl ")
+
+    def test_optional_code_sample_wait_uses_the_short_timeout(self, browser: FakeBrowser) -> None:
+        browser.missing = {data_clients.CODE_LINE_SELECTOR}
+
+        async def first():
+            client = DeveloperDocsDataClient(
+                "https://developers.glean.com", render_timeout_ms=15000, code_sample_timeout_ms=800
+            )
+            async for page in client.get_api_reference_page_data(_urls(1)):
+                return page
+
+        page = asyncio.run(first())
+        assert page["endpoint"] == "/rest/api/v1/endpoint-0"
+        assert browser.waits == [
+            (data_clients.HYDRATED_SELECTOR, 15000),
+            (data_clients.CODE_LINE_SELECTOR, 800),
+        ]
+        # Each language tab gets the same short bound.
+        assert browser.evaluated[0]["timeoutMs"] == 800
+
+    def test_buffer_bounds_scraping_ahead_of_the_consumer(self, browser: FakeBrowser) -> None:
+        async def take_one():
+            client = DeveloperDocsDataClient(
+                "https://developers.glean.com", api_concurrency=2, api_result_buffer=2
+            )
+            stream = client.get_api_reference_page_data(_urls(50))
+            await stream.__anext__()
+            await asyncio.sleep(0.05)
+            scraped = len(browser.scraped)
+            await stream.aclose()
+            return scraped
+
+        scraped = asyncio.run(take_one())
+        # One yielded, two buffered, one blocked on put per worker.
+        assert scraped <= 1 + 2 + 2
+        assert browser.closed
+
+
+def _info_html(i: int) -> str:
+    return INFO_PAGE_HTML.replace("Getting <em>Started</em>", f"Guide {i}")
+
+
+@asynccontextmanager
+async def serve(
+    pages: Dict[str, str],
+    lastmods: Optional[Dict[str, str]] = None,
+    hits: Optional[List[str]] = None,
+    peers: Optional[set] = None,
+    sitemap_index: bool = False,
+) -> AsyncIterator[str]:
+    """Serve {path: html} plus a sitemap.xml listing every path; yields the base URL.
+
+    Pages carry an ETag and answer If-None-Match with 304; requested page paths
+    are appended to `hits`; client (host, port) pairs of every request, sitemap
+    included, are added to `peers`. With `sitemap_index`, /sitemap.xml is an
+    index of one gzipped child sitemap per page.
+    """
+    base: List[str] = []
+    lastmods = lastmods or {}
+
+    @web.middleware
+    async def track_peer(request: web.Request, handler):
+        if peers is not None:
+            peers.add(request.transport.get_extra_info("peername"))
+        return await handler(request)
+
+    async def sitemap(request: web.Request) -> web.Response:
+        entries = []
+        for path in pages:
+            lastmod = f"<lastmod>{lastmods[path]}</lastmod>" if path in lastmods else ""
+            entries.append(f"<url><loc>{base[0]}{path}</loc>{lastmod}</url>")
+        xml = f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{"".join(entries)}</urlset>'
+        return web.Response(text=xml, content_type="application/xml")
+
+    async def sitemap_index_root(request: web.Request) -> web.Response:
+        children = "".join(f"<sitemap><loc>{base[0]}/sitemaps/{i}.xml.gz</loc></sitemap>" for i in range(len(pages)))
+        xml = f'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{children}</sitemapindex>'
+        return web.Response(text=xml, content_type="application/xml")
+
+    async def child_sitemap(request: web.Request) -> web.Response:
+        path = list(pages)[int(request.match_info["n"])]
+        xml = f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"><url><loc>{base[0]}{path}</loc></url></urlset>'
+        return web.Response(body=gzip.compress(xml.encode()), content_type="application/gzip")
+
+    async def page(request: web.Request) -> web.Response:
+        html = pages.get(request.path)
+        if html is None:
+            raise web.HTTPNotFound()
+        if hits is not None:
+            hits.append(request.path)
+        etag = f'"{hashlib.sha256(html.encode()).hexdigest()[:16]}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(text=html, content_type="text/html", headers={"ETag": etag})
+
+    app = web.Application(middlewares=[track_peer])
+    runner = web.AppRunner(app)
+    app.router.add_get("/sitemap.xml", sitemap_index_root if sitemap_index else sitemap)
+    app.router.add_get("/sitemaps/{n}.xml.gz", child_sitemap)
+    app.router.add_get("/{tail:.*}", page)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    base.append(f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}")
+    try:
+        yield base[0]
+    finally:
+        await runner.cleanup()
+
+
+class TestOffloadedExtraction:
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_documentation_pages(self, executor: str) -> None:
+        pages = {f"/guides/guide-{i}": _info_html(i) for i in range(12)}
+
+        async def crawl():
+            async with serve(pages) as base:
+                client = DeveloperDocsDataClient(base, extract_executor=executor, extract_workers=2)
+                urls = [base + path for path in pages]
+                return [page async for page in client.get_documentation_page_data(urls)]
+
+        crawled = asyncio.run(crawl())
+        assert sorted(p["title"] for p in crawled) == sorted(f"Guide {i}" for i in range(12))
+
+    def test_source_data_routes_api_pages_to_the_browser(self, browser: FakeBrowser) -> None:
+        pages = {"/guides/intro": _info_html(0)}
+        pages["/api/client-api/activity/feedback"] = API_PAGE_HTML.format(title="Feedback", slug="feedback")
+
+        async def crawl():
+            async with serve(pages) as base:
+                client = DeveloperDocsDataClient(base)
+                return [page async for page in client.get_source_data()]
+
+        crawled = asyncio.run(crawl())
+        assert sorted(p["page_type"] for p in crawled) == ["api_reference", "info_page"]
+        assert browser.scraped[0].endswith("/api/client-api/activity/feedback")
+
+    def test_source_data_follows_gzipped_sitemap_index(self) -> None:
+        pages = {f"/guides/guide-{i}": _info_html(i) for i in range(5)}
+
+        async def crawl():
+            async with serve(pages, sitemap_index=True) as base:
+                client = DeveloperDocsDataClient(base, sitemap_concurrency=2)
+                return [page async for page in client.get_source_data()]
+
+        crawled = asyncio.run(crawl())
+        assert sorted(p["title"] for p in crawled) == [f"Guide {i}" for i in range(5)]
+
+    def test_rejects_unknown_executor(self) -> None:
+        async def crawl():
+            client = DeveloperDocsDataClient("http://127.0.0.1:9", extract_executor="fiber")
+            return [page async for page in client.get_documentation_page_data(["http://127.0.0.1:9/x"])]
+
+        with pytest.raises(ValueError, match="fiber"):
+            asyncio.run(crawl())
+
+
+class TestCrawlCache:
+    def _crawl_twice(self, pages, lastmods, cache_path: Path, between) -> tuple:
+        """Crawl, call between() to edit the site, then crawl again; returns (first, second, hits)."""
+        hits: List[str] = []
+
+        async def crawl():
+            async with serve(pages, lastmods=lastmods, hits=hits) as base:
+                results = []
+                for run in range(2):
+                    if run:
+                        between()
+                        hits.clear()
+                    client = DeveloperDocsDataClient(base, crawl_cache_path=str(cache_path))
+                    results.append([page async for page in client.get_source_data()])
+                return results
+
+        first, second = asyncio.run(crawl())
+        return first, second, hits
+
+    def _site(self) -> Dict[str, str]:
+        pages = {f"/guides/guide-{i}": _info_html(i) for i in range(3)}
+        pages["/api/client-api/activity/feedback"] = API_PAGE_HTML.format(title="Feedback", slug="feedback")
+        return pages
+
+    def test_unchanged_lastmod_skips_requests(self, browser: FakeBrowser, tmp_path: Path) -> None:
+        pages = self._site()
+        lastmods = {path: "2026-01-01" for path in pages}
+
+        def edit():
+            lastmods["/guides/guide-0"] = "2026-02-01"
+
+        first, second, hits = self._crawl_twice(pages, lastmods, tmp_path / "crawl.json", edit)
+
+        assert hits == ["/guides/guide-0"]
+        assert len(browser.scraped) == 1
+        assert sorted(p["url"] for p in second) == sorted(p["url"] for p in first)
+
+    def test_not_modified_reuses_cached_pages(self, browser: FakeBrowser, tmp_path: Path) -> None:
+        pages = self._site()
+
+        def edit():
+            pages["/guides/guide-1"] = _info_html(99)
+
+        first, second, hits = self._crawl_twice(pages, {}, tmp_path / "crawl.json", edit)
+
+        assert len(hits) == len(pages)
+        titles = sorted(p["title"] for p in second if p["page_type"] == "info_page")
+        assert titles == ["Guide 0", "Guide 2", "Guide 99"]
+        # The API page answered 304, so it wasn't scraped again.
+        assert len(browser.scraped) == 1
+        assert [p for p in second if p["page_type"] == "api_reference"] == [
+            p for p in first if p["page_type"] == "api_reference"
+        ]
+
+
+class TestSharedSession:
+    def test_crawl_reuses_connections_and_closes_session(self, browser: FakeBrowser) -> None:
+        pages = {f"/guides/guide-{i}": _info_html(i) for i in range(6)}
+        sessions = []
+        peers: set = set()
+
+        async def crawl():
+            async with serve(pages, peers=peers) as base:
+                client = DeveloperDocsDataClient(base, crawl_concurrency=2)
+                crawled = []
+                async for page in client.get_source_data():
+                    sessions.append(client._session)
+                    crawled.append(page)
+                return client, crawled
+
+        client, crawled = asyncio.run(crawl())
+        assert len(crawled) == 6
+        assert len({id(s) for s in sessions}) == 1
+        # The sitemap and six page fetches ran over at most crawl_concurrency connections.
+        assert len(peers) <= 2
+        assert sessions[0].closed
+        assert client._session is None
+
+    def test_session_leaves_encoding_negotiation_to_aiohttp(self) -> None:
+        async def headers():
+            async with DeveloperDocsDataClient("https://developers.glean.com").http_session() as session:
+                return session.headers
+
+        # aiohttp then sends its own Accept-Encoding, including br when brotli is installed.
+        assert "Accept-Encoding" not in asyncio.run(headers())
+
+    def test_context_manager_keeps_session_across_calls(self) -> None:
+        pages = {"/guides/intro": _info_html(0)}
+
+        async def crawl():
+            async with serve(pages) as base:
+                async with DeveloperDocsDataClient(base) as client:
+                    first = await client._get_all_sitemap_urls(f"{base}/sitemap.xml")
+                    session = client._session
+                    second = [p async for p in client.get_documentation_page_data(first)]
+                    assert client._session is session and not session.closed
+                return session, second
+
+        session, second = asyncio.run(crawl())
+        assert session.closed
+        assert [p["title"] for p in second] == ["Guide 0"]
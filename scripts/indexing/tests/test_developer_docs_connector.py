@@ -0,0 +1,268 @@
+"""Tests for the connector's upload paths, with the Glean client replaced by a recorder."""
+
+from __future__ import annotations
+
+import contextlib
+import io
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List, Optional
+
+import httpx
+import pytest
+
+import developer_docs_connector
+import document_uploader
+from data_client import DeveloperDocsDataClient
+from developer_docs_connector import DeveloperDocsConnector
+from document_uploader import DeferredDocument, estimated_request_bytes
+from glean.indexing.models import ConnectorOptions, IndexingMode
+from indexing_logger import IndexingLogger, StdoutLogWriter
+from indexing_manifest import IndexingManifest, content_hash
+from rate_limiter import RequestScheduler
+
+
+class _Recorder:
+    """Stands in for client.indexing.documents; notes how many bodies were built at each request.
+
+    Deletions are recorded as (id, object_type). The index call numbered
+    `fail_index_call` (1-based) raises instead of being recorded.
+    """
+
+    def __init__(self, connector: DeveloperDocsConnector) -> None:
+        self.built = 0
+        self.requests: List[tuple] = []
+        self.indexed_ids: List[str] = []
+        self.deleted: List[tuple] = []
+        self.bulk_uploads = 0
+        self.fail_index_call: Optional[int] = None
+        # Raised, one per call, by the next bulk_index calls.
+        self.bulk_errors: List[Exception] = []
+        transform_page = connector.transform_page
+
+        def counting_transform(page):
+            self.built += 1
+            return transform_page(page)
+
+        connector.transform_page = counting_transform
+
+    def bulk_index(self, documents, **kwargs) -> None:
+        if self.bulk_errors:
+            raise self.bulk_errors.pop(0)
+        self.bulk_uploads += 1
+        self.requests.append((len(documents), self.built))
+
+    def index(self, documents, **kwargs) -> None:
+        if self.fail_index_call == len(self.requests) + 1:
+            raise ValueError("index request rejected")
+        self.requests.append((len(documents), self.built))
+        self.indexed_ids.extend(document.id for document in documents)
+
+    def delete(self, datasource: str, object_type: str, id: str) -> None:
+        self.deleted.append((id, object_type))
+
+
+@pytest.fixture
+def connector(fake_repo: Path, tmp_path: Path) -> DeveloperDocsConnector:
+    return DeveloperDocsConnector(
+        name="devdocs",
+        data_client=DeveloperDocsDataClient(repo_root=str(fake_repo)),
+        manifest=IndexingManifest(tmp_path / "manifest.json"),
+    )
+
+
+@pytest.fixture
+def recorder(connector: DeveloperDocsConnector, monkeypatch: pytest.MonkeyPatch) -> _Recorder:
+    documents = _Recorder(connector)
+    client = SimpleNamespace(indexing=SimpleNamespace(documents=documents))
+
+    @contextlib.contextmanager
+    def fake_api_client():
+        yield client
+
+    monkeypatch.setattr(document_uploader, "api_client", fake_api_client)
+    monkeypatch.setattr(developer_docs_connector, "api_client", fake_api_client)
+    return documents
+
+
+class TestDeferPage:
+    def test_builds_the_transformed_document(self, connector: DeveloperDocsConnector) -> None:
+        for page in connector.get_data():
+            deferred = connector.defer_page(page)
+            assert deferred.id == page["id"]
+            assert deferred.build() == connector.transform_page(page)
+
+    def test_estimate_tracks_built_size(self, connector: DeveloperDocsConnector) -> None:
+        for page in connector.get_data():
+            actual = estimated_request_bytes(connector.transform_page(page))
+            assert actual <= connector.defer_page(page).estimated_bytes <= actual * 1.1
+
+    def test_builds_once_and_releases_the_page(self, connector: DeveloperDocsConnector) -> None:
+        deferred = connector.defer_page(connector.get_data()[0])
+        deferred.build()
+        assert deferred._build is None
+        with pytest.raises(RuntimeError, match="already built"):
+            deferred.build()
+
+    def test_unknown_page_type_is_skipped(self, connector: DeveloperDocsConnector) -> None:
+        page = dict(connector.get_data()[0], page_type="changelog")
+        assert connector.defer_page(page) is None
+
+    def test_uploader_accepts_deferred_documents(self) -> None:
+        deferred = DeferredDocument("doc-1", "infoPage", build=lambda: None, estimated_bytes=1234)
+        assert estimated_request_bytes(deferred) == 1234
+
+
+class TestBodiesBuiltPerPage:
+    def test_full_upload_builds_each_page_as_it_is_sent(
+        self, connector: DeveloperDocsConnector, recorder: _Recorder
+    ) -> None:
+        connector.batch_size = 1
+        connector.index_data(mode=IndexingMode.FULL)
+
+        # Request n goes out with exactly n bodies built so far.
+        assert recorder.requests == [(1, n) for n in range(1, 5)]
+        assert len(connector.manifest.entries) == 4
+
+    def test_pipelined_upload_builds_each_page_as_it_is_sent(
+        self, connector: DeveloperDocsConnector, recorder: _Recorder
+    ) -> None:
+        connector.batch_size = 1
+        connector.pipeline_depth = 3
+        connector.index_data(mode=IndexingMode.FULL)
+        assert recorder.requests == [(1, n) for n in range(1, 5)]
+
+    def test_incremental_upload_builds_each_batch_as_it_is_sent(
+        self, connector: DeveloperDocsConnector, recorder: _Recorder
+    ) -> None:
+        connector.manifest.save()  # An empty manifest makes every page new.
+        connector.batch_size = 2
+        connector.index_data(mode=IndexingMode.INCREMENTAL)
+        assert recorder.requests == [(2, 2), (2, 4)]
+        assert len(connector.manifest.entries) == 4
+
+
+def _seed_manifest(connector: DeveloperDocsConnector, extra: int = 0) -> List[str]:
+    """Write a manifest matching the current pages plus `extra` documents that no longer exist."""
+    for page in connector.get_data():
+        object_type = developer_docs_connector.OBJECT_TYPES[page["page_type"]]
+        connector.manifest.record(page["id"], content_hash(page), object_type)
+    gone = [f"gone-{i}" for i in range(extra)]
+    for doc_id in gone:
+        connector.manifest.record(doc_id, "stale-hash", "infoPage")
+    connector.manifest.save()
+    return gone
+
+
+def _saved_ids(connector: DeveloperDocsConnector) -> set:
+    manifest = IndexingManifest(connector.manifest.path)
+    assert manifest.load()
+    return set(manifest.entries)
+
+
+class TestIncrementalIndexing:
+    def test_deletes_vanished_documents(self, connector: DeveloperDocsConnector, recorder: _Recorder) -> None:
+        # 1 of 5 indexed documents is exactly the delete limit.
+        gone = _seed_manifest(connector, extra=1)
+        connector.index_data(mode=IndexingMode.INCREMENTAL)
+
+        assert recorder.deleted == [(gone[0], "infoPage")]
+        assert recorder.requests == []
+        assert _saved_ids(connector) == {page["id"] for page in connector.get_data()}
+
+    def test_uploads_only_changed_documents(self, connector: DeveloperDocsConnector, recorder: _Recorder) -> None:
+        _seed_manifest(connector)
+        changed = connector.get_data()[0]["id"]
+        connector.manifest.record(changed, "old-hash", "infoPage")
+        connector.manifest.save()
+        connector.index_data(mode=IndexingMode.INCREMENTAL)
+        assert recorder.indexed_ids == [changed]
+        assert recorder.deleted == []
+
+    def test_reports_what_the_run_did(self, connector: DeveloperDocsConnector, recorder: _Recorder) -> None:
+        stream = io.StringIO()
+        connector.indexing_logger = IndexingLogger(writer=StdoutLogWriter(stream=stream))
+        _seed_manifest(connector, extra=1)
+        changed = connector.get_data()[0]["id"]
+        connector.manifest.record(changed, "old-hash", "infoPage")
+        connector.manifest.save()
+
+        connector.index_data(mode=IndexingMode.INCREMENTAL)
+
+        output = stream.getvalue()
+        assert "Incremental run: 0 new, 1 changed, 3 unchanged, 1 to delete" in output
+        assert "Uploaded 1 of 1 and deleted 1 of 1 documents; wrote manifest with 4 entries" in output
+
+    def test_refusal_is_reported_to_the_run_log(
+        self, connector: DeveloperDocsConnector, recorder: _Recorder
+    ) -> None:
+        stream = io.StringIO()
+        connector.indexing_logger = IndexingLogger(writer=StdoutLogWriter(stream=stream))
+        _seed_manifest(connector, extra=2)
+        with pytest.raises(RuntimeError):
+            connector.index_data(mode=IndexingMode.INCREMENTAL)
+        assert "would delete 2 of 6 documents; refusing" in stream.getvalue()
+
+    def test_refuses_to_delete_more_than_the_limit(
+        self, connector: DeveloperDocsConnector, recorder: _Recorder
+    ) -> None:
+        _seed_manifest(connector, extra=2)
+        saved = connector.manifest.path.read_text()
+
+        with pytest.raises(RuntimeError, match="would delete 2 of 6 documents"):
+            connector.index_data(mode=IndexingMode.INCREMENTAL)
+
+        assert recorder.deleted == [] and recorder.requests == []
+        assert connector.manifest.path.read_text() == saved
+
+    def test_stale_deletion_check_can_be_disabled(
+        self, connector: DeveloperDocsConnector, recorder: _Recorder
+    ) -> None:
+        gone = _seed_manifest(connector, extra=2)
+        connector.index_data(
+            mode=IndexingMode.INCREMENTAL, options=ConnectorOptions(disable_stale_deletion_check=True)
+        )
+        assert sorted(doc_id for doc_id, _ in recorder.deleted) == gone
+        assert not set(gone) & _saved_ids(connector)
+
+    def test_missing_manifest_falls_back_to_full_upload(
+        self, connector: DeveloperDocsConnector, recorder: _Recorder
+    ) -> None:
+        assert not connector.manifest.path.exists()
+        connector.index_data(mode=IndexingMode.INCREMENTAL)
+
+        assert recorder.bulk_uploads == 1 and recorder.indexed_ids == []
+        assert _saved_ids(connector) == {page["id"] for page in connector.get_data()}
+
+    def test_failed_batch_keeps_progress_in_the_manifest(
+        self, connector: DeveloperDocsConnector, recorder: _Recorder
+    ) -> None:
+        connector.manifest.save()  # An empty manifest makes every page new.
+        connector.batch_size = 2
+        recorder.fail_index_call = 2
+
+        with pytest.raises(ValueError, match="rejected"):
+            connector.index_data(mode=IndexingMode.INCREMENTAL)
+
+        # The first batch reached Glean and is recorded; the second is retried next run.
+        assert len(recorder.indexed_ids) == 2
+        assert _saved_ids(connector) == set(recorder.indexed_ids)
+
+
+class TestRunSummary:
+    def test_api_counters_appear_in_the_summary(
+        self, connector: DeveloperDocsConnector, recorder: _Recorder
+    ) -> None:
+        stream = io.StringIO()
+        connector.indexing_logger = IndexingLogger(writer=StdoutLogWriter(stream=stream))
+        connector.scheduler = RequestScheduler(sleep=lambda seconds: None)
+        connector.batch_size = 2
+        recorder.bulk_errors = [httpx.ConnectError("connection reset")]
+
+        connector.index_data(mode=IndexingMode.FULL)
+        summary = connector.indexing_logger.finish()
+
+        assert (summary.api_stats["requests"], summary.api_stats["retries"]) == (3, 1)
+        assert "Indexing API:" in stream.getvalue()
+        assert "Requests:       3" in stream.getvalue()
+        assert "Retries:        1 (0 throttled)" in stream.getvalue()
@@ -0,0 +1,260 @@
+"""Tests for PipelinedUploader, with the Glean client replaced by a recorder."""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Iterator, List
+
+import pytest
+from glean.indexing.models import ConnectorOptions, ContentDefinition, DocumentDefinition
+
+import document_uploader
+from document_uploader import PipelinedUploader, estimated_request_bytes
+from indexing_logger import IndexingLogger
+from rate_limiter import RequestScheduler
+
+
+class _RecordingDocuments:
+    def __init__(self) -> None:
+        self.calls: List[dict] = []
+
+    def bulk_index(self, **kwargs) -> None:
+        self.calls.append(kwargs)
+
+
+@pytest.fixture
+def recorder(monkeypatch: pytest.MonkeyPatch) -> _RecordingDocuments:
+    documents = _RecordingDocuments()
+    client = SimpleNamespace(indexing=SimpleNamespace(documents=documents))
+
+    @contextlib.contextmanager
+    def fake_api_client():
+        yield client
+
+    monkeypatch.setattr(document_uploader, "api_client", fake_api_client)
+    return documents
+
+
+def _docs(n: int) -> Iterator[str]:
+    # The uploader never inspects documents, so plain strings stand in for them.
+    return (f"doc-{i}" for i in range(n))
+
+
+class TestPipelinedUploader:
+    def test_page_flags_and_shared_upload_id(self, recorder: _RecordingDocuments) -> None:
+        count = PipelinedUploader("devdocs", batch_size=2).upload(_docs(5))
+        assert count == 5
+        assert [len(c["documents"]) for c in recorder.calls] == [2, 2, 1]
+        assert [c["is_first_page"] for c in recorder.calls] == [True, False, False]
+        assert [c["is_last_page"] for c in recorder.calls] == [False, False, True]
+        assert len({c["upload_id"] for c in recorder.calls}) == 1
+        assert all(c["datasource"] == "devdocs" for c in recorder.calls)
+
+    def test_single_page_is_first_and_last(self, recorder: _RecordingDocuments) -> None:
+        PipelinedUploader("devdocs", batch_size=10).upload(_docs(3))
+        assert len(recorder.calls) == 1
+        assert recorder.calls[0]["is_first_page"] and recorder.calls[0]["is_last_page"]
+
+    def test_nothing_to_upload(self, recorder: _RecordingDocuments) -> None:
+        assert PipelinedUploader("devdocs").upload(_docs(0)) == 0
+        assert recorder.calls == []
+
+    def test_options_apply_to_first_and_last_pages(self, recorder: _RecordingDocuments) -> None:
+        options = ConnectorOptions(force_restart=True, disable_stale_deletion_check=True)
+        PipelinedUploader("devdocs", batch_size=1).upload(_docs(3), options=options)
+        assert [c["force_restart_upload"] for c in recorder.calls] == [True, None, None]
+        assert [c["disable_stale_document_deletion_check"] for c in recorder.calls] == [None, None, True]
+
+    def test_producer_error_propagates(self, recorder: _RecordingDocuments) -> None:
+        def failing() -> Iterator[str]:
+            yield "doc-0"
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            PipelinedUploader("devdocs", batch_size=1).upload(failing())
+        # The first page was held back as lookahead, so nothing half-uploaded.
+        assert recorder.calls == []
+
+    def test_producer_is_bounded_by_queue_depth(
+        self, recorder: _RecordingDocuments, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        produced = []
+        release = threading.Event()
+
+        def slow_upload(**kwargs) -> None:
+            release.wait(timeout=5)
+            recorder.calls.append(kwargs)
+
+        monkeypatch.setattr(recorder, "bulk_index", slow_upload)
+
+        def tracked() -> Iterator[str]:
+            for doc in _docs(20):
+                produced.append(doc)
+                yield doc
+
+        uploader = PipelinedUploader("devdocs", batch_size=1, queue_depth=2)
+        thread = threading.Thread(target=uploader.upload, args=(tracked(),))
+        thread.start()
+        threading.Event().wait(0.3)
+        # One page in flight, one held as lookahead, two queued, one being put.
+        assert len(produced) <= 5
+        release.set()
+        thread.join(timeout=5)
+        assert len(recorder.calls) == 20
+
+
+def _document(i: int, body_chars: int) -> DocumentDefinition:
+    return DocumentDefinition(
+        id=f"doc-{i}",
+        title=f"Doc {i}",
+        datasource="devdocs",
+        view_url=f"https://developers.glean.com/doc-{i}",
+        object_type="infoPage",
+        body=ContentDefinition(mime_type="text/plain", text_content="x" * body_chars),
+    )
+
+
+class TestConcurrentUpload:
+    def test_middle_pages_overlap_but_first_and_last_do_not(
+        self, recorder: _RecordingDocuments, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        lock = threading.Lock()
+        active = [0]
+        events = []
+
+        def slow_upload(**kwargs) -> None:
+            with lock:
+                active[0] += 1
+                events.append((kwargs["is_first_page"], kwargs["is_last_page"], active[0]))
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            recorder.calls.append(kwargs)
+
+        monkeypatch.setattr(recorder, "bulk_index", slow_upload)
+        count = PipelinedUploader("devdocs", batch_size=1, queue_depth=8, workers=3).upload(_docs(8))
+
+        assert count == 8
+        assert len(recorder.calls) == 8
+        first, last = events[0], events[-1]
+        assert first[:2] == (True, False) and first[2] == 1
+        assert last[:2] == (False, True) and last[2] == 1
+        assert max(concurrent for _, _, concurrent in events) <= 3
+        assert max(concurrent for _, _, concurrent in events) > 1
+
+    def test_worker_failure_propagates_and_skips_last_page(
+        self, recorder: _RecordingDocuments, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        def flaky(**kwargs) -> None:
+            if kwargs["documents"] == ["doc-2"]:
+                raise RuntimeError("upload failed")
+            recorder.calls.append(kwargs)
+
+        monkeypatch.setattr(recorder, "bulk_index", flaky)
+        with pytest.raises(RuntimeError, match="upload failed"):
+            PipelinedUploader("devdocs", batch_size=1, workers=2).upload(_docs(5))
+        assert not any(c["is_last_page"] for c in recorder.calls)
+
+    def test_times_each_bulk_index_request(self, recorder: _RecordingDocuments) -> None:
+        class Quiet:
+            def __getattr__(self, name):
+                return lambda *args, **kwargs: None
+
+        indexing_logger = IndexingLogger(writer=Quiet())
+        PipelinedUploader("devdocs", batch_size=2, workers=2, indexing_logger=indexing_logger).upload(_docs(9))
+        assert indexing_logger.finish().stage_timings["upload_batch"].count == 5
+
+
+class TestByteBudget:
+    def test_pages_close_at_the_budget(self, recorder: _RecordingDocuments) -> None:
+        docs = [_document(i, body_chars) for i, body_chars in enumerate([4000, 4000, 100, 100, 100, 9000, 10])]
+        budget = estimated_request_bytes(docs[0]) * 2
+
+        PipelinedUploader("devdocs", max_batch_bytes=budget).upload(docs)
+
+        pages = [[d.id for d in c["documents"]] for c in recorder.calls]
+        assert pages == [["doc-0", "doc-1"], ["doc-2", "doc-3", "doc-4"], ["doc-5"], ["doc-6"]]
+        # A single document over budget still goes out, alone.
+        assert estimated_request_bytes(docs[5]) > budget
+
+    def test_batch_size_still_caps_page_length(self, recorder: _RecordingDocuments) -> None:
+        docs = [_document(i, 10) for i in range(5)]
+        PipelinedUploader("devdocs", batch_size=2, max_batch_bytes=10**9).upload(docs)
+        assert [len(c["documents"]) for c in recorder.calls] == [2, 2, 1]
+
+
+class _BulkIndexStub(BaseHTTPRequestHandler):
+    requests: List[dict] = []
+    throttle_next: int = 0  # reject this many requests with 429 before accepting
+    lock = threading.Lock()
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.lock:
+            throttled = self.throttle_next > 0
+            if throttled:
+                type(self).throttle_next -= 1
+            else:
+                self.requests.append({"path": self.path, "body": body})
+        if throttled:
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def stub_server(monkeypatch: pytest.MonkeyPatch) -> Iterator[List[dict]]:
+    _BulkIndexStub.requests = []
+    _BulkIndexStub.throttle_next = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _BulkIndexStub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("GLEAN_SERVER_URL", f"http://127.0.0.1:{server.server_address[1]}")
+    monkeypatch.setenv("GLEAN_INDEXING_API_TOKEN", "test-token")
+    try:
+        yield _BulkIndexStub.requests
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class TestAgainstStubServer:
+    def test_concurrent_byte_budgeted_session(self, stub_server: List[dict]) -> None:
+        docs = [_document(i, 2000 if i % 3 else 20000) for i in range(30)]
+        uploader = PipelinedUploader("devdocs", max_batch_bytes=30_000, workers=4)
+
+        assert uploader.upload(docs) == 30
+
+        bodies = [r["body"] for r in stub_server]
+        assert all(r["path"].endswith("/bulkindexdocuments") for r in stub_server)
+        assert len({b["uploadId"] for b in bodies}) == 1
+        assert bodies[0]["isFirstPage"] is True
+        assert bodies[-1]["isLastPage"] is True
+        assert sum(1 for b in bodies if b.get("isFirstPage")) == 1
+        assert sum(1 for b in bodies if b.get("isLastPage")) == 1
+        assert sorted(d["id"] for b in bodies for d in b["documents"]) == sorted(d.id for d in docs)
+
+    def test_throttled_page_is_retried(self, stub_server: List[dict]) -> None:
+        _BulkIndexStub.throttle_next = 2
+        scheduler = RequestScheduler()
+        uploader = PipelinedUploader("devdocs", batch_size=2, scheduler=scheduler)
+
+        assert uploader.upload(_document(i, 10) for i in range(4)) == 4
+
+        assert [r["body"]["isFirstPage"] for r in stub_server] == [True, False]
+        assert scheduler.stats.throttled == 2
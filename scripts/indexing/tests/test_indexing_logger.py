@@ -0,0 +1,289 @@
+"""Tests for the indexing logger's summary aggregation, timings and background writer."""
+
+from __future__ import annotations
+
+import io
+import json
+import random
+import threading
+import time
+import tracemalloc
+from typing import List
+
+import pytest
+
+from indexing_logger import (
+    BackgroundLogWriter,
+    IndexingLogger,
+    JsonLogWriter,
+    LatencyHistogram,
+    LogLevel,
+    StdoutLogWriter,
+    create_logger,
+)
+
+
+class NullWriter:
+    def write_line(self, message: str, level: LogLevel = LogLevel.INFO) -> None:
+        pass
+
+    def write_document(self, entry) -> None:
+        pass
+
+    def write_summary(self, summary) -> None:
+        self.summary = summary
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def _documents(n: int, seed: int = 7) -> List[dict]:
+    rng = random.Random(seed)
+    docs = []
+    for i in range(n):
+        status = rng.choice(["success", "success", "success", "error", "warning"])
+        docs.append({
+            "url": f"https://developers.glean.com/page-{i}",
+            "doc_type": rng.choice(["info_page", "api_reference"]),
+            "title": "t" * rng.randint(0, 40),
+            "content_length": rng.randint(0, 50_000),
+            "status": status,
+            "error": f"problem {i}" if status != "success" and rng.random() < 0.8 else None,
+        })
+    return docs
+
+
+class TestSummary:
+    def test_matches_aggregates_over_all_documents(self) -> None:
+        docs = _documents(500)
+        logger = IndexingLogger(writer=NullWriter())
+        for doc in docs:
+            logger.log_document(**doc)
+        summary = logger.finish()
+
+        lengths = [d["content_length"] for d in docs]
+        assert summary.total_documents == len(docs)
+        assert summary.info_pages == sum(d["doc_type"] == "info_page" for d in docs)
+        assert summary.api_references == sum(d["doc_type"] == "api_reference" for d in docs)
+        assert summary.successful == sum(d["status"] == "success" for d in docs)
+        assert summary.failed == sum(d["status"] == "error" for d in docs)
+        assert summary.warnings == sum(d["status"] == "warning" for d in docs)
+        assert summary.avg_content_length == sum(lengths) / len(lengths)
+        assert (summary.min_content_length, summary.max_content_length) == (min(lengths), max(lengths))
+        assert summary.errors == [d["error"] for d in docs if d["error"] and d["status"] == "error"]
+        assert summary.warnings_list == [d["error"] for d in docs if d["error"] and d["status"] == "warning"]
+
+    def test_empty_run(self) -> None:
+        summary = IndexingLogger(writer=NullWriter()).finish()
+        assert summary.total_documents == 0
+        assert (summary.avg_content_length, summary.min_content_length, summary.max_content_length) == (0, 0, 0)
+        assert summary.errors == []
+
+    def test_messages_are_capped_but_counts_are_exact(self) -> None:
+        logger = IndexingLogger(writer=NullWriter(), max_messages=3)
+        for i in range(10):
+            logger.log_document(url=f"u{i}", doc_type="info_page", title="", content_length=1,
+                                status="error", error=f"boom {i}")
+        summary = logger.finish()
+        assert summary.failed == 10
+        assert summary.errors == ["boom 0", "boom 1", "boom 2"]
+
+    def test_stdout_headers_report_exact_counts_past_the_cap(self) -> None:
+        stream = io.StringIO()
+        logger = IndexingLogger(writer=StdoutLogWriter(stream=stream), max_messages=3)
+        for i in range(25):
+            logger.log_document(url=f"u{i}", doc_type="info_page", title="", content_length=1,
+                                status="error" if i < 20 else "warning", error=f"boom {i}")
+        logger.finish()
+        output = stream.getvalue().split("ERRORS (20):", 1)[1]
+        assert "- boom 2" in output and "- boom 3" not in output
+        assert "... and 17 more" in output
+        assert "WARNINGS (5):" in output and "... and 2 more" in output
+
+    def test_memory_does_not_grow_with_documents(self) -> None:
+        logger = IndexingLogger(writer=NullWriter())
+
+        def log(n: int) -> None:
+            for i in range(n):
+                logger.log_document(url=f"https://x/{i}", doc_type="info_page", title="title",
+                                    content_length=i, extra_field=i)
+
+        log(1_000)
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            log(20_000)
+            grown = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        assert grown < 64 * 1024
+
+    def test_json_summary_line(self) -> None:
+        stream = io.StringIO()
+        logger = create_logger(format="json", stream=stream)
+        assert isinstance(logger.writer, JsonLogWriter)
+        logger.log_document(url="u", doc_type="api_reference", title="T", content_length=12)
+        logger.finish()
+        assert '"type": "summary"' in stream.getvalue().splitlines()[-1]
+
+
+class CountingStream(io.StringIO):
+    """StringIO that records write() calls and can hold writes until released."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def write(self, text: str) -> int:
+        self.release.wait()
+        self.writes += 1
+        return super().write(text)
+
+
+def _log_many(logger: IndexingLogger, n: int) -> None:
+    for i in range(n):
+        logger.log_document(url=f"https://x/{i}", doc_type="info_page", title="Title", content_length=i)
+
+
+class TestBackgroundLogWriter:
+    @pytest.mark.parametrize("format", ["stdout", "json"])
+    def test_output_matches_synchronous_writer(self, format: str) -> None:
+        outputs = []
+        for background in (False, True):
+            stream = io.StringIO()
+            logger = create_logger(format=format, verbose=True, stream=stream, background=background)
+            logger.start("Starting")
+            _log_many(logger, 200)
+            logger.log_document(url="https://x/bad", doc_type="api_reference", title="", content_length=0,
+                                status="error", error="HTTP 500")
+            logger.finish()
+            logger.log("done")
+            logger.close()
+            outputs.append(stream.getvalue())
+
+        if format == "json":
+            # Timings differ between the runs; compare everything else.
+            outputs = [[{k: v for k, v in json.loads(line).items() if k not in ("timestamp", "total_duration_s")}
+                        for line in output.splitlines()] for output in outputs]
+        else:
+            outputs = [[line for line in output.splitlines() if "Duration:" not in line] for output in outputs]
+        assert outputs[0] == outputs[1]
+
+    def test_batches_lines_into_few_writes(self) -> None:
+        stream = CountingStream()
+        stream.release.clear()
+        logger = create_logger(verbose=True, stream=stream, background=True)
+        _log_many(logger, 500)
+        stream.release.set()
+        logger.finish()
+        logger.close()
+        # Two lines per document written synchronously would be 1000+ writes.
+        assert stream.writes < 50
+        assert stream.getvalue().count("https://x/") == 500
+
+    def test_flush_waits_for_queued_lines(self) -> None:
+        stream = io.StringIO()
+        writer = BackgroundLogWriter(StdoutLogWriter(stream=stream))
+        for i in range(100):
+            writer.write_line(f"line {i}")
+        writer.flush()
+        assert stream.getvalue().splitlines()[-1] == "  line 99"
+        writer.close()
+        writer.close()
+
+    def test_document_timestamp_is_taken_when_logged(self) -> None:
+        stream = CountingStream()
+        stream.release.clear()
+        logger = create_logger(format="json", stream=stream, background=True)
+        logger.log_document(url="u", doc_type="info_page", title="", content_length=1)
+        entry_time = time.time()
+        stream.release.set()
+        logger.close()
+        assert json.loads(stream.getvalue())["timestamp"] <= entry_time
+
+    def test_writer_errors_surface_on_flush(self) -> None:
+        class Broken(StdoutLogWriter):
+            def write_document(self, entry) -> None:
+                raise ValueError("cannot format")
+
+        writer = BackgroundLogWriter(Broken(stream=io.StringIO()))
+        writer.write_line("fine")
+        writer.write_document(None)
+        with pytest.raises(ValueError, match="cannot format"):
+            writer.flush()
+        writer.close()
+
+
+class TestLatencyHistogram:
+    def test_percentiles_within_precision(self) -> None:
+        rng = random.Random(3)
+        samples = sorted(rng.lognormvariate(3, 1.2) for _ in range(20_000))
+        histogram = LatencyHistogram()
+        for sample in samples:
+            histogram.record(sample)
+
+        for percent in (50, 95, 99):
+            exact = samples[int(percent / 100 * len(samples)) - 1]
+            assert abs(histogram.percentile(percent) - exact) <= exact * 0.011
+        assert histogram.percentile(100) == histogram.max_ms == samples[-1]
+        assert histogram.count == len(samples)
+
+    def test_bucket_count_is_bounded(self) -> None:
+        histogram = LatencyHistogram()
+        for i in range(100_000):
+            histogram.record(i % 5000 + 0.5)
+        assert len(histogram._buckets) < 1000
+
+    def test_zero_and_empty(self) -> None:
+        histogram = LatencyHistogram()
+        assert histogram.percentile(99) == 0.0
+        histogram.record(0)
+        assert histogram.stats().p50_ms == 0.0
+
+
+class TestStageTimings:
+    def test_summary_reports_each_stage(self) -> None:
+        logger = IndexingLogger(writer=NullWriter())
+        for ms in range(1, 101):
+            logger.record_timing("transform", float(ms))
+        with logger.timed("upload_batch"):
+            time.sleep(0.01)
+        timings = logger.finish().stage_timings
+
+        assert set(timings) == {"transform", "upload_batch"}
+        transform = timings["transform"]
+        assert (transform.count, transform.total_ms, transform.max_ms) == (100, 5050.0, 100.0)
+        assert 49.5 <= transform.p50_ms <= 50.5
+        assert 98.0 <= transform.p99_ms <= 100.0
+        assert timings["upload_batch"].p50_ms >= 10
+
+    def test_records_from_many_threads(self) -> None:
+        logger = IndexingLogger(writer=NullWriter())
+        threads = [
+            threading.Thread(target=lambda: [logger.record_timing("upload_batch", 1.0) for _ in range(1000)])
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert logger.finish().stage_timings["upload_batch"].count == 8000
+
+    @pytest.mark.parametrize("format", ["stdout", "json"])
+    def test_writers_include_stage_timings(self, format: str) -> None:
+        stream = io.StringIO()
+        logger = create_logger(format=format, stream=stream)
+        logger.record_timing("build_page", 12.0)
+        logger.finish()
+        output = stream.getvalue()
+        if format == "json":
+            timing = json.loads(output.splitlines()[-1])["stage_timings"]["build_page"]
+            assert timing["count"] == 1 and timing["max_ms"] == 12.0
+        else:
+            assert "Stage timings (ms)" in output
+            assert "build_page" in output
@@ -0,0 +1,88 @@
+"""Tests for the incremental-indexing manifest."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from data_client import DeveloperDocsDataClient
+from indexing_manifest import MANIFEST_VERSION, IndexingManifest, content_hash
+
+
+def _object_type(page: dict) -> str:
+    return "infoPage" if page["page_type"] == "info_page" else "apiReference"
+
+
+def _seed(manifest: IndexingManifest, pages: list) -> None:
+    for page in pages:
+        manifest.record(page["id"], content_hash(page), _object_type(page))
+
+
+@pytest.fixture
+def pages(fake_repo: Path) -> list:
+    return DeveloperDocsDataClient(repo_root=str(fake_repo)).get_source_data()
+
+
+class TestContentHash:
+    def test_independent_of_key_order(self) -> None:
+        assert content_hash({"a": 1, "b": 2}) == content_hash({"b": 2, "a": 1})
+
+    def test_changes_with_content(self) -> None:
+        assert content_hash({"content": "x"}) != content_hash({"content": "y"})
+
+
+class TestLoadSave:
+    def test_missing_file_is_unusable(self, tmp_path: Path) -> None:
+        manifest = IndexingManifest(tmp_path / "manifest.json")
+        assert manifest.load() is False
+        assert manifest.entries == {}
+
+    def test_round_trip(self, tmp_path: Path, pages: list) -> None:
+        path = tmp_path / "cache" / "manifest.json"
+        manifest = IndexingManifest(path)
+        _seed(manifest, pages)
+        manifest.save()
+
+        reloaded = IndexingManifest(path)
+        assert reloaded.load() is True
+        assert reloaded.entries == manifest.entries
+
+    def test_version_mismatch_is_unusable(self, tmp_path: Path) -> None:
+        path = tmp_path / "manifest.json"
+        path.write_text(json.dumps({"version": MANIFEST_VERSION + 1, "documents": {}}))
+        assert IndexingManifest(path).load() is False
+
+    def test_malformed_file_is_unusable(self, tmp_path: Path) -> None:
+        path = tmp_path / "manifest.json"
+        path.write_text("not json")
+        assert IndexingManifest(path).load() is False
+
+
+class TestDiff:
+    def test_everything_new_on_empty_manifest(self, tmp_path: Path, pages: list) -> None:
+        diff = IndexingManifest(tmp_path / "m.json").diff(pages)
+        assert len(diff.changed) == len(pages)
+        assert diff.unchanged == 0
+        assert diff.deleted == {}
+
+    def test_nothing_changed_after_seeding(self, tmp_path: Path, pages: list) -> None:
+        manifest = IndexingManifest(tmp_path / "m.json")
+        _seed(manifest, pages)
+        diff = manifest.diff(pages)
+        assert diff.changed == []
+        assert diff.unchanged == len(pages)
+
+    def test_detects_changed_and_deleted(self, tmp_path: Path, pages: list) -> None:
+        manifest = IndexingManifest(tmp_path / "m.json")
+        _seed(manifest, pages)
+
+        edited = dict(pages[0], content="edited")
+        vanished = pages[1]
+        diff = manifest.diff([edited] + pages[2:])
+
+        assert [page["id"] for page, _ in diff.changed] == [edited["id"]]
+        assert diff.changed[0][1] == content_hash(edited)
+        assert diff.deleted == {vanished["id"]: _object_type(vanished)}
+        assert diff.unchanged == len(pages) - 2
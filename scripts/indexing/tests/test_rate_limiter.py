@@ -0,0 +1,149 @@
+"""Tests for the indexing API rate limiter and retry scheduler."""
+
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import List, Optional
+
+import httpx
+import pytest
+from glean.api_client.errors import GleanError
+
+from rate_limiter import RequestScheduler, TokenBucket, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: List[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _glean_error(status: int, retry_after: Optional[str] = None) -> GleanError:
+    headers = {"retry-after": retry_after} if retry_after is not None else {}
+    request = httpx.Request("POST", "https://example.glean.com/api/index/v1/bulkindexdocuments")
+    return GleanError("API error occurred", httpx.Response(status, headers=headers, request=request))
+
+
+def _failing(errors: list, result: str = "ok"):
+    calls = []
+
+    def fn() -> str:
+        calls.append(1)
+        if errors:
+            raise errors.pop(0)
+        return result
+
+    fn.calls = calls
+    return fn
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+def _scheduler(clock: FakeClock, **kwargs) -> RequestScheduler:
+    return RequestScheduler(clock=clock, sleep=clock.sleep, rng=random.Random(0), **kwargs)
+
+
+class TestParseRetryAfter:
+    def test_seconds(self) -> None:
+        assert parse_retry_after("7") == 7.0
+        assert parse_retry_after(" 1.5 ") == 1.5
+
+    def test_http_date(self) -> None:
+        now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        header = format_datetime(now + timedelta(seconds=30), usegmt=True)
+        assert parse_retry_after(header, now=now) == 30.0
+
+    def test_missing_or_invalid(self) -> None:
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+
+
+class TestTokenBucket:
+    def test_burst_then_spaced_reservations(self, clock: FakeClock) -> None:
+        bucket = TokenBucket(rate=2, burst=2, clock=clock)
+        assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+
+    def test_refills_over_time(self, clock: FakeClock) -> None:
+        bucket = TokenBucket(rate=1, burst=1, clock=clock)
+        bucket.reserve()
+        clock.now += 1
+        assert bucket.reserve() == 0.0
+
+
+class TestRequestScheduler:
+    def test_rate_limit_spaces_calls(self, clock: FakeClock) -> None:
+        scheduler = _scheduler(clock, rate=4, burst=1)
+        for _ in range(5):
+            scheduler.call(lambda: None)
+        assert clock.now == pytest.approx(1.0)
+        assert scheduler.stats.token_wait_seconds == pytest.approx(1.0)
+        assert scheduler.stats.requests == 5
+
+    def test_honors_retry_after(self, clock: FakeClock) -> None:
+        scheduler = _scheduler(clock)
+        fn = _failing([_glean_error(429, "12")])
+        assert scheduler.call(fn) == "ok"
+        assert clock.sleeps == [12.0]
+        assert (scheduler.stats.retries, scheduler.stats.throttled) == (1, 1)
+        assert scheduler.stats.backoff_seconds == 12.0
+
+    @pytest.mark.parametrize("header", ["86400", "Fri, 01 Jan 2100 00:00:00 GMT"])
+    def test_clamps_excessive_retry_after(
+        self, clock: FakeClock, header: str, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        scheduler = _scheduler(clock, max_retry_after=30.0)
+        fn = _failing([_glean_error(429, header)])
+        with caplog.at_level("WARNING", logger="rate_limiter"):
+            assert scheduler.call(fn) == "ok"
+        assert clock.sleeps == [30.0]
+        # The shared pause other workers see is clamped too.
+        assert scheduler._resume_at == 30.0
+        assert "exceeds the 30s limit" in caplog.text
+
+    def test_jittered_exponential_backoff(self, clock: FakeClock) -> None:
+        scheduler = _scheduler(clock, base_delay=1.0, max_delay=3.0)
+        fn = _failing([_glean_error(503) for _ in range(4)])
+        scheduler.call(fn)
+        caps = [1.0, 2.0, 3.0, 3.0]
+        assert len(clock.sleeps) == 4
+        assert all(0 <= delay <= cap for delay, cap in zip(clock.sleeps, caps))
+
+    def test_non_retryable_status_raises_immediately(self, clock: FakeClock) -> None:
+        scheduler = _scheduler(clock)
+        fn = _failing([_glean_error(400)])
+        with pytest.raises(GleanError):
+            scheduler.call(fn)
+        assert len(fn.calls) == 1
+        assert clock.sleeps == []
+
+    def test_gives_up_after_max_retries(self, clock: FakeClock) -> None:
+        scheduler = _scheduler(clock, max_retries=2)
+        fn = _failing([_glean_error(500) for _ in range(5)])
+        with pytest.raises(GleanError):
+            scheduler.call(fn)
+        assert len(fn.calls) == 3
+
+    def test_retries_transport_errors(self, clock: FakeClock) -> None:
+        scheduler = _scheduler(clock)
+        fn = _failing([httpx.ConnectError("connection reset")])
+        assert scheduler.call(fn) == "ok"
+        assert scheduler.stats.retries == 1
+
+    def test_throttle_pauses_other_callers(self, clock: FakeClock) -> None:
+        scheduler = _scheduler(clock)
+        # Simulate another worker that was throttled and hasn't resumed yet.
+        scheduler._resume_at = clock.now + 5
+        scheduler.call(lambda: None)
+        assert clock.sleeps == [5.0]
@@ -0,0 +1,63 @@
+"""Tests for the opt-in run profiler."""
+
+from __future__ import annotations
+
+import pstats
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from run_profiler import RunProfiler
+
+
+def busy_transform(n: int) -> list:
+    return [str(i) * 10 for i in range(n)]
+
+
+class TestRunProfiler:
+    def test_writes_profiles_per_phase(self, tmp_path: Path) -> None:
+        profiler = RunProfiler(tmp_path / "profile", top_n=5)
+        with profiler.phase("transform"):
+            kept = busy_transform(50_000)
+
+        assert len(kept) == 50_000
+        stats = pstats.Stats(str(tmp_path / "profile" / "transform.pstats"))
+        assert any(func == "busy_transform" for _, _, func in stats.stats)
+        snapshot = tracemalloc.Snapshot.load(str(tmp_path / "profile" / "transform.tracemalloc"))
+        assert snapshot.traces
+        assert not tracemalloc.is_tracing()
+
+    def test_report_lists_hotspots_and_allocations(self, tmp_path: Path) -> None:
+        profiler = RunProfiler(tmp_path, top_n=3)
+        with profiler.phase("get_source_data"):
+            kept = busy_transform(20_000)
+        with profiler.phase("index_data"):
+            pass
+
+        lines = profiler.report()
+        text = "\n".join(lines)
+        assert lines[0].startswith("Profile: get_source_data")
+        assert "busy_transform" in text
+        assert "test_run_profiler.py" in text
+        assert "Profile: index_data" in text
+        assert (tmp_path / "hotspots.txt").read_text() == text + "\n"
+        assert profiler.phases[0].allocations[0][1] > 0
+        del kept
+
+    def test_failed_phase_is_still_recorded(self, tmp_path: Path) -> None:
+        profiler = RunProfiler(tmp_path)
+        with pytest.raises(ValueError):
+            with profiler.phase("index_data"):
+                raise ValueError("upload failed")
+        assert [phase.name for phase in profiler.phases] == ["index_data"]
+        assert (tmp_path / "index_data.pstats").exists()
+
+    def test_leaves_existing_tracing_running(self, tmp_path: Path) -> None:
+        tracemalloc.start()
+        try:
+            with RunProfiler(tmp_path).phase("transform"):
+                busy_transform(100)
+            assert tracemalloc.is_tracing()
+        finally:
+            tracemalloc.stop()
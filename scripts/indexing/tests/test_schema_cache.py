@@ -0,0 +1,70 @@
+"""Tests for the persistent rendered-schema cache."""
+
+from __future__ import annotations
+
+import functools
+import os
+from pathlib import Path
+
+import pytest
+
+from data_client import ApiRoute, DeveloperDocsDataClient
+from schema_cache import SchemaCache
+
+
+class TestSchemaCache:
+    def test_round_trip(self, tmp_path: Path) -> None:
+        cache = SchemaCache(tmp_path / "cache")
+        cache.put("k", [["200: OK"], "{}"])
+        assert cache.get("k") == [["200: OK"], "{}"]
+        assert (cache.hits, cache.misses) == (1, 0)
+
+    def test_miss_on_unknown_or_corrupt_entry(self, tmp_path: Path) -> None:
+        cache = SchemaCache(tmp_path)
+        (tmp_path / "bad.json").write_text("{ nope")
+        assert cache.get("missing") is None
+        assert cache.get("bad") is None
+        assert cache.misses == 2
+
+    def test_prune_evicts_least_recently_used(self, tmp_path: Path) -> None:
+        cache = SchemaCache(tmp_path, max_bytes=250)
+        for i, key in enumerate(["old", "mid", "new"]):
+            cache.put(key, "x" * 100)
+            os.utime(tmp_path / f"{key}.json", ns=(i * 10**9, i * 10**9))
+        assert cache.prune() == 1
+        assert sorted(p.stem for p in tmp_path.glob("*.json")) == ["mid", "new"]
+
+    def test_prune_on_missing_directory(self, tmp_path: Path) -> None:
+        assert SchemaCache(tmp_path / "nope").prune() == 0
+
+
+class TestDataClientDiskCache:
+    def _client(self, fake_repo: Path, cache_dir: Path) -> DeveloperDocsDataClient:
+        return DeveloperDocsDataClient(repo_root=str(fake_repo), schema_cache_dir=str(cache_dir))
+
+    def test_second_run_skips_rendering(
+        self, fake_repo: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        cache_dir = tmp_path / "schema-cache"
+        first = self._client(fake_repo, cache_dir).get_source_data()
+
+        second_client = self._client(fake_repo, cache_dir)
+        for name in ("_render_request_schema", "_render_status_codes", "_render_params"):
+            # Keep the renderer's __name__: it is part of the cache key.
+            @functools.wraps(getattr(second_client, name))
+            def fail(*args, **kwargs):
+                pytest.fail("schema was re-rendered")
+
+            monkeypatch.setattr(second_client, name, fail)
+        assert second_client.get_source_data() == first
+        assert second_client.schema_cache.hits > 0
+
+    def test_settings_change_invalidates(self, fake_repo: Path, tmp_path: Path) -> None:
+        cache_dir = tmp_path / "schema-cache"
+        route = ApiRoute(api="client-api", group="activity", slug="feedback")
+        self._client(fake_repo, cache_dir)._load_request_schema(route)
+
+        client = self._client(fake_repo, cache_dir)
+        client.SCHEMA_MAX_DEPTH = 1
+        client._load_request_schema(route)
+        assert client.schema_cache.hits == 0
@@ -0,0 +1,163 @@
+"""Tests for incremental sitemap parsing and sitemap index streaming."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import xml.etree.ElementTree as ET
+from typing import AsyncIterator, Dict, List
+
+import pytest
+
+from sitemap_stream import SitemapEntry, SitemapParser, stream_sitemap
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+
+def _urlset(locs: List[str], lastmod: str = "") -> bytes:
+    entries = "".join(
+        f"<url><loc>{loc}</loc>{f'<lastmod>{lastmod}</lastmod>' if lastmod else ''}</url>" for loc in locs
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><urlset {NS}>{entries}</urlset>'.encode()
+
+
+def _index(locs: List[str]) -> bytes:
+    entries = "".join(f"<sitemap><loc>{loc}</loc></sitemap>" for loc in locs)
+    return f"<sitemapindex {NS}>{entries}</sitemapindex>".encode()
+
+
+def _parse(body: bytes, chunk_size: int) -> List[SitemapEntry]:
+    parser = SitemapParser()
+    entries = []
+    for i in range(0, len(body), chunk_size):
+        entries.extend(parser.feed(body[i:i + chunk_size]))
+    return entries + parser.close()
+
+
+class TestSitemapParser:
+    @pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+    def test_parses_urlset_in_any_chunking(self, chunk_size: int) -> None:
+        body = _urlset(["https://a/1", "https://a/2"], lastmod="2026-01-01")
+        assert _parse(body, chunk_size) == [
+            SitemapEntry("url", "https://a/1", "2026-01-01"),
+            SitemapEntry("url", "https://a/2", "2026-01-01"),
+        ]
+
+    @pytest.mark.parametrize("chunk_size", [1, 5, 1 << 16])
+    def test_inflates_gzip_bodies(self, chunk_size: int) -> None:
+        body = gzip.compress(_urlset([f"https://a/{i}" for i in range(100)]))
+        entries = _parse(body, chunk_size)
+        assert [e.loc for e in entries] == [f"https://a/{i}" for i in range(100)]
+        assert all(e.lastmod is None for e in entries)
+
+    def test_reports_child_sitemaps_of_an_index(self) -> None:
+        entries = _parse(_index(["https://a/s1.xml", "https://a/s2.xml.gz"]), 1 << 16)
+        assert [(e.kind, e.loc) for e in entries] == [("sitemap", "https://a/s1.xml"), ("sitemap", "https://a/s2.xml.gz")]
+
+    def test_entries_are_returned_as_soon_as_they_close(self) -> None:
+        parser = SitemapParser()
+        assert parser.feed(f"<urlset {NS}><url><loc>https://a/1</loc></url><url><loc>".encode()) == [
+            SitemapEntry("url", "https://a/1", None)
+        ]
+
+    def test_accepts_sitemaps_without_namespace_and_skips_empty_locs(self) -> None:
+        body = b"<urlset><url><loc> https://a/1 </loc></url><url><loc></loc></url></urlset>"
+        assert _parse(body, 1 << 16) == [SitemapEntry("url", "https://a/1", None)]
+
+    def test_handled_entries_are_released(self) -> None:
+        parser = SitemapParser()
+        parser.feed(_urlset([f"https://a/{i}" for i in range(1000)])[:-len(b"</urlset>")])
+        assert len(parser._root) == 0
+
+    @pytest.mark.parametrize("body", [b"", b"<urlset><url><loc>https://a/1</loc>", b"not xml"])
+    def test_truncated_or_malformed_body_raises(self, body: bytes) -> None:
+        with pytest.raises(ET.ParseError):
+            _parse(body, 1 << 16)
+
+
+class FakeSite:
+    def __init__(self, bodies: Dict[str, bytes], delay: float = 0.0) -> None:
+        self.bodies = bodies
+        self.delay = delay
+        self.fetched: List[str] = []
+        self.active = self.peak = 0
+
+    async def fetch(self, url: str) -> AsyncIterator[bytes]:
+        if url not in self.bodies:
+            raise RuntimeError(f"Failed to fetch sitemap {url}: 404")
+        self.fetched.append(url)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            body = self.bodies[url]
+            for i in range(0, len(body), 64):
+                await asyncio.sleep(self.delay)
+                yield body[i:i + 64]
+        finally:
+            self.active -= 1
+
+
+def _collect(site: FakeSite, root: str, **kwargs) -> List[tuple]:
+    async def run():
+        return [entry async for entry in stream_sitemap(root, site.fetch, **kwargs)]
+
+    return asyncio.run(run())
+
+
+class TestStreamSitemap:
+    def test_follows_index_to_plain_and_gzip_children(self) -> None:
+        site = FakeSite({
+            "https://a/sitemap.xml": _index(["https://a/s1.xml", "https://a/s2.xml.gz"]),
+            "https://a/s1.xml": _urlset(["https://a/1", "https://a/2"], lastmod="2026-03-01"),
+            "https://a/s2.xml.gz": gzip.compress(_urlset(["https://a/3"])),
+        })
+        entries = _collect(site, "https://a/sitemap.xml")
+        assert sorted(entries) == [
+            ("https://a/1", "2026-03-01"),
+            ("https://a/2", "2026-03-01"),
+            ("https://a/3", None),
+        ]
+
+    def test_fetches_children_concurrently_up_to_the_limit(self) -> None:
+        children = [f"https://a/s{i}.xml" for i in range(6)]
+        bodies = {url: _urlset([f"{url}/page-{j}" for j in range(5)]) for url in children}
+        bodies["https://a/sitemap.xml"] = _index(children)
+        site = FakeSite(bodies, delay=0.005)
+
+        entries = _collect(site, "https://a/sitemap.xml", concurrency=3)
+
+        assert len(entries) == 30
+        assert site.peak == 3
+
+    def test_each_page_and_sitemap_is_visited_once(self) -> None:
+        site = FakeSite({
+            "https://a/sitemap.xml": _index(["https://a/s1.xml", "https://a/s1.xml", "https://a/sitemap.xml"]),
+            "https://a/s1.xml": _urlset(["https://a/1", "https://a/1"]),
+        })
+        assert _collect(site, "https://a/sitemap.xml") == [("https://a/1", None)]
+        assert sorted(site.fetched) == ["https://a/s1.xml", "https://a/sitemap.xml"]
+
+    def test_yields_before_the_sitemap_is_read(self) -> None:
+        site = FakeSite({"https://a/sitemap.xml": _urlset([f"https://a/{i}" for i in range(500)])})
+
+        async def first():
+            stream = stream_sitemap("https://a/sitemap.xml", site.fetch, buffer=4)
+            entry = await stream.__anext__()
+            await asyncio.sleep(0.01)
+            reading = site.active
+            await stream.aclose()
+            return entry, reading
+
+        entry, reading = asyncio.run(first())
+        assert entry == ("https://a/0", None)
+        # The reader is paused on the full buffer, not finished.
+        assert reading == 1
+        assert site.active == 0
+
+    def test_failed_child_sitemap_fails_the_stream(self) -> None:
+        site = FakeSite({
+            "https://a/sitemap.xml": _index(["https://a/s1.xml", "https://a/missing.xml"]),
+            "https://a/s1.xml": _urlset(["https://a/1"]),
+        })
+        with pytest.raises(RuntimeError, match="missing.xml"):
+            _collect(site, "https://a/sitemap.xml")